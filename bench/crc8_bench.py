@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# A microbenchmark of CRC-8 calculation over 3, 32 and 255 byte payloads,
+# comparing the original per-byte list lookup with crc8_util: calculate_crc8()
+# over an entire buffer, and crc8() over a range of one (all but its last
+# byte, as when checking a received message) against the original applied
+# to a slice.
+#
+# From CPython, run from the project directory:
+#
+#   python3 bench/crc8_bench.py
+#
+# On MicroPython, copy this file along with crc8_util.py and crc8_table.py
+# to the device and import it from the REPL:
+#
+#   >>> import crc8_bench
+
+import sys
+import time
+
+if 'tinyfx' not in sys.path:
+    sys.path.insert(0, 'tinyfx')
+
+from crc8_table import CRC8_TABLE
+from crc8_util import crc8, calculate_crc8, IMPLEMENTATION
+
+SIZES      = (3, 32, 255)
+ITERATIONS = 2000
+
+try:
+    _ticks_us   = time.ticks_us
+    _ticks_diff = time.ticks_diff
+except AttributeError: # CPython
+    _ticks_us   = lambda: time.perf_counter_ns() // 1000
+    _ticks_diff = lambda end, start: end - start
+
+_LIST_TABLE = list(CRC8_TABLE)
+
+def crc8_list(data):
+    '''
+    The original implementation: a per-byte lookup in a list table.
+    '''
+    crc = 0
+    for b in data:
+        crc = _LIST_TABLE[crc ^ b]
+    return crc
+
+def crc8_list_range(data):
+    return crc8_list(data[:-1])
+
+def crc8_range(data):
+    return crc8(data, 0, len(data) - 1)
+
+def _time_us(func, data):
+    start = _ticks_us()
+    for _ in range(ITERATIONS):
+        func(data)
+    return _ticks_diff(_ticks_us(), start) / ITERATIONS
+
+def main():
+    print('crc8 benchmark ({} implementation, {} iterations)'.format(IMPLEMENTATION, ITERATIONS))
+    for size in SIZES:
+        data = bytes([(i * 37 + 11) & 0xFF for i in range(size)])
+        if calculate_crc8(data) != crc8_list(data) or crc8_range(data) != crc8_list_range(data):
+            raise RuntimeError('crc8 mismatch for {} byte payload'.format(size))
+        for name, original, func in (('all', crc8_list, calculate_crc8), ('range', crc8_list_range, crc8_range)):
+            list_us = _time_us(original, data)
+            fast_us = _time_us(func, data)
+            print('{:>4} bytes {:<5}  list {:>9.2f}us   {} {:>9.2f}us   ({:.1f}x)'.format(
+                    size, name, list_us, IMPLEMENTATION, fast_us, list_us / fast_us if fast_us else 0.0))
+
+main()
+
+#EOF
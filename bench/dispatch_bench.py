@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# A microbenchmark of command routing: the time to route each command of the
+# TinyFxController's full command set to its handler (including the handler),
+# and the time to parse each command alone, with a no-op handler.
+#
+# From CPython, run from the project directory (using the sim package):
+#
+#   python3 bench/dispatch_bench.py
+#
+# On MicroPython, copy this file to the TinyFX and import it from the REPL:
+#
+#   >>> import dispatch_bench
+
+import sys
+import time
+
+if sys.implementation.name == 'cpython': # run against the sim package
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import sim
+    sim.install()
+
+from router import Router
+from tinyfx_controller import TinyFxController
+
+ITERATIONS = 1000
+
+# a sample of each command of the TinyFxController; 'play' is excluded as it
+# is dominated by opening the WAV file
+COMMANDS = (
+    'all on', 'all off',
+    'ch1 on', 'ch1 off', 'ch6 on', 'ch6 off',
+    'heartbeat on', 'heartbeat off',
+    'color red', 'color black',
+    'respond',
+    'pir',
+    'stats',
+    'get', 'clear',
+    'unknown command'
+)
+
+try:
+    _ticks_us   = time.ticks_us
+    _ticks_diff = time.ticks_diff
+except AttributeError: # CPython
+    _ticks_us   = lambda: time.perf_counter_ns() // 1000
+    _ticks_diff = lambda end, start: end - start
+
+class _Quiet:
+    '''
+    Discards the console output of the handlers.
+    '''
+    def write(self, s):
+        return len(s)
+
+def _time_us(route, cmd):
+    start = _ticks_us()
+    for _ in range(ITERATIONS):
+        route(cmd)
+    return _ticks_diff(_ticks_us(), start) / ITERATIONS
+
+def main():
+    controller = TinyFxController()
+    # a router of the same commands and argument types, whose handlers do nothing
+    parse_only = Router()
+    for name in controller.router.commands:
+        handler, arg_types, min_args, ignore_extra, mismatch = controller.router.get(name)
+        parse_only.add(name, lambda *args: None, *arg_types, min_args=min_args,
+                ignore_extra=ignore_extra, mismatch=mismatch)
+    stdout = sys.stdout
+    results = []
+    try:
+        sys.stdout = _Quiet()
+    except AttributeError: # MicroPython: the handlers' output is printed
+        stdout = None
+    try:
+        for cmd in COMMANDS:
+            results.append((cmd, controller.router.route(cmd),
+                    _time_us(controller.router.route, cmd), _time_us(parse_only.route, cmd)))
+    finally:
+        if stdout:
+            sys.stdout = stdout
+    print('dispatch benchmark ({} iterations)'.format(ITERATIONS))
+    print('{:<18} {:<12} {:>10} {:>10}'.format('command', 'response', 'route us', 'parse us'))
+    total_route = total_parse = 0
+    for cmd, response, route_us, parse_us in results:
+        print('{:<18} {:<12} {:>10.2f} {:>10.2f}'.format(cmd, response, route_us, parse_us))
+        total_route += route_us
+        total_parse += parse_us
+    print('{:<18} {:<12} {:>10.2f} {:>10.2f}'.format('mean', '',
+            total_route / len(results), total_parse / len(results)))
+
+main()
+
+#EOF
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# A benchmark of effect rendering: the frames per second of six channels of
+# effects updated by a ManualPlayer at a 1ms tick, comparing the original
+# float implementations of the effects (reproduced here) with the integer
+# phase implementations of picofx, baked and not, and the largest difference
+# between their outputs, in steps of 1/255.
+#
+# From CPython, run from the project directory (using the sim package):
+#
+#   python3 bench/fx_bench.py
+#
+# On MicroPython, copy this file to the TinyFX and import it from the REPL:
+#
+#   >>> import fx_bench
+
+import sys
+import math
+import time
+
+if sys.implementation.name == 'cpython': # run against the sim package
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import sim
+    sim.install()
+
+from picofx import Updateable, rgb_from_hsv, lut_usage
+from picofx.mono import BlinkFX, FlashFX, PulseFX
+from picofx.colour import RainbowFX
+from settable_blink import SettableBlinkFX
+from manual_player import ManualPlayer
+from tiny_fx import TinyFX
+
+FRAMES  = 2000
+CHECKED = 5000 # frames compared for the difference in output
+
+try:
+    _ticks_us   = time.ticks_us
+    _ticks_diff = time.ticks_diff
+except AttributeError: # CPython
+    _ticks_us   = lambda: time.perf_counter_ns() // 1000
+    _ticks_diff = lambda end, start: end - start
+
+# the original float implementations, with an exact float timebase
+
+class _FloatCycling(Updateable):
+    def __init__(self, speed):
+        self.speed  = speed
+        self.offset = 0.0
+
+    def tick(self, delta_ms):
+        self.offset = (self.offset + delta_ms * self.speed / 1000) % 1.0
+
+class _FloatBlinkFX(_FloatCycling):
+    def __init__(self, speed=1, phase=0.0, duty=0.5):
+        super().__init__(speed)
+        self.phase = phase
+        self.duty  = duty
+
+    def __call__(self):
+        percent = (self.offset + self.phase) % 1.0
+        return 1.0 if percent < self.duty else 0.0
+
+class _FloatFlashFX(_FloatCycling):
+    def __init__(self, speed=1, flashes=2, window=0.5, phase=0.0, duty=0.5):
+        super().__init__(speed)
+        self.flashes = flashes
+        self.window  = window
+        self.phase   = phase
+        self.duty    = duty
+
+    def __call__(self):
+        offset = (self.offset + self.phase) % 1.0
+        if offset < self.window:
+            percent = ((offset * self.flashes) / self.window) % 1.0
+            return 1.0 if percent < self.duty else 0.0
+        return 0.0
+
+class _FloatPulseFX(_FloatCycling):
+    def __init__(self, speed=1, phase=0):
+        super().__init__(speed)
+        self.phase = phase
+
+    def __call__(self):
+        angle = (self.offset + self.phase) * math.pi * 2
+        return (math.sin(angle) + 1) / 2.0
+
+class _FloatRainbowFX(_FloatCycling):
+    def __init__(self, speed=1.0, sat=1.0, val=1.0):
+        super().__init__(speed)
+        self.sat = sat
+        self.val = val
+
+    def __call__(self):
+        r, g, b = rgb_from_hsv(self.offset, self.sat, self.val)
+        return int(r * 255), int(g * 255), int(b * 255)
+
+class _FloatSettableBlinkFX(_FloatBlinkFX):
+    def __init__(self, speed=1, phase=0.0, duty=0.5):
+        super().__init__(speed, phase, duty)
+        self.brightness = 1.0
+
+    def set(self, state):
+        pass
+
+def _channels(blink, flash, pulse, settable):
+    return [
+        blink(speed=2, duty=0.5),
+        pulse(speed=1),
+        flash(speed=1, flashes=3, window=0.6),
+        settable(speed=0.66723, duty=0.25),
+        blink(speed=0.5, phase=0.25, duty=0.1),
+        pulse(speed=0.5, phase=0.5)
+    ]
+
+def _fps(player):
+    start = _ticks_us()
+    for _ in range(FRAMES):
+        player.update(1)
+    elapsed = _ticks_diff(_ticks_us(), start)
+    return FRAMES * 1_000_000 / elapsed if elapsed else 0.0
+
+def _call_us(fx):
+    start = _ticks_us()
+    for _ in range(FRAMES):
+        fx.tick(1)
+        fx()
+    return _ticks_diff(_ticks_us(), start) / FRAMES
+
+def _max_step(float_fxs, int_fxs):
+    '''
+    Returns the largest difference of the outputs, in steps of 1/255,
+    ignoring a frame at which a blink or flash changes state in one only.
+    '''
+    worst = 0
+    for _ in range(CHECKED):
+        for a, b in zip(float_fxs, int_fxs):
+            a.tick(1)
+            b.tick(1)
+            x, y = a(), b()
+            if isinstance(x, tuple):
+                step = max(abs(x[i] - y[i]) for i in range(3))
+            else:
+                step = abs(round(x * 255) - round(y * 255))
+                if step == 255: # an edge falling between the two timebases
+                    continue
+            worst = max(worst, step)
+    return worst
+
+def _int_channels(baked=False):
+    fxs = _channels(BlinkFX, FlashFX, PulseFX, SettableBlinkFX)
+    for fx in fxs:
+        if isinstance(fx, SettableBlinkFX):
+            fx.set(True)
+        elif isinstance(fx, PulseFX):
+            fx.baked = baked
+    fxs.append(RainbowFX(speed=0.3, sat=0.8, baked=baked))
+    return fxs
+
+def main():
+    outputs = TinyFX().outputs
+    float_fxs = _channels(_FloatBlinkFX, _FloatFlashFX, _FloatPulseFX, _FloatSettableBlinkFX)
+    int_fxs   = _int_channels()[:6]
+    baked_fxs = _int_channels(baked=True)[:6]
+    results = []
+    for name, fxs in (('float', float_fxs), ('integer', int_fxs), ('baked', baked_fxs)):
+        player = ManualPlayer(outputs)
+        player.effects = fxs
+        results.append((name, _fps(player)))
+    print('effect benchmark: six channels, {} frames at 1ms'.format(FRAMES))
+    for name, fps in results:
+        print('{:<8} {:>10.0f} fps  ({:.2f}x)'.format(name, fps, fps / results[0][1] if results[0][1] else 0.0))
+    print('rainbow:  float {:.2f}us  integer {:.2f}us  baked {:.2f}us per frame'.format(
+            _call_us(_FloatRainbowFX(speed=0.3, sat=0.8)),
+            _call_us(RainbowFX(speed=0.3, sat=0.8)),
+            _call_us(RainbowFX(speed=0.3, sat=0.8, baked=True))))
+    # compared afresh, from a phase of zero
+    for name, baked in (('integer', False), ('baked', True)):
+        float_fxs = _channels(_FloatBlinkFX, _FloatFlashFX, _FloatPulseFX, _FloatSettableBlinkFX)
+        float_fxs.append(_FloatRainbowFX(speed=0.3, sat=0.8))
+        print('largest difference of {} over {} frames: {} step(s) of 1/255'.format(
+                name, CHECKED, _max_step(float_fxs, _int_channels(baked))))
+    used, budget = lut_usage()
+    print('baked tables: {} of {} bytes'.format(used, budget))
+
+main()
+
+#EOF
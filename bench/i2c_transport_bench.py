@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# Compares the SMBus transport of tinyfx_ctrl.py (a block write, a fixed sleep
+# and a block read) with the combined I2C_RDWR transport of tinyfx_rdwr.py,
+# reporting commands per second and the p50 and p99 round trip latency of each.
+#
+# Run from the project directory on the controller, with a TinyFX connected:
+#
+#   python3 bench/i2c_transport_bench.py [bus] [address]
+#
+# It cannot be run against the simulator (sim), which has no i2c-dev device.
+
+import os, sys
+import time
+import smbus2
+
+sys.path.insert(0, os.getcwd())
+if 'tinyfx' not in sys.path:
+    sys.path.insert(0, 'tinyfx')
+
+from tinyfx.message_util import pack_message, unpack_message
+from tinyfx_ctrl import i2c_write_and_read, encode_command
+from tinyfx_rdwr import RdwrTransport
+
+COUNT    = 500
+MESSAGES = ('ch1 on', 'ch1 off')
+
+def _percentile(sorted_values, percent):
+    index = min(len(sorted_values) - 1, int(round(percent / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def _run(name, write_and_read, frames):
+    latencies = []
+    start = time.perf_counter()
+    for i in range(COUNT):
+        frame = frames[i % len(frames)]
+        t0 = time.perf_counter()
+        response = unpack_message(write_and_read(frame))
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+        if response != 'ACK':
+            raise RuntimeError('{}: unexpected response: {}'.format(name, response))
+    elapsed_s = time.perf_counter() - start
+    latencies.sort()
+    print('{:<7} {:>8.1f} commands/s   p50 {:6.2f}ms   p99 {:6.2f}ms   max {:6.2f}ms'.format(
+            name, COUNT / elapsed_s, _percentile(latencies, 50), _percentile(latencies, 99), latencies[-1]))
+
+def main():
+    bus_number = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    address    = int(sys.argv[2], 0) if len(sys.argv) > 2 else 0x43
+    frames = [ pack_message(encode_command(m)) for m in MESSAGES ]
+    print('I2C transport benchmark: bus {}, address {:#04x}, {} commands each'.format(bus_number, address, COUNT))
+    with smbus2.SMBus(bus_number) as bus:
+        transport = RdwrTransport(bus)
+        _run('smbus', lambda frame: i2c_write_and_read(bus, address, frame), frames)
+        _run('rdwr',  lambda frame: transport.write_and_read(address, frame), frames)
+
+if __name__ == '__main__':
+    main()
+
+#EOF
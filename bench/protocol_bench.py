@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# An end-to-end benchmark of the protocol: drives mixes of commands through
+# the tinyfx_ctrl.py functions to a simulated TinyFX (see the sim package),
+# reporting the throughput and p50/p95/p99 latency of each mix, and the mean
+# time per command spent in each stage: framing, CRC, IRQ handling (including
+# the receive copy), dispatch (including the controller) and response packing.
+# The remainder ('other') is the host transport and the bus simulation.
+#
+# Results are written as JSON, so that runs can be compared across commits.
+# From the project directory:
+#
+#   python3 bench/protocol_bench.py --output before.json
+#   python3 bench/protocol_bench.py --compare before.json
+
+import os, sys
+import argparse
+import contextlib
+import json
+import platform
+import random
+import subprocess
+import threading
+import time
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _ROOT)
+
+import sim
+sim.install()
+from sim.target import SimulatedTarget
+
+import smbus2
+import i2c_slave
+import message_util
+import tinyfx_ctrl
+import tinyfx.message_util as host_message_util
+
+ADDRESS = 0x43
+COUNT   = 2000
+STAGES  = ('framing', 'crc', 'irq', 'dispatch', 'packing')
+
+def _mixes():
+    '''
+    Return a dict of mix name to a list of commands, each a function of
+    the bus sending a single command and returning its response.
+    '''
+    a, d, b, batch = (tinyfx_ctrl.send_and_receive, tinyfx_ctrl.send_and_receive_data,
+            tinyfx_ctrl.send_and_receive_binary, tinyfx_ctrl.send_batch)
+    def cmd(func, message):
+        return lambda bus: func(bus, ADDRESS, message)
+    toggle_ascii  = [ cmd(a, 'ch1 on'), cmd(a, 'ch1 off') ]
+    toggle_binary = [ cmd(b, 'ch1 on'), cmd(b, 'ch1 off') ]
+    color_ascii   = [ cmd(a, 'color red'), cmd(a, 'color blue') ]
+    color_binary  = [ cmd(b, 'color red'), cmd(b, 'color blue') ]
+    data          = [ cmd(d, 'pir') ]
+    batches       = [ cmd(batch, ['ch1 on', 'ch2 on', 'color red']), cmd(batch, ['ch1 off', 'ch2 off', 'color black']) ]
+    # a realistic mix, mostly binary channel and colour changes
+    rng = random.Random(1)
+    weighted = toggle_binary * 8 + color_binary * 4 + toggle_ascii + color_ascii + data + batches
+    mixed = [ rng.choice(weighted) for _ in range(100) ]
+    return {
+        'toggle-ascii':  toggle_ascii,
+        'toggle-binary': toggle_binary,
+        'color-ascii':   color_ascii,
+        'color-binary':  color_binary,
+        'data':          data,
+        'batch':         batches,
+        'mixed':         mixed
+    }
+
+class StageTimer:
+    '''
+    Accumulates the time spent in each stage, exclusive of any stage
+    nested within it (e.g., the CRC within framing).
+    '''
+    def __init__(self):
+        self.totals = dict.fromkeys(STAGES, 0)
+        self._lock  = threading.Lock()
+        self._local = threading.local() # each thread's stack of nested stage times
+
+    def reset(self):
+        with self._lock:
+            self.totals = dict.fromkeys(STAGES, 0)
+
+    def wrap(self, stage, func):
+        def timed(*args, **kwargs):
+            stack = self._local.__dict__.setdefault('stack', [])
+            stack.append(0)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter_ns() - start
+                nested = stack.pop()
+                with self._lock:
+                    self.totals[stage] += elapsed - nested
+                if stack:
+                    stack[-1] += elapsed
+        return timed
+
+def _instrument(target, timer):
+    # host framing, and target framing (validation) and response packing
+    for name in ('pack_message', 'pack_batch', 'unpack_message', 'unpack_payload'):
+        setattr(tinyfx_ctrl, name, timer.wrap('framing', getattr(tinyfx_ctrl, name)))
+    i2c_slave.unpack_frame = timer.wrap('framing', i2c_slave.unpack_frame)
+    i2c_slave.pack_message = timer.wrap('packing', i2c_slave.pack_message)
+    # the CRC, on both sides
+    for module in (message_util, host_message_util):
+        module.crc8 = timer.wrap('crc', module.crc8)
+    # the IRQ handler, and dispatch to the controller
+    irq = target.slave._i2c.irq()
+    irq.handler = timer.wrap('irq', irq.handler)
+    dispatcher = target.slave._dispatcher
+    dispatcher.dispatch = timer.wrap('dispatch', dispatcher.dispatch)
+
+def _percentile(sorted_values, percent):
+    return sorted_values[min(len(sorted_values) - 1, int(percent / 100.0 * len(sorted_values)))]
+
+def _run(bus, commands, count, timer):
+    latencies = []
+    timer.reset()
+    start = time.perf_counter_ns()
+    for i in range(count):
+        t0 = time.perf_counter_ns()
+        if commands[i % len(commands)](bus) is None:
+            raise RuntimeError('command failed')
+        latencies.append(time.perf_counter_ns() - t0)
+    elapsed_ns = time.perf_counter_ns() - start
+    latencies.sort()
+    stages = { stage: total / count / 1000.0 for stage, total in timer.totals.items() }
+    stages['other'] = max(0.0, elapsed_ns / count / 1000.0 - sum(stages.values()))
+    return {
+        'commands': count,
+        'commands_per_s': count * 1e9 / elapsed_ns,
+        'latency_us': {
+            'mean': sum(latencies) / count / 1000.0,
+            'p50':  _percentile(latencies, 50) / 1000.0,
+            'p95':  _percentile(latencies, 95) / 1000.0,
+            'p99':  _percentile(latencies, 99) / 1000.0,
+            'max':  latencies[-1] / 1000.0
+        },
+        'stages_us': { stage: round(value, 3) for stage, value in stages.items() }
+    }
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=_ROOT,
+                stderr=subprocess.DEVNULL).decode('ascii').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _compare(results, baseline):
+    print('{:<14} {:>12} {:>12} {:>8}   {:>10} {:>10} {:>8}'.format(
+            'mix', 'cmd/s', 'baseline', 'change', 'p99 us', 'baseline', 'change'))
+    for name, result in results['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        rate, base_rate = result['commands_per_s'], base['commands_per_s']
+        p99, base_p99 = result['latency_us']['p99'], base['latency_us']['p99']
+        print('{:<14} {:>12.1f} {:>12.1f} {:>+7.1f}%   {:>10.1f} {:>10.1f} {:>+7.1f}%'.format(
+                name, rate, base_rate, (rate / base_rate - 1) * 100, p99, base_p99, (p99 / base_p99 - 1) * 100))
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end protocol benchmark against a simulated TinyFX.')
+    parser.add_argument('--count', type=int, default=COUNT, help='commands per mix')
+    parser.add_argument('--mix', action='append', help='the mix(es) to run (default: all)')
+    parser.add_argument('--threaded', action='store_true',
+            help="run the target's main loop on a thread, processing messages there")
+    parser.add_argument('--output', help='write the JSON results to this file rather than stdout')
+    parser.add_argument('--compare', help='compare the results with those of a previous run')
+    args = parser.parse_args()
+
+    mixes = _mixes()
+    names = args.mix or list(mixes)
+    for name in names:
+        if name not in mixes:
+            parser.error('unknown mix: {} (expected one of {})'.format(name, ', '.join(mixes)))
+    timer = StageTimer()
+    results = {
+        'meta': {
+            'commit':    _git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python':    platform.python_version(),
+            'platform':  platform.platform(),
+            'threaded':  args.threaded
+        },
+        'results': {}
+    }
+    # the target's console output is discarded (though its cost is included)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        target = SimulatedTarget(ADDRESS)
+        _instrument(target, timer)
+        if args.threaded:
+            target.bus.inline = False
+            target.start()
+        try:
+            with smbus2.SMBus(1) as bus:
+                for name in names:
+                    mixes[name][0](bus) # warm up
+                    results['results'][name] = _run(bus, mixes[name], args.count, timer)
+        finally:
+            target.close()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare) as f:
+            _compare(results, json.load(f))
+
+if __name__ == '__main__':
+    main()
+
+#EOF
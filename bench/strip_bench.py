@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# A benchmark of strip rendering: the frames per second of a StripPlayer of 60
+# and 144 LEDs playing wave effects, comparing an effect per LED (the closures
+# of wave(pos)) with the wave rendering the entire frame buffer in one call,
+# after first checking that both produce the same frames. The strip is a
+# stand-in that counts its writes, so the times are those of the player.
+#
+# From CPython, run from the project directory (using the sim package):
+#
+#   python3 bench/strip_bench.py
+#
+# On MicroPython, copy this file to the TinyFX and import it from the REPL:
+#
+#   >>> import strip_bench
+
+import sys
+import time
+
+if sys.implementation.name == 'cpython': # run against the sim package
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import sim
+    sim.install()
+
+from picofx import StripPlayer
+from picofx.mono import BlinkWaveFX, PulseWaveFX
+from picofx.colour import RainbowWaveFX
+
+FRAMES  = 200
+CHECKED = 50 # frames compared between the two paths
+LENGTHS = (60, 144)
+
+try:
+    _ticks_us   = time.ticks_us
+    _ticks_diff = time.ticks_diff
+except AttributeError: # CPython
+    _ticks_us   = lambda: time.perf_counter_ns() // 1000
+    _ticks_diff = lambda end, start: end - start
+
+class _Strip:
+    '''
+    A stand-in LED strip, holding the colour of each LED.
+    '''
+    def __init__(self, num_leds):
+        self.leds   = bytearray(num_leds * 3)
+        self.writes = 0
+
+    def set_rgb(self, i, r, g, b):
+        self.leds[i * 3]     = r
+        self.leds[i * 3 + 1] = g
+        self.leds[i * 3 + 2] = b
+        self.writes += 1
+
+EFFECTS = (
+    ('rainbow', lambda n: RainbowWaveFX(speed=1, length=n)),
+    ('rainbow baked', lambda n: RainbowWaveFX(speed=1, length=n, baked=True)),
+    ('pulse', lambda n: PulseWaveFX(speed=1, length=n)),
+    ('blink', lambda n: BlinkWaveFX(speed=1, length=n // 4))
+)
+
+def _player(make, num_leds, batch):
+    strip  = _Strip(num_leds)
+    player = StripPlayer(strip, num_leds)
+    wave   = make(num_leds)
+    player.effects = wave if batch else [wave(pos) for pos in range(num_leds)]
+    return player, strip
+
+def _fps(player):
+    start = _ticks_us()
+    for _ in range(FRAMES):
+        player._update(None)
+    elapsed = _ticks_diff(_ticks_us(), start)
+    return FRAMES * 1_000_000 / elapsed if elapsed else 0.0
+
+def main():
+    print('strip benchmark ({} frames)'.format(FRAMES))
+    print('{:<14} {:>5} {:>12} {:>12} {:>8}'.format('effect', 'leds', 'per-led fps', 'batch fps', 'ratio'))
+    for num_leds in LENGTHS:
+        for name, make in EFFECTS:
+            per_led, per_led_strip = _player(make, num_leds, False)
+            batch, batch_strip = _player(make, num_leds, True)
+            for frame in range(CHECKED):
+                per_led._update(None)
+                batch._update(None)
+                if per_led_strip.leds != batch_strip.leds:
+                    raise RuntimeError('{} frames differ at frame {}'.format(name, frame))
+            per_led_fps = _fps(per_led)
+            batch_fps   = _fps(batch)
+            print('{:<14} {:>5} {:>12.0f} {:>12.0f} {:>7.1f}x'.format(name, num_leds,
+                    per_led_fps, batch_fps, batch_fps / per_led_fps if per_led_fps else 0.0))
+
+main()
+
+#EOF
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# A simulation of the TinyFX and its I2C bus on CPython, so that the target
+# (I2CSlave, the controllers and the effects) and the controller functions of
+# tinyfx_ctrl.py can be run together in a single process on Linux, e.g., for
+# performance testing:
+#
+#   import sim
+#   sim.install()                    # before importing any target or controller module
+#   from sim.target import SimulatedTarget
+#   target = SimulatedTarget(0x43)
+#   import smbus2, tinyfx_ctrl
+#   with smbus2.SMBus(1) as bus:
+#       tinyfx_ctrl.send_and_receive(bus, 0x43, 'ch1 on')
+#
+# or, for the tinyfx_ctrl.py command line connected to a simulated TinyFX:
+#
+#   python3 -m sim
+
+import os, sys
+import time
+import traceback
+
+_ROOT    = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_FS_ROOT = os.path.join(_ROOT, 'tinyfx') # the TinyFX's filesystem
+
+_TICKS_PERIOD = 1 << 30
+_TICKS_MAX    = _TICKS_PERIOD - 1
+_TICKS_HALF   = _TICKS_PERIOD // 2
+
+_installed = False
+
+def install(fs_root=_FS_ROOT):
+    '''
+    Install the stand-in machine, micropython, pimoroni_i2c and smbus2
+    modules, the MicroPython extensions to the time and sys modules, and
+    the target's import paths. Absolute paths opened by the audio player
+    (e.g., '/sounds') are resolved relative to fs_root.
+    '''
+    global _installed
+    if _installed:
+        return
+    from sim import machine, micropython, pimoroni_i2c, smbus2
+    sys.modules['machine']      = machine
+    sys.modules['micropython']  = micropython
+    sys.modules['pimoroni_i2c'] = pimoroni_i2c
+    sys.modules['smbus2']       = smbus2
+    # MicroPython extensions to time and sys
+    def sleep_ms(ms):
+        micropython.run_scheduled() # the target's scheduled callbacks run while it sleeps
+        time.sleep(ms / 1000)
+    def sleep_us(us):
+        micropython.run_scheduled()
+        time.sleep(us / 1_000_000)
+    time.sleep_ms   = sleep_ms
+    time.sleep_us   = sleep_us
+    time.ticks_ms   = lambda: (time.monotonic_ns() // 1_000_000) & _TICKS_MAX
+    time.ticks_us   = lambda: (time.monotonic_ns() // 1_000) & _TICKS_MAX
+    time.ticks_cpu  = lambda: time.perf_counter_ns() & _TICKS_MAX
+    time.ticks_add  = lambda ticks, delta: (ticks + delta) & _TICKS_MAX
+    time.ticks_diff = lambda end, start: ((end - start + _TICKS_HALF) & _TICKS_MAX) - _TICKS_HALF
+    sys.print_exception = lambda e, file=sys.stdout: traceback.print_exception(type(e), e, e.__traceback__, file=file)
+    # the target's modules are imported from its root and lib directories
+    for path in (os.path.join(_ROOT, 'tinyfx', 'lib'), os.path.join(_ROOT, 'tinyfx'), _ROOT):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    # resolve the audio player's absolute paths on the TinyFX's filesystem
+    import audio
+    def device_open(path, *args, **kwargs):
+        if path.startswith('/'):
+            path = os.path.join(fs_root, path.lstrip('/'))
+        return open(path, *args, **kwargs)
+    audio.open = device_open
+    _installed = True
+
+#EOF
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# Runs the tinyfx_ctrl.py command line connected to a simulated TinyFX:
+#
+#   python3 -m sim
+
+import sim
+sim.install()
+
+from sim.target import SimulatedTarget
+
+target = SimulatedTarget(0x43, blink_channels=[True, False, False, True, False, False])
+target.start()
+
+import tinyfx_ctrl
+try:
+    tinyfx_ctrl.main()
+finally:
+    target.close()
+
+#EOF
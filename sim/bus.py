@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# A virtual I2C bus connecting a controller (e.g., the stand-in smbus2) to
+# the stand-in I2CTarget instances of simulated targets.
+
+import errno
+import threading
+
+from sim import micropython
+
+# I2CTarget IRQ flags
+IRQ_ADDR_MATCH_READ  = 0x01
+IRQ_ADDR_MATCH_WRITE = 0x02
+IRQ_READ_REQ         = 0x04
+IRQ_WRITE_REQ        = 0x08
+IRQ_END_READ         = 0x10
+IRQ_END_WRITE        = 0x20
+
+_MAX_REQUESTS = 1024 # the limit of IRQs fired per transfer without progress
+
+class VirtualI2CBus:
+    '''
+    A virtual I2C bus, upon which each I2CTarget registers at its address.
+    A transfer by the controller fires the same sequence of IRQ flags as
+    the hardware: a write fires IRQ_WRITE_REQ until the target has read
+    all of the data (via readinto()), then IRQ_END_WRITE; a read fires
+    IRQ_READ_REQ until the target has written enough data (via write()),
+    then IRQ_END_READ. A target in memory mode (I2CTarget(mem=...)) is
+    read and written directly, as the hardware does, firing only the end
+    IRQs. Each IRQ handler runs on the controller's thread, as an IRQ
+    would interrupt the target's main loop.
+
+    If inline is True, callbacks scheduled by the target's IRQ handler
+    (via micropython.schedule) are run at the end of each transfer, as on
+    an otherwise idle target. If False, they run when the target's main
+    loop calls time.sleep_ms(), as on a busy target.
+
+    Args:
+        inline:  if True, run scheduled callbacks after each transfer
+    '''
+    def __init__(self, inline=True):
+        self.inline = inline
+        self._targets = {}
+        self._lock = threading.RLock()
+        self.transfers = 0
+
+    def attach(self, address, target):
+        with self._lock:
+            if address in self._targets:
+                raise OSError(errno.EADDRINUSE, 'address {:#04x} already in use'.format(address))
+            self._targets[address] = target
+
+    def detach(self, address):
+        with self._lock:
+            self._targets.pop(address, None)
+
+    def scan(self):
+        return sorted(self._targets)
+
+    def write(self, address, data):
+        '''
+        Write the data to the target at the address.
+        '''
+        with self._lock:
+            target = self._target(address)
+            self._write(target, data)
+            self._end()
+
+    def read(self, address, length):
+        '''
+        Read length bytes from the target at the address.
+        '''
+        with self._lock:
+            target = self._target(address)
+            data = self._read(target, length)
+            self._end()
+            return data
+
+    def write_read(self, address, data, length):
+        '''
+        Write the data to the target at the address, then read length bytes
+        from it, as a single transfer with a repeated start.
+        '''
+        with self._lock:
+            target = self._target(address)
+            self._write(target, data)
+            result = self._read(target, length)
+            self._end()
+            return result
+
+    def _target(self, address):
+        target = self._targets.get(address)
+        if target is None:
+            raise OSError(errno.EREMOTEIO, 'no target at address {:#04x}'.format(address))
+        self.transfers += 1
+        return target
+
+    def _write(self, target, data):
+        if target.mem is not None:
+            target.mem_write(data)
+            target.fire(IRQ_END_WRITE)
+            return
+        target.fire(IRQ_ADDR_MATCH_WRITE)
+        target.rx_data = bytes(data)
+        for _ in range(_MAX_REQUESTS):
+            if not target.rx_data:
+                break
+            remaining = len(target.rx_data)
+            target.fire(IRQ_WRITE_REQ)
+            if len(target.rx_data) == remaining:
+                raise OSError(errno.EIO, 'target did not accept written data')
+        target.rx_data = b''
+        target.fire(IRQ_END_WRITE)
+
+    def _read(self, target, length):
+        if target.mem is not None:
+            data = target.mem_read(length)
+            target.fire(IRQ_END_READ)
+            return data
+        target.fire(IRQ_ADDR_MATCH_READ)
+        target.tx_data = bytearray()
+        for _ in range(_MAX_REQUESTS):
+            if len(target.tx_data) >= length:
+                break
+            supplied = len(target.tx_data)
+            target.fire(IRQ_READ_REQ)
+            if len(target.tx_data) == supplied:
+                break
+        data = bytes(target.tx_data[:length])
+        target.tx_data = None
+        target.fire(IRQ_END_READ)
+        # an idle bus reads as 0xff
+        return data + b'\xff' * (length - len(data))
+
+    def _end(self):
+        if self.inline:
+            micropython.run_scheduled()
+
+# the bus shared by all stand-in I2CTarget and SMBus instances, whatever their
+# bus ID or number, as the target's I2C0 and the controller's I2C bus 1 are
+# the two ends of the same wire
+default = VirtualI2CBus()
+
+#EOF
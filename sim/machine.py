@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# A stand-in for the MicroPython machine module, providing those classes used
+# by the target: Pin, PWM, ADC, Timer, I2S and I2CTarget.
+
+import threading
+import time
+from collections import deque
+
+from sim import bus as _bus
+
+HISTORY_LENGTH = 1024 # the number of PWM duty changes retained per output
+
+def _ticks_us():
+    return time.perf_counter_ns() // 1000
+
+def freq(hz=None):
+    return 125_000_000
+
+def reset():
+    raise SystemExit('machine.reset()')
+
+def unique_id():
+    return b'\x00sim\x00\x00\x00\x01'
+
+# ┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈
+
+class Pin:
+    '''
+    A GPIO pin. An input's value may be set from the simulation, e.g.,
+    Pin.instances[26].value(1) to trigger the PIR sensor.
+    '''
+    IN        = 0
+    OUT       = 1
+    OPEN_DRAIN = 2
+    PULL_UP   = 1
+    PULL_DOWN = 2
+
+    instances = {} # pin ID -> most recently constructed Pin
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id    = id
+        self.mode  = mode
+        self.pull  = pull
+        self._value = value if value is not None else (1 if pull == Pin.PULL_UP else 0)
+        Pin.instances[id] = self
+
+    def value(self, value=None):
+        if value is None:
+            return self._value
+        self._value = 1 if value else 0
+
+    def on(self):
+        self._value = 1
+
+    def off(self):
+        self._value = 0
+
+    high = on
+    low  = off
+
+    def __call__(self, value=None):
+        return self.value(value)
+
+    def __repr__(self):
+        return 'Pin({})'.format(self.id)
+
+class PWM:
+    '''
+    A PWM output, recording each change of its duty cycle, with the time
+    at which it occurred, as (ticks_us, duty_u16). The writes count
+    includes writes that did not change the duty cycle.
+    '''
+    instances = {} # pin ID -> most recently constructed PWM
+
+    def __init__(self, pin, freq=1000, duty_u16=0, invert=False):
+        self.pin     = pin
+        self._freq   = freq
+        self._duty   = duty_u16
+        self.invert  = invert
+        self.writes  = 0
+        self.history = deque([(_ticks_us(), duty_u16)], maxlen=HISTORY_LENGTH)
+        PWM.instances[pin.id if isinstance(pin, Pin) else pin] = self
+
+    def freq(self, value=None):
+        if value is None:
+            return self._freq
+        self._freq = value
+
+    def duty_u16(self, value=None):
+        if value is None:
+            return self._duty
+        self.writes += 1
+        if value != self._duty:
+            self._duty = value
+            self.history.append((_ticks_us(), value))
+
+    def duty_ns(self, value=None):
+        period_ns = 1_000_000_000 // self._freq
+        if value is None:
+            return self._duty * period_ns // 65535
+        self.duty_u16(value * 65535 // period_ns)
+
+    def deinit(self):
+        pass
+
+class ADC:
+    '''
+    An analog input, returning the value set from the simulation.
+    '''
+    def __init__(self, pin):
+        self.pin = pin
+        self.value = 0
+
+    def read_u16(self):
+        return self.value
+
+class Timer:
+    '''
+    A periodic or one-shot timer, running its callback on a thread.
+    '''
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, mode=PERIODIC, period=-1, callback=None):
+        self._stop = None
+        if callback is not None:
+            self.init(mode=mode, period=period, callback=callback)
+
+    def init(self, mode=PERIODIC, period=-1, callback=None, freq=None):
+        self.deinit()
+        if freq is not None:
+            period = 1000 / freq
+        stop = self._stop = threading.Event()
+        def run():
+            while not stop.wait(period / 1000):
+                callback(self)
+                if mode == Timer.ONE_SHOT:
+                    return
+        threading.Thread(target=run, daemon=True).start()
+
+    def deinit(self):
+        if self._stop:
+            self._stop.set()
+            self._stop = None
+
+class I2S:
+    '''
+    An I2S output sink. Each buffer written is consumed in real time, at
+    the configured sample rate, after which the IRQ callback is invoked on
+    a thread, as upon completion of the DMA transfer on the hardware.
+    '''
+    TX     = 0
+    RX     = 1
+    MONO   = 0
+    STEREO = 1
+
+    def __init__(self, id, sck=None, ws=None, sd=None, mode=TX, bits=16, format=MONO, rate=44_100, ibuf=20_000):
+        self.bits   = bits
+        self.format = format
+        self.rate   = rate
+        self.bytes_written   = 0
+        self.buffers_written = 0
+        self._callback = None
+        self._queue    = deque()
+        self._ready    = threading.Condition()
+        self._running  = True
+        threading.Thread(target=self._consume, daemon=True).start()
+
+    @property
+    def bytes_per_second(self):
+        return self.rate * (2 if self.format == I2S.STEREO else 1) * self.bits // 8
+
+    def irq(self, handler):
+        self._callback = handler
+
+    def write(self, buf):
+        data = bytes(buf)
+        with self._ready:
+            self._queue.append(data)
+            self._ready.notify()
+        return len(data)
+
+    def deinit(self):
+        with self._ready:
+            self._running = False
+            self._ready.notify()
+
+    def _consume(self):
+        while True:
+            with self._ready:
+                while self._running and not self._queue:
+                    self._ready.wait()
+                if not self._running:
+                    return
+                data = self._queue.popleft()
+            time.sleep(len(data) / self.bytes_per_second)
+            self.bytes_written   += len(data)
+            self.buffers_written += 1
+            if self._callback and self._running:
+                self._callback(self)
+
+class I2CTarget:
+    '''
+    An I2C target, attached to the virtual bus at its address. In memory
+    mode (mem supplied) the controller reads and writes mem directly,
+    the first byte written being the memory address.
+    '''
+    IRQ_ADDR_MATCH_READ  = _bus.IRQ_ADDR_MATCH_READ
+    IRQ_ADDR_MATCH_WRITE = _bus.IRQ_ADDR_MATCH_WRITE
+    IRQ_READ_REQ         = _bus.IRQ_READ_REQ
+    IRQ_WRITE_REQ        = _bus.IRQ_WRITE_REQ
+    IRQ_END_READ         = _bus.IRQ_END_READ
+    IRQ_END_WRITE        = _bus.IRQ_END_WRITE
+
+    def __init__(self, id, addr, *, addrsize=7, mem=None, mem_addrsize=8, scl=None, sda=None):
+        self.id      = id
+        self.addr    = addr
+        self.mem     = mem
+        self._mem_addr = 0
+        self.rx_data = b''
+        self.tx_data = None
+        self._irq    = _IRQ()
+        self._bus    = _bus.default
+        self._bus.attach(addr, self)
+
+    def deinit(self):
+        self._bus.detach(self.addr)
+
+    def irq(self, handler=None, trigger=0, hard=False):
+        if handler is not None:
+            self._irq.handler = handler
+            self._irq.trigger = trigger
+        return self._irq
+
+    def readinto(self, buf):
+        n = min(len(buf), len(self.rx_data))
+        buf[:n] = self.rx_data[:n]
+        self.rx_data = self.rx_data[n:]
+        return n
+
+    def write(self, buf):
+        if self.tx_data is None: # not within a read
+            return 0
+        self.tx_data.extend(buf)
+        return len(buf)
+
+    def fire(self, flag):
+        '''
+        Invoke the IRQ handler for the flag, if triggered. Used by the bus.
+        '''
+        if self._irq.handler and self._irq.trigger & flag:
+            self._irq._flags = flag
+            try:
+                self._irq.handler(self)
+            finally:
+                self._irq._flags = 0
+
+    def mem_write(self, data):
+        if data:
+            self._mem_addr = data[0]
+            for b in data[1:]:
+                self.mem[self._mem_addr % len(self.mem)] = b
+                self._mem_addr += 1
+
+    def mem_read(self, length):
+        data = bytes(self.mem[(self._mem_addr + i) % len(self.mem)] for i in range(length))
+        self._mem_addr += length
+        return data
+
+class _IRQ:
+    def __init__(self):
+        self.handler = None
+        self.trigger = 0
+        self._flags  = 0
+
+    def flags(self):
+        return self._flags
+
+#EOF
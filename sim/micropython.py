@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# A stand-in for the MicroPython micropython module. There are no code emitters
+# (viper, native), so modules that test for them use their Python fallbacks.
+
+import threading
+from collections import deque
+
+SCHEDULE_DEPTH = 8 # the depth of the scheduler queue, as on the RP2040
+
+_scheduled = deque()
+_lock = threading.Lock()
+_heap_locked = 0
+
+def const(value):
+    return value
+
+def schedule(func, arg):
+    '''
+    Schedule func(arg) to run "very soon": here, at the end of the current
+    bus transfer, or upon the target's next call to time.sleep_ms().
+    Raises RuntimeError if the queue is full, as on MicroPython.
+    '''
+    with _lock:
+        if len(_scheduled) >= SCHEDULE_DEPTH:
+            raise RuntimeError('schedule queue full')
+        _scheduled.append((func, arg))
+
+def run_scheduled():
+    '''
+    Run all scheduled callbacks, in order. Not part of MicroPython.
+    '''
+    while True:
+        with _lock:
+            if not _scheduled:
+                return
+            func, arg = _scheduled.popleft()
+        func(arg)
+
+def heap_lock():
+    global _heap_locked
+    _heap_locked += 1
+    return _heap_locked - 1
+
+def heap_unlock():
+    global _heap_locked
+    _heap_locked = max(0, _heap_locked - 1)
+    return _heap_locked
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+def mem_info(verbose=None):
+    print('mem: not available in simulation')
+
+#EOF
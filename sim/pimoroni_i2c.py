@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# A stand-in for the Pimoroni pimoroni_i2c module. The TinyFX's Qw/ST port
+# has nothing attached in the simulation.
+
+class PimoroniI2C:
+    def __init__(self, sda, scl, baudrate=400_000):
+        self.sda = sda
+        self.scl = scl
+        self.baudrate = baudrate
+
+    def scan(self):
+        return []
+
+#EOF
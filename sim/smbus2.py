@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# A stand-in for the smbus2 module, providing those SMBus methods (and the
+# i2c_msg of combined transfers) used by the controller, performed upon the
+# virtual I2C bus.
+
+from sim import bus as _bus
+
+I2C_SMBUS_BLOCK_MAX = 32
+I2C_M_RD = 0x0001
+
+class i2c_msg:
+    '''
+    A message of a combined transfer (see SMBus.i2c_rdwr()), created by
+    i2c_msg.read() or i2c_msg.write().
+    '''
+    def __init__(self, addr, flags, buf):
+        self.addr  = addr
+        self.flags = flags
+        self.buf   = buf
+        self.len   = len(buf)
+
+    @staticmethod
+    def read(address, length):
+        return i2c_msg(address, I2C_M_RD, bytearray(length))
+
+    @staticmethod
+    def write(address, buf):
+        return i2c_msg(address, 0, bytearray(buf.encode('ascii') if isinstance(buf, str) else buf))
+
+    def __iter__(self):
+        return iter(self.buf)
+
+    def __bytes__(self):
+        return bytes(self.buf)
+
+class SMBus:
+    '''
+    An SMBus connection to the virtual I2C bus. The bus argument may be a
+    VirtualI2CBus; a bus number or path is accepted but ignored, as there
+    is only the default bus.
+    '''
+    def __init__(self, bus=None, force=False):
+        self.fd  = None
+        self._bus = bus if isinstance(bus, _bus.VirtualI2CBus) else _bus.default
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def open(self, bus):
+        pass
+
+    def close(self):
+        pass
+
+    def write_byte(self, i2c_addr, value, force=None):
+        self._bus.write(i2c_addr, bytes([value]))
+
+    def read_byte(self, i2c_addr, force=None):
+        return self._bus.read(i2c_addr, 1)[0]
+
+    def write_i2c_block_data(self, i2c_addr, register, data, force=None):
+        if len(data) > I2C_SMBUS_BLOCK_MAX:
+            raise ValueError('Data length cannot exceed {} bytes'.format(I2C_SMBUS_BLOCK_MAX))
+        self._bus.write(i2c_addr, bytes([register]) + bytes(data))
+
+    def read_i2c_block_data(self, i2c_addr, register, length, force=None):
+        if length > I2C_SMBUS_BLOCK_MAX:
+            raise ValueError('Desired block length over {} bytes'.format(I2C_SMBUS_BLOCK_MAX))
+        return list(self._bus.write_read(i2c_addr, bytes([register]), length))
+
+    def i2c_rdwr(self, *i2c_msgs):
+        '''
+        Perform the messages as a combined transfer: a write followed by a
+        read of the same address is a write-read with a repeated start.
+        '''
+        i = 0
+        while i < len(i2c_msgs):
+            msg = i2c_msgs[i]
+            following = i2c_msgs[i + 1] if i + 1 < len(i2c_msgs) else None
+            if msg.flags & I2C_M_RD:
+                msg.buf[:] = self._bus.read(msg.addr, msg.len)
+            elif following is not None and following.flags & I2C_M_RD and following.addr == msg.addr:
+                following.buf[:] = self._bus.write_read(msg.addr, bytes(msg.buf), following.len)
+                i += 1
+            else:
+                self._bus.write(msg.addr, bytes(msg.buf))
+            i += 1
+
+#EOF
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# A simulated TinyFX target: the I2CSlave and its controller, as assembled
+# by main.py, attached to the virtual I2C bus. Call sim.install() first.
+
+import threading
+import time
+
+from sim import bus as _bus
+from sim.machine import PWM
+
+class SimulatedTarget:
+    '''
+    A TinyFX (or, if tinyfx is False, the generic Controller) target at
+    the given address on the virtual I2C bus.
+
+    By default the target is idle: each message is processed as soon as
+    it is received, at the end of the bus transfer. Calling start() runs
+    the target's main loop on a thread, as in main.py, in which case
+    messages are processed either by the main loop, or if the bus is
+    inline, upon receipt; tick() may instead be called to perform a
+    single iteration of the main loop.
+
+    Args:
+        address:         the I2C address of the target
+        tinyfx:          if True use the TinyFxController, otherwise the Controller
+        blink_channels:  the blinking channels, as passed to the TinyFxController
+        perf_stats:      if True, keep the target's performance counters
+    '''
+    def __init__(self, address=0x43, tinyfx=True, blink_channels=None, perf_stats=False):
+        from i2c_slave import I2CSlave
+        if tinyfx:
+            from tinyfx_controller import TinyFxController
+            self.controller = TinyFxController(blink_channels)
+        else:
+            from controller import Controller
+            self.controller = Controller()
+        self.address = address
+        self.slave = I2CSlave(i2c_address=address, perf_stats=perf_stats)
+        self.controller.set_slave(self.slave)
+        self.slave.enable()
+        self._thread = None
+        self._running = False
+
+    @property
+    def bus(self):
+        return _bus.default
+
+    def tick(self, delta_ms=1):
+        '''
+        Perform a single iteration of the target's main loop.
+        '''
+        perf = self.slave.perf_stats
+        if perf:
+            tick_start = perf.loop_start()
+        self.slave.hold(True)
+        self.controller.tick(delta_ms)
+        self.slave.hold(False)
+        if perf:
+            perf.tick_end(tick_start)
+        self.slave.check_and_process()
+
+    def start(self):
+        '''
+        Run the target's main loop on a thread.
+        '''
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        self.slave.disable()
+
+    def _loop(self):
+        last_time = time.ticks_ms()
+        while self._running:
+            current_time = time.ticks_ms()
+            delta_ms = time.ticks_diff(current_time, last_time)
+            last_time = current_time
+            self.tick(delta_ms)
+            time.sleep_ms(1)
+
+    def duty(self, pin):
+        '''
+        Return the current duty cycle (0-65535) of the PWM output on the pin.
+        '''
+        return PWM.instances[pin].duty_u16()
+
+    def history(self, pin):
+        '''
+        Return the recorded duty cycle changes of the PWM output on the
+        pin, as a list of (ticks_us, duty_u16).
+        '''
+        return list(PWM.instances[pin].history)
+
+#EOF
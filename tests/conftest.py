@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# Fixtures for the tests, which run the target and controller together on
+# CPython using the sim package.
+
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import sim
+sim.install()
+
+from sim import bus as _bus
+from sim.target import SimulatedTarget
+
+@pytest.fixture
+def busy_target():
+    '''
+    A simulated TinyFX whose main loop runs on a thread, processing the
+    messages it receives only between ticks, as a busy target does.
+    '''
+    _bus.default.inline = False
+    target = SimulatedTarget(0x43)
+    target.start()
+    yield target
+    target.close()
+    _bus.default.inline = True
+
+#EOF
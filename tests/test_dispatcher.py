@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# Tests of the Dispatcher's tagged requests.
+
+import pytest
+
+from dispatcher import Dispatcher
+from message_util import pack_message
+from opcodes import OP_REQUEST, OP_FETCH
+
+def test_request_id_zero_refused():
+    dispatcher = Dispatcher()
+    with pytest.raises(ValueError):
+        dispatcher.dispatch(bytes([OP_REQUEST, 0]) + b'ch1 on')
+    assert dispatcher.dispatch(bytes([OP_FETCH, 0])) == 'ERR'
+    with pytest.raises(ValueError):
+        pack_message('ch1 on', request_id=0)
+
+def test_request_fetched_by_id():
+    dispatcher = Dispatcher()
+    tagged = dispatcher.dispatch(bytes([OP_REQUEST, 9]) + b'ch1 on')
+    assert bytes(tagged) == bytes([OP_REQUEST, 9]) + b'ACK'
+    assert dispatcher.dispatch(bytes([OP_FETCH, 9])) == tagged
+
+#EOF
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# Tests of the picofx effects and players.
+
+import picofx
+from picofx import StripPlayer, Wave
+from picofx.colour import RainbowFX, HueStepFX
+
+class _Strip:
+    '''
+    A stand-in LED strip, holding the colour of each LED.
+    '''
+    def __init__(self, num_leds):
+        self.leds = bytearray(num_leds * 3)
+
+    def set_rgb(self, i, r, g, b):
+        self.leds[i * 3:i * 3 + 3] = bytes((r, g, b))
+
+class _Ramp(Wave):
+    '''
+    A minimal wave, overriding only __call__(pos): a brightness rising along
+    the strip, with every fourth LED red.
+    '''
+    def __call__(self, pos):
+        def fx():
+            if pos % 4 == 0:
+                return 255, 0, 0
+            return pos / self.length
+        return self, fx
+
+def test_wave_default_render():
+    strip  = _Strip(8)
+    player = StripPlayer(strip, 8)
+    player.effects = _Ramp(speed=1, length=8)
+    player._update(None)
+    expected = bytearray()
+    for pos in range(8):
+        expected += bytes((255, 0, 0)) if pos % 4 == 0 else bytes([int(pos / 8 * 255)] * 3)
+    assert player.frame == expected
+    assert strip.leds == expected
+
+def test_rebake_at_full_budget_and_close():
+    budget = picofx.lut_usage()[1]
+    picofx.set_lut_budget(256 * 3 + 6 * 3)
+    try:
+        rainbow = RainbowFX(baked=True)
+        step    = HueStepFX(baked=True)
+        assert picofx.lut_usage()[0] == 256 * 3 + 6 * 3
+        rainbow.sat = 0.5 # baked again in the same budget
+        step.val = 0.5
+        assert rainbow.baked == 256 and step.baked == 6
+        rainbow.close()
+        step.baked = False
+        assert picofx.lut_usage()[0] == 0
+        assert rainbow.baked == 0 and step.baked == 0
+    finally:
+        picofx.set_lut_budget(budget)
+
+#EOF
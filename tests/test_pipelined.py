@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# Tests of the PipelinedClient of tinyfx_ctrl.py.
+
+import pytest
+import smbus2
+
+from tinyfx_ctrl import PipelinedClient
+from tinyfx.dispatcher import RECEIVE_QUEUE_SIZE
+
+def test_full_window_against_busy_target(busy_target):
+    with smbus2.SMBus(1) as bus:
+        client = PipelinedClient(bus, busy_target.address, window=RECEIVE_QUEUE_SIZE)
+        ids = [ client.submit('ch1 on' if i % 2 else 'ch1 off') for i in range(RECEIVE_QUEUE_SIZE * 3) ]
+        responses = client.drain()
+    assert sorted(responses) == sorted(ids)
+    assert all(response == 'ACK' for response in responses.values())
+    assert busy_target.slave.ring_overflow_count == 0
+
+def test_window_limited_to_receive_queue():
+    with pytest.raises(ValueError):
+        PipelinedClient(None, 0x43, window=RECEIVE_QUEUE_SIZE + 1)
+
+#EOF
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# Tests of the responses to ASCII commands, as routed by the controllers.
+
+import pytest
+
+from controller import Controller
+from tinyfx_controller import TinyFxController
+
+# the responses of the controllers before commands were routed by a table
+TINYFX_RESPONSES = [
+    ('ch1 on', 'ACK'), ('CH2 OFF', 'ACK'), ('ch1 bad', 'ERR'),
+    ('ch1', 'NACK'), ('ch1 on extra', 'NACK'), ('all', 'NACK'), ('all off x', 'NACK'),
+    ('heartbeat on', 'ACK'), ('heartbeat', 'ERR'), ('heartbeat off x', 'ACK'),
+    ('color red', 'ACK'), ('color', 'ACK'), ('color red blue', 'ACK'),
+    ('play beep x', 'ACK'), ('respond a b c d', 'ACK'), ('pir x', 'NOT_IMPL'),
+    ('get x', 'ACK'), ('clear x', 'ACK'), ('rand', 'NACK'), ('nosuch', 'NACK'), ('', 'ERR')
+]
+
+CONTROLLER_RESPONSES = [
+    ('get x', 'ACK'), ('clear x', 'ACK'), ('rand x y', 'ERR'), ('nosuch a b', 'ACK'), ('', 'ERR')
+]
+
+@pytest.fixture(scope='module')
+def tinyfx():
+    return TinyFxController()
+
+@pytest.mark.parametrize('cmd, response', TINYFX_RESPONSES)
+def test_tinyfx_responses(tinyfx, cmd, response):
+    assert tinyfx.process(cmd) == response
+
+@pytest.mark.parametrize('cmd, response', CONTROLLER_RESPONSES)
+def test_controller_responses(cmd, response):
+    assert Controller().process(cmd) == response
+
+def test_controller_rand_ignores_extra_arguments():
+    assert len(Controller().process('rand x 4 z')) == 4
+
+#EOF
@@ -1,15 +1,19 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 #
-# Copyright 2020-2025 by Murray Altheim. All rights reserved. This file is part
+# Copyright 2020-2026 by Murray Altheim. All rights reserved. This file is part
 # of the Robot Operating System project, released under the MIT License.
 #
 # author:   Murray Altheim
 # created:  2025-11-16
-# modified: 2025-11-23
+# modified: 2026-10-16
 
 import random # for sample response
 
+from opcodes import OP_PING, operands_valid
+from registers import WRITABLE_COUNT
+from router import Router, text, word, integer
+
 class Controller:
     '''
     A controller for command strings received from the I2CSlave.
@@ -20,12 +24,36 @@ class Controller:
 
     This includes a sample method to return a random string, as
     a demonstration of how to return data upon a request.
+
+    Command strings are routed by a Router (see router.py): subclasses
+    add their commands with add_command() rather than overriding process().
     '''
     def __init__(self):
         self._chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
         self._slave = None
+        self._router = Router()
+        self._router.default = self._on_unrouted
+        self.add_command('rand',  self._rand, text, integer, min_args=0, ignore_extra=True)
+        self.add_command('get',   self._ack, ignore_extra=True) # return previous response as data
+        self.add_command('clear', self._ack, ignore_extra=True) # clear buffer after data request
+        self.add_command('stats', self._get_stats, word, min_args=0, ignore_extra=True)
         print('ready.')
 
+    @property
+    def router(self):
+        return self._router
+
+    def add_command(self, name, handler, *arg_types, min_args=None, ignore_extra=False, mismatch='ERR'):
+        '''
+        Adds a command, handled by the handler, which accepts arguments of
+        the given types (see router.py) and returns the response, or None
+        for 'ACK'. Arguments beyond min_args are optional. Any beyond the
+        types are ignored if ignore_extra is True; otherwise, as are too
+        few, they are answered with the mismatch response.
+        '''
+        self._router.add(name, handler, *arg_types, min_args=min_args,
+                ignore_extra=ignore_extra, mismatch=mismatch)
+
     def set_slave(self, slave):
         '''
         Assigns the I2C slave and registers this controller's callback.
@@ -33,6 +61,9 @@ class Controller:
         '''
         self._slave = slave
         self._slave.add_callback(self.on_command)
+        self._slave.add_binary_callback(self.on_binary_command)
+        if hasattr(self._slave, 'add_register_callback'): # register-mapped mode
+            self._slave.add_register_callback(self.on_registers)
 
     def on_command(self, cmd):
         '''
@@ -41,6 +72,23 @@ class Controller:
         '''
         return self.process(cmd)
 
+    def on_binary_command(self, payload):
+        '''
+        Callback invoked by I2C slave when a binary (opcode) command is received.
+        Delegates to process_binary() for handling.
+        '''
+        return self.process_binary(payload)
+
+    def on_registers(self, registers, changed):
+        '''
+        Callback invoked by the I2C slave in register-mapped mode, once per
+        frame, with the register map and a bit mask of the state registers
+        changed (see registers.py). This simply prints the changes.
+        '''
+        for i in range(WRITABLE_COUNT):
+            if changed & (1 << i):
+                print("register {:#04x}: {}".format(i, registers[i]))
+
     def tick(self, delta_ms):
         '''
         Can be called from main to update based on a delta in milliseconds.
@@ -50,40 +98,72 @@ class Controller:
     def _get_random_string(self, n=8):
         return ''.join(self._chars[random.getrandbits(6) % len(self._chars)] for _ in range(n))
 
+    def _get_stats(self, action=None):
+        '''
+        Returns the I2C slave's performance statistics, or the bucket counts
+        of a named histogram, or if the action is 'reset', resets them.
+        '''
+        if self._slave is None or getattr(self._slave, 'perf_stats', None) is None:
+            return 'NOT_ENABLED'
+        if action == 'reset':
+            self._slave.reset_stats()
+            return 'ACK'
+        stats = self._slave.stats(action)
+        return stats if stats is not None else 'ERR'
+
+    def _ack(self):
+        return 'ACK'
+
+    def _rand(self, _arg0=None, n=None):
+        '''
+        Returns a random string, of length n (the second argument) or 8.
+        '''
+        response = self._get_random_string(8 if n is None else n)
+        print("generated random '{}'".format(response))
+        return response
+
+    def _on_unrouted(self, cmd):
+        '''
+        The generic controller prints any command it does not recognise,
+        with up to three arguments: arg0, arg1, arg2.
+        '''
+        parts = cmd.lower().split()
+        _arg0 = parts[1] if len(parts) > 1 else None
+        _arg1 = parts[2] if len(parts) > 2 else None
+        _arg2 = parts[3] if len(parts) > 3 else None
+        print("command: '{}'{}{}{}".format(
+                parts[0],
+                "; arg0: '{}'".format(_arg0) if _arg0 else '',
+                "; arg1: '{}'".format(_arg1) if _arg1 else '',
+                "; arg2: '{}'".format(_arg2) if _arg2 else ''))
+        return 'ACK'
+#       return 'NACK' # for unsupported commands
+
     def process(self, cmd):
         '''
-        Processes the callback from the I2C slave, returning 'ACK' or 'ERR'.
-        This will process up to three optional arguments: arg0, arg1, arg2.
+        Processes the callback from the I2C slave, routing the command to
+        its handler and returning its response, 'ACK', 'NACK' or 'ERR'.
         '''
         try:
             print("command string: '{}'".format(cmd))
-            parts = cmd.lower().split()
-            if len(parts) == 0:
+            return self._router.route(cmd)
+        except Exception as e:
+            print("{} raised by controller: {}".format(type(e), e))
+            return 'ERR'
+
+    def process_binary(self, payload):
+        '''
+        Processes a binary command from the I2C slave, returning 'ACK',
+        'NACK' or 'ERR'. The payload is an opcode byte followed by its
+        operands, as defined in opcodes.py.
+        '''
+        try:
+            if not operands_valid(payload):
                 return 'ERR'
-            # process command
-            _cmd  = parts[0]
-            _arg0 = parts[1] if len(parts) > 1 else None
-            _arg1 = parts[2] if len(parts) > 2 else None
-            _arg2 = parts[3] if len(parts) > 3 else None
-            if _cmd == 'rand':
-                n = 8 if _arg1 is None else int(_arg1)
-                response = self._get_random_string(n)
-                print("generated random '{}'".format(response))
-                return response
-            elif _cmd == 'get':
-                # return previous response as data
-                return 'ACK'
-            elif _cmd == 'clear':
-                # clear buffer after data request
-                return 'ACK'
-            else:
-                print("command: '{}'{}{}{}".format(
-                        _cmd,
-                        "; arg0: '{}'".format(_arg0) if _arg0 else '',
-                        "; arg1: '{}'".format(_arg1) if _arg1 else '',
-                        "; arg2: '{}'".format(_arg2) if _arg2 else ''))
+            if payload[0] == OP_PING:
                 return 'ACK'
-#           return 'NACK' # for unsupported commands
+            print("opcode: {:#04x}; operands: {}".format(payload[0], list(payload[1:])))
+            return 'ACK'
         except Exception as e:
             print("{} raised by controller: {}".format(type(e), e))
             return 'ERR'
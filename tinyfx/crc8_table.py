@@ -1,5 +1,5 @@
-# CRC-8 table for polynomial 0x07 (MSB-first)
-CRC8_TABLE = [
+# CRC-8 table for polynomial 0x07 (MSB-first), as bytes to keep it compact
+CRC8_TABLE = bytes([
     0x00, 0x07, 0x0E, 0x09, 0x1C, 0x1B, 0x12, 0x15,
     0x38, 0x3F, 0x36, 0x31, 0x24, 0x23, 0x2A, 0x2D,
     0x70, 0x77, 0x7E, 0x79, 0x6C, 0x6B, 0x62, 0x65,
@@ -32,4 +32,4 @@ CRC8_TABLE = [
     0x96, 0x91, 0x98, 0x9F, 0x8A, 0x8D, 0x84, 0x83,
     0xDE, 0xD9, 0xD0, 0xD7, 0xC2, 0xC5, 0xCC, 0xCB,
     0xE6, 0xE1, 0xE8, 0xEF, 0xFA, 0xFD, 0xF4, 0xF3,
-]
+])
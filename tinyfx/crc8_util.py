@@ -0,0 +1,75 @@
+#!/micropython
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# CRC-8 (polynomial 0x07) calculation, using a viper implementation on
+# MicroPython and a pure-Python implementation elsewhere (e.g., CPython).
+# Both return identical results.
+#
+# On CPython the per-byte loop over a list is the fastest pure-Python form
+# found: a 16-bit table indexed by pairs of bytes, reading the data as 16-bit
+# words, and bytes.translate() over the bytes at each distance from the end
+# (as the CRC is linear) all measured slower (see bench/crc8_bench.py).
+
+try:
+    from upy.crc8_table import CRC8_TABLE
+except ImportError:
+    from crc8_table import CRC8_TABLE
+
+try:
+    import micropython
+
+    @micropython.viper
+    def crc8(data, start:int, end:int) -> int:
+        # returns the CRC-8 of data[start:end] without allocating
+        table = ptr8(CRC8_TABLE)
+        buf = ptr8(data)
+        crc = 0
+        for i in range(start, end):
+            crc = int(table[crc ^ int(buf[i])])
+        return crc
+
+    def calculate_crc8(data):
+        '''
+        Returns the CRC-8 of all of data.
+        '''
+        return crc8(data, 0, len(data))
+
+    IMPLEMENTATION = 'viper'
+
+except (ImportError, AttributeError): # no viper emitter (e.g., CPython)
+
+    # indexing a list is faster than indexing bytes on CPython
+    _TABLE = list(CRC8_TABLE)
+
+    def crc8(data, start, end, table=_TABLE):
+        '''
+        Returns the CRC-8 of data[start:end], where data is any bytes-like object.
+        The range is sliced, as iterating over bytes is faster than over a
+        memoryview (and a slice of all of a bytes object is not copied).
+        '''
+        crc = 0
+        for b in data[start:end]:
+            crc = table[crc ^ b]
+        return crc
+
+    def calculate_crc8(data, table=_TABLE):
+        '''
+        Returns the CRC-8 of all of data, iterating over it directly rather
+        than through crc8(), as a call costs more than a short message.
+        '''
+        crc = 0
+        for b in data:
+            crc = table[crc ^ b]
+        return crc
+
+    IMPLEMENTATION = 'python'
+
+#EOF
@@ -0,0 +1,163 @@
+#!/micropython
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# Dispatches unpacked payloads to the controller, shared by both I2C slave
+# implementations.
+
+try:
+    from upy.opcodes import is_binary, OP_BATCH, OP_REQUEST, OP_FETCH, STATUS_ACK, STATUS_NACK, STATUS_ERR
+except ImportError:
+    from opcodes import is_binary, OP_BATCH, OP_REQUEST, OP_FETCH, STATUS_ACK, STATUS_NACK, STATUS_ERR
+
+RESPONSE_TABLE_SIZE = 8 # the number of recent tagged responses retained
+RECEIVE_QUEUE_SIZE  = 7 # the number of received messages the target can queue
+
+class Dispatcher:
+    '''
+    Dispatches the payload of a received message to the registered callbacks.
+    The payload may be any bytes-like object, including a memoryview into
+    a receive buffer, which is only valid for the duration of the call.
+
+    ASCII payloads are decoded and passed to the command callback as a
+    string. Binary payloads (see opcodes.py) are passed undecoded to the
+    binary callback, so that they can be handled without creating strings.
+
+    A batch payload (OP_BATCH) is validated as a whole, then each of its
+    commands is dispatched in turn, so that the entire batch is applied
+    before the caller returns to the main loop.
+
+    A payload tagged with a request ID (OP_REQUEST) has its response tagged
+    with the same ID and retained in a small table keyed by ID, from which
+    it can be retrieved later (OP_FETCH). This permits the master to have
+    several requests in flight and collect their responses afterwards.
+    '''
+    def __init__(self):
+        self._callback = None
+        self._binary_callback = None
+        self._response_ids = bytearray(RESPONSE_TABLE_SIZE) # 0 indicates an empty slot
+        self._responses = [None] * RESPONSE_TABLE_SIZE
+
+    def add_callback(self, callback):
+        '''
+        Registers a callback that accepts a single ASCII string and returns
+        a string response.
+        '''
+        self._callback = callback
+
+    def add_binary_callback(self, callback):
+        '''
+        Registers a callback that accepts a binary payload (bytes-like) and
+        returns a string response.
+        '''
+        self._binary_callback = callback
+
+    def dispatch(self, payload):
+        '''
+        Dispatches the payload to the appropriate callback, returning its
+        response, 'ACK' if there is no callback or it returned nothing,
+        or 'NACK' for a binary payload with no binary callback registered.
+        '''
+        if is_binary(payload):
+            if payload[0] == OP_REQUEST:
+                return self._dispatch_request(payload)
+            elif payload[0] == OP_FETCH:
+                return self._fetch_response(payload)
+            elif payload[0] == OP_BATCH:
+                return self._dispatch_batch(payload)
+            if not self._binary_callback:
+                return 'NACK'
+            response = self._binary_callback(payload)
+        elif self._callback:
+            response = self._callback(str(payload, 'ascii'))
+        else:
+            response = None
+        return response if response else 'ACK'
+
+    def _dispatch_request(self, payload):
+        '''
+        Dispatches the payload following the request ID, returning its
+        response tagged with the same ID: [OP_REQUEST][request id][response]
+        The tagged response is also retained in the response table. A
+        request ID of 0 is refused, as it marks an empty slot of the table.
+        '''
+        if len(payload) < 3:
+            raise ValueError('request too short')
+        request_id = payload[1]
+        if request_id == 0:
+            raise ValueError('request ID 0 is reserved')
+        try:
+            if payload[2] == OP_REQUEST:
+                raise ValueError('nested request')
+            response = self.dispatch(payload[2:])
+        except Exception as e:
+            print("ERROR: {} raised processing request {}: {}".format(type(e), request_id, e))
+            response = 'ERR'
+        tagged = bytearray(2)
+        tagged[0] = OP_REQUEST
+        tagged[1] = request_id
+        tagged.extend(response.encode('ascii') if isinstance(response, str) else response)
+        slot = request_id % RESPONSE_TABLE_SIZE
+        self._response_ids[slot] = request_id
+        self._responses[slot] = tagged
+        return tagged
+
+    def _fetch_response(self, payload):
+        '''
+        Returns the retained tagged response for the request ID of an
+        OP_FETCH payload, or 'NACK' if it is no longer available.
+        '''
+        if len(payload) != 2 or payload[1] == 0:
+            return 'ERR'
+        slot = payload[1] % RESPONSE_TABLE_SIZE
+        if self._response_ids[slot] != payload[1]:
+            return 'NACK'
+        return self._responses[slot]
+
+    def _dispatch_batch(self, payload):
+        '''
+        Dispatches each command of a batch payload, returning a binary
+        response of one status byte per command: [OP_BATCH][status]...
+        Nothing is applied if the batch is malformed.
+        '''
+        if len(payload) < 2:
+            raise ValueError('batch too short')
+        count = payload[1]
+        # validate the framing of every command before applying any
+        index = 2
+        for _ in range(count):
+            if index >= len(payload):
+                raise ValueError('batch truncated')
+            index += 1 + payload[index]
+        if index != len(payload):
+            raise ValueError('bad batch length (expected {}, got {})'.format(index, len(payload)))
+        statuses = bytearray(1 + count)
+        statuses[0] = OP_BATCH
+        index = 2
+        for i in range(count):
+            length = payload[index]
+            command = payload[index + 1:index + 1 + length]
+            index += 1 + length
+            try:
+                if len(command) > 0 and command[0] == OP_BATCH:
+                    raise ValueError('nested batch')
+                response = self.dispatch(command)
+                if response == 'NACK':
+                    statuses[1 + i] = STATUS_NACK
+                elif response == 'ERR':
+                    statuses[1 + i] = STATUS_ERR
+                else:
+                    statuses[1 + i] = STATUS_ACK
+            except Exception as e:
+                print("ERROR: {} raised processing batch command {}: {}".format(type(e), i, e))
+                statuses[1 + i] = STATUS_ERR
+        return statuses
+
+#EOF
@@ -1,47 +1,149 @@
 #!/micropython
 # -*- coding: utf-8 -*-
 #
-# Copyright 2020-2025 by Ichiro Furusato. All rights reserved. This file is part
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
 # of the Robot Operating System project, released under the MIT License. Please
 # see the LICENSE file included as part of this package.
 #
 # author:   Ichiro Furusato
 # created:  2025-11-16
-# modified: 2025-11-24
+# modified: 2026-10-16
 
 import sys
 import time
 from machine import I2CTarget, Pin
 
 try:
-    from upy.message_util import pack_message, unpack_message
+    from upy.message_util import pack_message, unpack_frame, CrcError
+    from upy.dispatcher import Dispatcher, RECEIVE_QUEUE_SIZE
+    from upy.opcodes import RESPONSE_PENDING, RESPONSE_READY
+    from upy.perf_stats import PerfStats
 except ImportError:
-    from message_util import pack_message, unpack_message
+    from message_util import pack_message, unpack_frame, CrcError
+    from dispatcher import Dispatcher, RECEIVE_QUEUE_SIZE
+    from opcodes import RESPONSE_PENDING, RESPONSE_READY
+    from perf_stats import PerfStats
 
-__I2C_ID      = 0
-__I2C_ADDRESS = 0x43
-__BUF_LEN     = 258
+try:
+    import micropython
+except ImportError: # CPython
+    micropython = None
+
+try:
+
+    @micropython.viper
+    def _copy_into(dest, offset:int, src, n:int):
+        '''
+        Copies n bytes from src into dest at offset, without allocating.
+        '''
+        d = ptr8(dest)
+        s = ptr8(src)
+        for i in range(n):
+            d[offset + i] = s[i]
+
+except (ImportError, AttributeError): # no viper emitter (e.g., CPython, or the simulator)
+
+    def _copy_into(dest, offset, src, n):
+        memoryview(dest)[offset:offset + n] = memoryview(src)[:n]
 
 class I2CSlave:
+    __I2C_ID      = 0
+    __I2C_SCL_PIN = 17
+    __I2C_SDA_PIN = 16
+    __I2C_ADDRESS = 0x43
+    __BUF_LEN     = 258
+    __RING_SIZE   = RECEIVE_QUEUE_SIZE + 1 # receive slots; one is kept free
+    __TX_CHUNK    = 32    # the size of a response chunk, as read by an SMBus block read
     '''
-    Constructs an I2C slave at the configured bus (0) and address (0x43).
+    Constructs an I2C slave on the configured bus (0) and address (0x43),
+    or as supplied. When several TinyFX boards share a bus, each must be
+    given its own address.
+
+    The response is preceded by a status byte. Upon receiving a message
+    this is set to RESPONSE_PENDING; once the message has been processed
+    and its response installed in full it is set to RESPONSE_READY, so
+    the master can poll for the response to its current request rather
+    than the previous one, and never reads a partly installed response.
+
+    Received messages are queued in a ring of fixed-size slots, filled by
+    the IRQ handler and drained by check_and_process(), so that a master
+    may send several messages back-to-back without waiting for each to be
+    processed. A message arriving while the ring is full is dropped and
+    counted; the ring's high-water mark is also recorded.
+
+    Processing is event-driven: the end of each write schedules processing
+    (via micropython.schedule) to run as soon as the IRQ returns, rather
+    than waiting for the main loop. The main loop may hold processing for
+    the duration of a frame update (see hold()), and its regular call to
+    check_and_process() also serves as a fallback.
+
+    A response of up to 255 bytes may be read by a master limited to
+    32 byte block reads: the register address written before each read
+    selects the 32 byte chunk of the response it returns, chunk 0 being
+    the start of the response (the default following each write).
+
+    The IRQ handler does not allocate. A write longer than a receive
+    slot is dropped and answered with 'ERR'. If heap_lock_test is True
+    the IRQ handler is run with the heap locked, counting any attempted
+    allocations, to verify this.
+
+    If perf_stats is True, performance counters are kept (see perf_stats.py)
+    and may be read and reset with the 'stats' and 'stats reset' commands.
+    When disabled, each measurement point costs a single test.
+
+    Args:
+        i2c_id:          the optional I2C bus ID (0)
+        i2c_address:     the optional I2C address (0x43)
+        scl_pin:         the optional SCL pin number (pin 17)
+        sda_pin:         the optional SDA pin number (pin 16)
+        heap_lock_test:  if True, run the IRQ handler with the heap locked
+        perf_stats:      if True, keep performance counters
     '''
-    def __init__(self):
+    def __init__(self, i2c_id=None, i2c_address=None, sda_pin=None, scl_pin=None, heap_lock_test=False, perf_stats=False):
+        # configuration
+        self._i2c_id      = i2c_id if i2c_id is not None else I2CSlave.__I2C_ID
+        self._sda_pin     = sda_pin if sda_pin else I2CSlave.__I2C_SDA_PIN
+        self._scl_pin     = scl_pin if scl_pin else I2CSlave.__I2C_SCL_PIN
+        self._i2c_address = i2c_address if i2c_address else I2CSlave.__I2C_ADDRESS
         self._i2c = None
         self._single_chunk = bytearray(32)
         self._tx_len = 0
         self._rx_len = 0
-        self._last_rx_len = 0
-        self._tx_buf = bytearray(__BUF_LEN)
-        self._rx_buf = bytearray(__BUF_LEN)
-        for i in range(__BUF_LEN):
-            self._rx_buf[i] = 0
+        self._rx_overflow = False
+        self._overflow_count = 0
+        self._heap_lock_test = heap_lock_test
+        self._alloc_error_count = 0
+        self._tx_buf = bytearray(I2CSlave.__BUF_LEN)
+        # preallocated views of the response from the start of each chunk, selected by register
+        self._tx_chunks = [memoryview(self._tx_buf)[i:] for i in range(0, I2CSlave.__BUF_LEN, I2CSlave.__TX_CHUNK)]
+        self._tx_view = self._tx_chunks[0]
+        # ring of receive slots: the IRQ fills the slot at head, the main loop drains from tail
+        self._slots = [bytearray(I2CSlave.__BUF_LEN) for _ in range(I2CSlave.__RING_SIZE)]
+        self._slot_lens = [0] * I2CSlave.__RING_SIZE
+        self._head = 0
+        self._tail = 0
+        self._ring_overflow_count = 0
+        self._high_water_mark = 0
+        # performance counters, with the time each slot was committed
+        self._perf = PerfStats() if perf_stats else None
+        self._slot_ticks = [0] * I2CSlave.__RING_SIZE
+        # event-driven processing
+        self._scheduled  = False
+        self._held       = False
+        self._processing = False
+        self._scheduled_process_ref = self._scheduled_process # avoids allocating a bound method in the IRQ
+        # prepacked common responses
+        self._packed_responses = {
+            'ACK':  pack_message('ACK'),
+            'NACK': pack_message('NACK'),
+            'ERR':  pack_message('ERR')
+        }
         init_msg = pack_message("ACK")
         self._tx_len = len(init_msg)
         for i in range(self._tx_len):
-            self._tx_buf[i] = init_msg[i]
-        self._new_cmd = False
-        self._callback = None
+            self._tx_buf[1 + i] = init_msg[i]
+        self._tx_buf[0] = RESPONSE_READY
+        self._dispatcher = Dispatcher()
 
     def enable(self):
         '''
@@ -50,91 +152,240 @@ class I2CSlave:
         triggers = (I2CTarget.IRQ_WRITE_REQ | I2CTarget.IRQ_END_WRITE |
                     I2CTarget.IRQ_READ_REQ | I2CTarget.IRQ_END_READ)
         # STM32: configure for your board; pins are pre-set for each bus
-#       self._i2c = I2CTarget(__I2C_ID, __I2C_ADDRESS)
+#       self._i2c = I2CTarget(self._i2c_id, self._i2c_address)
         # RP2040:
-        self._i2c = I2CTarget(__I2C_ID, __I2C_ADDRESS, scl=Pin(17), sda=Pin(16))
-        self._i2c.irq(self._irq_handler, trigger=triggers, hard=True)
-        print('I2C slave enabled at address {:#04x}'.format(__I2C_ADDRESS))
+        self._i2c = I2CTarget(self._i2c_id, self._i2c_address, scl=Pin(self._scl_pin), sda=Pin(self._sda_pin))
+        if self._heap_lock_test:
+            self._i2c.irq(self._heap_locked_irq_handler, trigger=triggers, hard=True)
+            print('I2C slave IRQ handler running with heap locked (test mode)')
+        else:
+            self._i2c.irq(self._irq_handler, trigger=triggers, hard=True)
+        print('I2C slave enabled on I2C{} at address {:#04x}'.format(self._i2c_id, self._i2c_address))
 
     def disable(self):
         if self._i2c:
             self._i2c.deinit()
             self._i2c = None
+        if self._heap_lock_test:
+            print('IRQ allocation errors: {}; overflows: {}; ring overflows: {}; high-water mark: {}'.format(
+                    self._alloc_error_count, self._overflow_count, self._ring_overflow_count, self._high_water_mark))
+
+    @property
+    def overflow_count(self):
+        '''
+        Returns the number of writes dropped for overflowing a receive slot.
+        '''
+        return self._overflow_count
+
+    @property
+    def ring_overflow_count(self):
+        '''
+        Returns the number of messages dropped because the ring was full.
+        '''
+        return self._ring_overflow_count
+
+    @property
+    def high_water_mark(self):
+        '''
+        Returns the greatest number of messages that have been queued at once.
+        '''
+        return self._high_water_mark
+
+    @property
+    def perf_stats(self):
+        '''
+        Returns the PerfStats, or None if not enabled.
+        '''
+        return self._perf
+
+    def stats(self, name=None):
+        '''
+        Returns the performance statistics as a string, or if a histogram
+        name is provided, that histogram's bucket counts. Returns None if
+        the statistics are not enabled or there is no such histogram.
+        '''
+        if self._perf is None:
+            return None
+        if name:
+            return self._perf.histogram(name)
+        return '{} overflows={} ring={} hwm={}'.format(self._perf.summary(),
+                self._overflow_count, self._ring_overflow_count, self._high_water_mark)
+
+    def reset_stats(self):
+        '''
+        Resets the performance statistics and the overflow counts.
+        '''
+        if self._perf:
+            self._perf.reset()
+        self._overflow_count = 0
+        self._ring_overflow_count = 0
+        self._high_water_mark = 0
+
+    @property
+    def alloc_error_count(self):
+        '''
+        Returns the number of allocations attempted by the IRQ handler while
+        running in heap lock test mode.
+        '''
+        return self._alloc_error_count
 
     def add_callback(self, callback):
         '''
         Registers a callback to process/unpack received commands.
         The callback accepts a single ASCII string and returns a string response.
         '''
-        self._callback = callback
+        self._dispatcher.add_callback(callback)
+
+    def add_binary_callback(self, callback):
+        '''
+        Registers a callback to process received binary (opcode) commands.
+        The callback accepts the payload bytes and returns a string response.
+        '''
+        self._dispatcher.add_binary_callback(callback)
+
+    def _heap_locked_irq_handler(self, i2c):
+        '''
+        Test mode IRQ handler: runs the IRQ handler with the heap locked,
+        so that any attempted allocation raises a MemoryError.
+        '''
+        micropython.heap_lock()
+        try:
+            self._irq_handler(i2c)
+        except MemoryError:
+            self._alloc_error_count += 1
+        finally:
+            micropython.heap_unlock()
 
     def _irq_handler(self, i2c):
         flags = i2c.irq().flags()
         if flags & I2CTarget.IRQ_WRITE_REQ:
             n = i2c.readinto(self._single_chunk)
-            if n and n > 0:
-                for i in range(n):
-                    self._rx_buf[self._rx_len] = self._single_chunk[i]
-                    self._rx_len += 1
+            if n:
+                if self._rx_len + n > I2CSlave.__BUF_LEN:
+                    self._rx_overflow = True # drop the remainder of this write
+                elif not self._rx_overflow:
+                    _copy_into(self._slots[self._head], self._rx_len, self._single_chunk, n)
+                    self._rx_len += n
         if flags & I2CTarget.IRQ_END_WRITE:
-            self._last_rx_len = self._rx_len
-            self._new_cmd = True
+            if not self._rx_overflow and self._rx_len < 3:
+                # too short to be a message: a lone register address selects the chunk of
+                # the response returned by the following read (e.g., a block read)
+                if self._rx_len == 1:
+                    chunk = self._slots[self._head][0]
+                    if chunk < len(self._tx_chunks):
+                        self._tx_view = self._tx_chunks[chunk]
+                self._rx_len = 0
+            else:
+                next_head = (self._head + 1) % I2CSlave.__RING_SIZE
+                if next_head == self._tail:
+                    # ring is full: drop the message
+                    self._ring_overflow_count += 1
+                else:
+                    if self._rx_overflow:
+                        # commit as empty, to be answered with an error
+                        self._overflow_count += 1
+                        self._slot_lens[self._head] = 0
+                    else:
+                        self._slot_lens[self._head] = self._rx_len
+                    if self._perf:
+                        self._slot_ticks[self._head] = time.ticks_us()
+                    self._head = next_head
+                    depth = (next_head - self._tail) % I2CSlave.__RING_SIZE
+                    if depth > self._high_water_mark:
+                        self._high_water_mark = depth
+                    # mark the response as pending until processed
+                    self._tx_buf[0] = RESPONSE_PENDING
+                    self._tx_view = self._tx_chunks[0]
+                    if micropython and not self._scheduled:
+                        try:
+                            micropython.schedule(self._scheduled_process_ref, 0)
+                            self._scheduled = True
+                        except RuntimeError: # schedule queue full: left to the main loop
+                            pass
+                self._rx_overflow = False
+                self._rx_len = 0
         if flags & I2CTarget.IRQ_READ_REQ:
-            i2c.write(self._tx_buf)
+            i2c.write(self._tx_view)
+
+    def hold(self, held):
+        '''
+        If held is True, scheduled processing is postponed, e.g., for the
+        duration of a frame update so that a batch of commands is never
+        applied part way through. Postponed messages are processed by the
+        next call to check_and_process().
+        '''
+        self._held = held
+
+    def _scheduled_process(self, arg):
+        self._scheduled = False
+        if not self._held:
+            self.check_and_process()
 
     def check_and_process(self):
-        WAIT = True # wait for the full message before unpacking
-        if self._new_cmd:
-            time.sleep_ms(5)  # Small delay to ensure IRQ completes
-            self._new_cmd = False
-            try:
-                if WAIT:
-                    raw = self._rx_buf[:self._last_rx_len]
-                    if len(raw) < 2:  # must have at least register + length
-                        return  # incomplete, wait
-                    msg_len = raw[1]
-                    expected_total = 1 + 1 + msg_len + 1  # reg + length + payload + crc
-                    if len(raw) < expected_total:
-                        return  # full message not yet in buffer
-                    rx_bytes = raw[1:1 + 1 + msg_len + 1]
-                else:
-                    raw = self._rx_buf[:self._last_rx_len]
-                    # skip the first byte (register address from I2C master)
-                    if raw and len(raw) > 1:
-                        msg_len = raw[1]  # Length of payload
-                        if msg_len > 0 and len(raw) >= msg_len + 3:
-                            rx_bytes = bytes(raw[1:msg_len + 3])
-                        else:
-                            rx_bytes = bytes(raw[1:])
-                    else:
-                        raise ValueError("message too short")
-                cmd = unpack_message(rx_bytes)
-                if self._callback:
-                    response = self._callback(cmd)
-                    if not response:
-                        response = "ACK"
-                else:
-                    response = "ACK"
+        '''
+        Processes all messages queued in the ring, oldest first. Must be
+        called regularly from the main loop.
+        '''
+        if self._processing or self._tail == self._head:
+            return
+        self._processing = True
+        try:
+            while self._tail != self._head:
+                slot = self._tail
+                if self._perf:
+                    self._perf.latency.record(time.ticks_diff(time.ticks_us(), self._slot_ticks[slot]))
+                self._process(self._slots[slot], self._slot_lens[slot])
+                self._tail = (slot + 1) % I2CSlave.__RING_SIZE
+                if self._tail == self._head:
+                    # the ring is drained: this is the response to the latest message
+                    self._tx_buf[0] = RESPONSE_READY
+                    if self._tail != self._head:
+                        # a message arrived as the status was set: its response is pending
+                        self._tx_buf[0] = RESPONSE_PENDING
+                        self._tx_view = self._tx_chunks[0]
+        finally:
+            self._processing = False
 
-            except Exception as e:
-                print("ERROR: {} raised during unpacking/processing: {}".format(type(e), e))
-                sys.print_exception(e)
-                response = "ERR"
-            # clear buffer state for next message
-            self._rx_len = 0
-            self._last_rx_len = 0
-            # clear the buffer contents
-            for i in range(__BUF_LEN):
-                self._rx_buf[i] = 0
+    def _process(self, buf, length):
+        '''
+        Unpacks and dispatches the message of the given length in buf,
+        installing the response in the transmit buffer. The status byte is
+        left to check_and_process(), which sets it ready only once no later
+        message is queued.
+        '''
+        try:
+            if length == 0:
+                raise ValueError("message overflowed receive buffer (dropped)")
+            # skip the first byte (register address from I2C master)
+            msg_len = buf[1]
+            expected_total = 1 + 1 + msg_len + 1  # reg + length + payload + crc
+            if length < expected_total:
+                raise ValueError("incomplete message (expected {}, got {})".format(expected_total, length))
+            # validated in place: the payload is a memoryview into the slot
+            payload = unpack_frame(buf, 1, msg_len + 2)
+            if self._perf:
+                start = time.ticks_us()
+                response = self._dispatcher.dispatch(payload)
+                self._perf.dispatch.record(time.ticks_diff(time.ticks_us(), start))
+            else:
+                response = self._dispatcher.dispatch(payload)
+
+        except Exception as e:
+            if self._perf and isinstance(e, CrcError):
+                self._perf.crc_failures += 1
+            print("ERROR: {} raised during unpacking/processing: {}".format(type(e), e))
+            sys.print_exception(e)
+            response = "ERR"
+        resp_bytes = self._packed_responses.get(response) if isinstance(response, str) else None
+        if resp_bytes is None:
             try:
-                resp_bytes = pack_message(str(response))
+                resp_bytes = pack_message(response)
             except Exception as e:
                 print("ERROR: {} raised during packing response: {}".format(type(e), e))
                 sys.print_exception(e)
-                resp_bytes = pack_message("ERR")
-            rlen = len(resp_bytes)
-            for i in range(rlen):
-                self._tx_buf[i] = resp_bytes[i]
-            self._tx_len = rlen
+                resp_bytes = self._packed_responses['ERR']
+        rlen = len(resp_bytes)
+        self._tx_buf[1:1 + rlen] = resp_bytes
+        self._tx_len = rlen
 
 #EOF
@@ -1,13 +1,13 @@
 #!/micropython
 # -*- coding: utf-8 -*-
 #
-# Copyright 2020-2025 by Ichiro Furusato. All rights reserved. This file is part
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
 # of the Robot Operating System project, released under the MIT License. Please
 # see the LICENSE file included as part of this package.
 #
 # author:   Ichiro Furusato
 # created:  2025-11-16
-# modified: 2025-12-04
+# modified: 2026-10-16
 #
 # ESP32-specific I2C slave implementation using memory buffer approach.
 
@@ -16,9 +16,17 @@ import time
 from machine import I2CTarget, Pin
 
 try:
-    from upy.message_util import pack_message, unpack_message
+    from upy.message_util import pack_message, unpack_frame
+    from upy.dispatcher import Dispatcher
+    from upy.opcodes import RESPONSE_PENDING, RESPONSE_READY
+    from upy.registers import (REG_STATUS, REG_FRAMES, REG_APPLIED, REG_REJECTED,
+            WRITABLE_COUNT, REGISTER_COUNT, STATUS_RUNNING, STATUS_ERROR, TRIGGER_MASK)
 except ImportError:
-    from message_util import pack_message, unpack_message
+    from message_util import pack_message, unpack_frame
+    from dispatcher import Dispatcher
+    from opcodes import RESPONSE_PENDING, RESPONSE_READY
+    from registers import (REG_STATUS, REG_FRAMES, REG_APPLIED, REG_REJECTED,
+            WRITABLE_COUNT, REGISTER_COUNT, STATUS_RUNNING, STATUS_ERROR, TRIGGER_MASK)
 
 
 class I2CSlave:
@@ -36,17 +44,32 @@ class I2CSlave:
     
     Memory layout:
     - Address 0x00: RX buffer (master writes commands here)
-    - Address 0x80: TX buffer (master reads responses from here)
+    - Address 0x80: TX buffer (master reads responses from here), a status
+      byte (RESPONSE_PENDING or RESPONSE_READY) followed by the response
+
+    Only the ranges in use are copied: the extent of the RX buffer written
+    by the master is tracked, so that only it is snapshotted and cleared,
+    and a response is installed with a single slice assignment, after
+    which only the status byte and response are reloaded into the target.
+
+    If registers is True the slave instead exposes the register map defined
+    in registers.py, as the I2CTarget's memory: the master writes the state
+    registers directly (e.g., writeto_mem(addr, REG_CH1, b'\xcc')) and
+    reads the telemetry registers, with no command strings, framing or
+    response. Once per frame check_and_process() passes the registers
+    changed since the previous frame to the register callback; writes to
+    the read-only registers are reverted and counted.
 
     Args:
         i2c_id:       the optional I2C bus ID (0)
         i2c_address:  the optional I2C address (0x42)
         scl_pin:      the optional SCL pin number (pin 2)
         sda_pin:      the optional SDA pin number (pin 3)
+        registers:    if True, use the register-mapped mode
     '''
-    def __init__(self, i2c_id=None, i2c_address=None, sda_pin=None, scl_pin=None):
+    def __init__(self, i2c_id=None, i2c_address=None, sda_pin=None, scl_pin=None, registers=False):
         # configuration
-        self._i2c_id      = I2CSlave.__I2C_ID
+        self._i2c_id      = i2c_id if i2c_id is not None else I2CSlave.__I2C_ID
         self._sda_pin     = sda_pin if sda_pin else I2CSlave.__I2C_SDA_PIN
         self._scl_pin     = scl_pin if scl_pin else I2CSlave.__I2C_SCL_PIN
         self._i2c_address = i2c_address if i2c_address else I2CSlave.__I2C_ADDRESS
@@ -55,19 +78,42 @@ class I2CSlave:
         self._memory      = bytearray(I2CSlave.__BUF_LEN * 2)  # Double size: RX + TX regions
         self._rx_start    = 0
         self._tx_start    = I2CSlave.__BUF_LEN
+        # views of the RX and TX regions, so that only the ranges touched are copied
+        self._rx_view     = memoryview(self._memory)[self._rx_start:self._rx_start + I2CSlave.__BUF_LEN]
+        self._tx_view     = memoryview(self._memory)[self._tx_start:]
+        self._zeros       = memoryview(bytearray(I2CSlave.__BUF_LEN))
+        self._rx_len      = 0 # the length of the master's last write
+        self._rx_dirty    = 0 # the extent of the RX region written since it was last cleared
         # initialize TX buffer with ACK message
         init_msg = pack_message("ACK")
-        for i, b in enumerate(init_msg):
-            self._memory[self._tx_start + i] = b
         self._tx_len      = len(init_msg)
-        self._callback    = None
+        self._tx_view[1:1 + self._tx_len] = init_msg
+        self._memory[self._tx_start] = RESPONSE_READY
+        self._tx_push     = self._tx_view[:1 + self._tx_len] # the status byte and current response
+        self._dispatcher  = Dispatcher()
         self._last_rx_snapshot = bytearray(I2CSlave.__BUF_LEN)
         self._process_next = False
+        self._held = False
+        # register-mapped mode: the register map, and its state as last applied
+        self._registers = bytearray(REGISTER_COUNT) if registers else None
+        self._applied   = bytearray(REGISTER_COUNT) if registers else None
+        self._register_callback = None
+        self._registers_written = False
+        self._frame_count   = 0
+        self._applied_count = 0
 
     def enable(self):
         '''
         Enables the I2C slave as a memory device.
         '''
+        if self._registers is not None:
+            self._i2c = I2CTarget(self._i2c_id, self._i2c_address, mem=self._registers,
+                    scl=Pin(self._scl_pin), sda=Pin(self._sda_pin))
+            self._i2c.irq(self._register_irq_handler, trigger=I2CTarget.IRQ_END_WRITE, hard=True)
+            self._set_register(REG_STATUS, STATUS_RUNNING)
+            print('I2C register slave enabled on I2C{} at address {:#04x} (SCL={}, SDA={}); {} registers'.format(
+                    self._i2c_id, self._i2c_address, self._scl_pin, self._sda_pin, REGISTER_COUNT))
+            return
         self._i2c = I2CTarget(self._i2c_id, self._i2c_address, scl=Pin(self._scl_pin), sda=Pin(self._sda_pin))
         # set up memory buffer that master can access
         # the I2CTarget will automatically handle memory reads/writes
@@ -89,7 +135,100 @@ class I2CSlave:
         Registers a callback to process/unpack received commands. 
         The callback accepts a single ASCII string and returns a string response.
         '''
-        self._callback = callback
+        self._dispatcher.add_callback(callback)
+
+    def add_binary_callback(self, callback):
+        '''
+        Registers a callback to process received binary (opcode) commands.
+        The callback accepts the payload bytes and returns a string response.
+        '''
+        self._dispatcher.add_binary_callback(callback)
+
+    def add_register_callback(self, callback):
+        '''
+        Registers a callback to apply changes in the register-mapped mode.
+        The callback accepts the register map (a bytearray) and a bit mask
+        of the state registers changed, bit n being register n.
+        '''
+        self._register_callback = callback
+
+    @property
+    def perf_stats(self):
+        '''
+        Performance counters are not kept by this slave (see i2c_slave.py).
+        '''
+        return None
+
+    def hold(self, held):
+        '''
+        If held is True, changes to the registers are not applied until
+        the next call to check_and_process() following hold(False).
+        '''
+        self._held = held
+
+    def _register_irq_handler(self, i2c):
+        '''
+        IRQ handler for the register-mapped mode: the I2CTarget has already
+        written the master's data into the register map, so this need only
+        note that it has changed.
+        '''
+        self._registers_written = True
+
+    def _set_register(self, register, value):
+        self._registers[register] = value
+        self._applied[register]   = value
+
+    def _process_registers(self):
+        '''
+        Applies the state registers changed since the previous frame, and
+        updates the frame count.
+        '''
+        if self._registers_written and not self._held:
+            self._registers_written = False
+            self._apply_registers()
+        self._frame_count = (self._frame_count + 1) & 0xFFFF
+        self._set_register(REG_FRAMES, self._frame_count & 0xFF)
+        self._set_register(REG_FRAMES + 1, self._frame_count >> 8)
+
+    def _apply_registers(self):
+        '''
+        Passes the changed state registers to the register callback, and
+        reverts and counts any writes to the read-only registers.
+        '''
+        registers = self._registers
+        applied   = self._applied
+        changed = 0
+        count   = 0
+        for i in range(WRITABLE_COUNT):
+            if registers[i] != applied[i]:
+                applied[i] = registers[i]
+                changed |= 1 << i
+                count += 1
+        rejected = 0
+        for i in range(WRITABLE_COUNT, REGISTER_COUNT):
+            if registers[i] != applied[i]:
+                registers[i] = applied[i]
+                rejected += 1
+        if rejected:
+            self._set_register(REG_REJECTED, min(255, applied[REG_REJECTED] + rejected))
+        if not changed:
+            return
+        self._applied_count = (self._applied_count + count) & 0xFFFF
+        self._set_register(REG_APPLIED, self._applied_count & 0xFF)
+        self._set_register(REG_APPLIED + 1, self._applied_count >> 8)
+        status = STATUS_RUNNING
+        if self._register_callback:
+            try:
+                self._register_callback(registers, changed)
+            except Exception as e:
+                print("ERROR: {} raised applying registers: {}".format(type(e), e))
+                sys.print_exception(e)
+                status |= STATUS_ERROR
+        self._set_register(REG_STATUS, status)
+        # clear any trigger registers that were applied, so they may be triggered again
+        for i in range(WRITABLE_COUNT):
+            if changed & TRIGGER_MASK & (1 << i):
+                self._set_register(i, 0)
 
     def _irq_handler(self, i2c):
         '''
@@ -99,8 +238,13 @@ class I2CSlave:
         if flags & I2CTarget.IRQ_END_WRITE:
             # master wrote to our memory - copy current state for processing
             try:
-                # read back the memory to get what master wrote
-                i2c.readinto(self._memory)
+                # read back what the master wrote, noting the range touched
+                n = i2c.readinto(self._rx_view)
+                self._rx_len = n
+                if n > self._rx_dirty:
+                    self._rx_dirty = n
+                # mark the response as pending until processed
+                self._memory[self._tx_start] = RESPONSE_PENDING
                 # flag that we should process the RX buffer
                 self._process_next = True
             except:
@@ -108,8 +252,8 @@ class I2CSlave:
         if flags & I2CTarget.IRQ_END_READ:
             # master read from our memory - update TX buffer if needed
             try:
-                # reload memory with current TX data
-                i2c.write(self._memory)
+                # reload the status byte and current response (not the entire memory)
+                i2c.write(self._tx_push)
             except:
                 pass
 
@@ -118,49 +262,49 @@ class I2CSlave:
         Process received commands and prepare responses.
         Must be called regularly from main loop. 
         '''
+        if self._registers is not None:
+            self._process_registers()
+            return
         if not self._process_next:
             return
         
         self._process_next = False
         
         try:
-            # take snapshot of RX buffer
-            for i in range(I2CSlave.__BUF_LEN):
-                self._last_rx_snapshot[i] = self._memory[self._rx_start + i]
+            # take snapshot of the range of the RX buffer written
+            n = self._rx_len
+            self._last_rx_snapshot[:n] = self._rx_view[:n]
             raw = self._last_rx_snapshot
             # parse the message (same format as before)
-            if len(raw) < 2:
-                return  # Incomplete
+            # a short or incomplete message is answered with 'ERR', as the status is already pending
+            if n < 2:
+                raise ValueError("incomplete message (got {} bytes)".format(n))
             msg_len = raw[1]
             expected_total = 1 + 1 + msg_len + 1  # reg + length + payload + crc
-            if len(raw) < expected_total:
-                return  # full message not yet received
-            rx_bytes = raw[1:1 + 1 + msg_len + 1]
-            cmd = unpack_message(rx_bytes)
-            # process command
-            if self._callback:
-                response = self._callback(cmd)
-                if not response:
-                    response = "ACK"
-            else:
-                response = "ACK"
+            if n < expected_total:
+                raise ValueError("incomplete message (expected {}, got {})".format(expected_total, n))
+            # process command, validated in place within the snapshot
+            response = self._dispatcher.dispatch(unpack_frame(raw, 1, msg_len + 2))
 
         except Exception as e:
             print("ERROR: {} raised during unpacking/processing: {}".format(type(e), e))
             sys.print_exception(e)
             response = "ERR"
-        # clear RX buffer
-        for i in range(I2CSlave.__BUF_LEN):
-            self._memory[self._rx_start + i] = 0
-        # prepare response in TX buffer
+        # clear the range of the RX buffer written
+        dirty = self._rx_dirty
+        self._rx_view[:dirty] = self._zeros[:dirty]
+        self._rx_dirty = 0
+        self._rx_len   = 0
+        # prepare response in TX buffer: only the bytes of the response are copied
         try:
-            resp_bytes = pack_message(str(response))
-            for i, b in enumerate(resp_bytes):
-                self._memory[self._tx_start + i] = b
+            resp_bytes = pack_message(response)
             self._tx_len = len(resp_bytes)
-            # update the I2C memory
+            self._tx_view[1:1 + self._tx_len] = resp_bytes
+            self._memory[self._tx_start] = RESPONSE_READY
+            self._tx_push = self._tx_view[:1 + self._tx_len]
+            # update the I2C target with the status byte and response
             if self._i2c:
-                self._i2c. write(self._memory)
+                self._i2c.write(self._tx_push)
         except Exception as e:
             print("ERROR: {} raised during packing response: {}".format(type(e), e))
             sys.print_exception(e)
@@ -2,6 +2,7 @@
 #
 # SPDX-License-Identifier: MIT
 
+from array import array
 from machine import Pin, PWM, Timer
 
 
@@ -28,16 +29,106 @@ def rgb_from_hsv(h, s, v):
             return v, p, q
 
 
+FINE_STEPS = 1024  # the intervals of a fine table, interpolated between for float brightnesses
+
+_gamma_tables = {}  # gamma -> (byte table, fine table), shared by all LEDs of that gamma
+
+
+def _resample(lut, steps):
+    # Linearly interpolate a table of duty values, evenly spaced from brightness 0.0
+    # to 1.0, as a table of steps + 1 entries
+    last = len(lut) - 1
+
+    def sample(i):
+        x = i * last / steps
+        j = min(int(x), last - 1)
+        return min(65535, max(0, int(lut[j] + (lut[j + 1] - lut[j]) * (x - j) + 0.5)))
+
+    return array("H", [sample(i) for i in range(steps + 1)])
+
+
+def gamma_tables(gamma):
+    # Return the byte table (256 entries, for brightnesses 0-255) and the fine table
+    # (FINE_STEPS + 1 entries, for float brightnesses) of duty values for a gamma,
+    # built upon first use
+    tables = _gamma_tables.get(gamma)
+    if tables is None:
+        byte_table = array("H", [int(pow(i / 255, gamma) * 65535 + 0.5) for i in range(256)])
+        fine_table = array("H", [int(pow(i / FINE_STEPS, gamma) * 65535 + 0.5) for i in range(FINE_STEPS + 1)])
+        tables = _gamma_tables[gamma] = (byte_table, fine_table)
+    return tables
+
+
 # A basic wrapper for PWM with regular on/off and toggle functions from Pin
 # Intended to be used for driving LEDs with brightness control & compatibility with Pin
+#
+# The gamma correction is looked up in tables built once per gamma: a byte table for
+# brightness_u8() and a fine table, interpolated in integer arithmetic, for brightness().
+# A calibration table (e.g., measured for a particular LED) may replace these per LED.
+#
+# The brightness and duty last written are shadowed, so that the hardware is only
+# written upon a change. The number of writes issued and suppressed are counted.
 class PWMLED:
     def __init__(self, pin, invert=False, gamma=1):
         self.__gamma = gamma
         self.__led = PWM(Pin(pin), freq=1000, duty_u16=0, invert=invert)
+        self.__byte_table, self.__fine_table = gamma_tables(gamma)
+        self.__brightness = 0.0
+        self.__level = 0
+        self.__duty = 0
+        self.writes = 0
+        self.suppressed = 0
 
     def brightness(self, brightness):
-        self.__brightness = min(1.0, max(0.0, brightness))
-        self.__led.duty_u16(int(pow(self.__brightness, self.__gamma) * 65535 + 0.5))
+        if brightness == self.__brightness:
+            self.suppressed += 1
+            return
+        self.__brightness = brightness
+        x = int(brightness * (FINE_STEPS * 256))
+        if x <= 0:
+            duty = self.__fine_table[0]
+        elif x >= FINE_STEPS * 256:
+            duty = self.__fine_table[FINE_STEPS]
+        else:
+            i = x >> 8
+            low = self.__fine_table[i]
+            duty = low + (((self.__fine_table[i + 1] - low) * (x & 0xFF) + 0x80) >> 8)
+        self.__write(duty)
+
+    def brightness_u8(self, level):
+        # Set the brightness as an integer from 0 to 255, without any float arithmetic
+        if level < 0:
+            level = 0
+        elif level > 255:
+            level = 255
+        else:
+            level = int(level)
+        self.__brightness = None
+        self.__level = level
+        self.__write(self.__byte_table[level])
+
+    def __write(self, duty):
+        if duty == self.__duty:
+            self.suppressed += 1
+            return
+        self.__duty = duty
+        self.__led.duty_u16(duty)
+        self.writes += 1
+
+    def set_calibration(self, lut=None):
+        # Replace the gamma correction of this LED with a calibration table of duty
+        # values (0-65535) for evenly spaced brightnesses from 0.0 to 1.0, of at least
+        # two entries, e.g., 256 entries for brightnesses 0-255. If lut is None the
+        # gamma tables are restored. Applies from the next change of brightness.
+        if lut is None:
+            self.__byte_table, self.__fine_table = gamma_tables(self.__gamma)
+        else:
+            if len(lut) < 2:
+                raise ValueError("a calibration table requires at least two entries")
+            self.__byte_table = _resample(lut, 255)
+            self.__fine_table = _resample(lut, FINE_STEPS)
+        self.__brightness = None
+        self.__duty = -1
 
     def on(self):
         self.brightness(1)
@@ -46,7 +137,12 @@ class PWMLED:
         self.brightness(0)
 
     def toggle(self):
-        self.brightness(1 - self.__brightness)
+        brightness = self.__brightness if self.__brightness is not None else self.__level / 255
+        self.brightness(1 - min(1.0, max(0.0, brightness)))
+
+    def reset_counts(self):
+        self.writes = 0
+        self.suppressed = 0
 
 
 class RGBLED:
@@ -61,11 +157,212 @@ class RGBLED:
         self.led_b.brightness(b)
 
     def set_rgb(self, r, g, b):
-        self.__rgb(r / 255, g / 255, b / 255)
+        self.led_r.brightness_u8(r)
+        self.led_g.brightness_u8(g)
+        self.led_b.brightness_u8(b)
 
     def set_hsv(self, h, s, v):
         self.__rgb(*rgb_from_hsv(h, s, v))
 
+    def set_calibration(self, r_lut=None, g_lut=None, b_lut=None):
+        # Load a calibration table per channel (see PWMLED.set_calibration)
+        self.led_r.set_calibration(r_lut)
+        self.led_g.set_calibration(g_lut)
+        self.led_b.set_calibration(b_lut)
+
+    @property
+    def writes(self):
+        return self.led_r.writes + self.led_g.writes + self.led_b.writes
+
+    @property
+    def suppressed(self):
+        return self.led_r.suppressed + self.led_g.suppressed + self.led_b.suppressed
+
+    def reset_counts(self):
+        self.led_r.reset_counts()
+        self.led_g.reset_counts()
+        self.led_b.reset_counts()
+
+
+PHASE_ONE = 1 << 16  # a full cycle, as a 16-bit phase
+
+_levels = None  # brightness levels 0/255 to 255/255, built upon first use
+
+
+def phase_u16(fraction):
+    # Convert a fraction of a cycle (e.g., a phase) to a 16-bit phase, wrapping
+    return int(fraction * PHASE_ONE) & 0xFFFF
+
+
+def fraction_u16(fraction):
+    # Convert a fraction from 0.0 to 1.0 (e.g., a duty) to an integer from 0 to PHASE_ONE
+    return min(PHASE_ONE, max(0, int(fraction * PHASE_ONE)))
+
+
+def brightness_levels():
+    # Return a list of the 256 brightness levels, i/255, so that an effect may return
+    # a brightness calculated in integer arithmetic without allocating a float
+    global _levels
+    if _levels is None:
+        _levels = [i / 255 for i in range(256)]
+    return _levels
+
+
+# A periodic effect may be "baked": one cycle sampled into a table when constructed,
+# then looked up by phase. Tables are shared by effects of the same key, counted
+# against a memory budget, and freed when no longer used by any effect
+LUT_SIZE = 256  # the default number of samples of a baked cycle
+
+_luts = {}  # key -> [table, number of effects using it]
+_lut_budget = 8192  # bytes available to the tables of baked effects
+_lut_bytes = 0
+
+
+def set_lut_budget(nbytes):
+    # Set the memory, in bytes, available to the tables of baked effects
+    global _lut_budget
+    _lut_budget = nbytes
+
+
+def lut_usage():
+    # Return the bytes used by the tables of baked effects, and the budget
+    return _lut_bytes, _lut_budget
+
+
+def lut_size(baked):
+    # Return the number of samples (True for LUT_SIZE, or a power of two from 2 to 65536)
+    # of a baked cycle, and the shift from a 16-bit phase to an index of its table
+    size = LUT_SIZE if baked is True else baked
+    if not isinstance(size, int) or size < 2 or size > PHASE_ONE or size & (size - 1):
+        raise ValueError("baked table size must be a power of two from 2 to 65536")
+    shift = 16
+    while (1 << (16 - shift)) < size:
+        shift -= 1
+    return size, shift
+
+
+def acquire_lut(key, nbytes, fill):
+    # Return the table of a key, creating a bytearray of nbytes and passing it to fill()
+    # if no other effect uses it. Raises MemoryError if the budget would be exceeded
+    global _lut_bytes
+    entry = _luts.get(key)
+    if entry is None:
+        if _lut_bytes + nbytes > _lut_budget:
+            raise MemoryError("baking needs {} bytes, {} of {} available".format(
+                nbytes, _lut_budget - _lut_bytes, _lut_budget))
+        table = bytearray(nbytes)
+        fill(table)
+        entry = _luts[key] = [table, 0]
+        _lut_bytes += nbytes
+    entry[1] += 1
+    return entry[0]
+
+
+def release_lut(key):
+    # Release an effect's use of the table of a key, freeing it if no longer used
+    global _lut_bytes
+    entry = _luts.get(key)
+    if entry is not None:
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del _luts[key]
+            _lut_bytes -= len(entry[0])
+
+
+# The base of the effects that may be baked, given after Cycling or Updateable. Setting
+# baked releases the table in use before acquiring another, so that baking again needs
+# no more of the budget, and close() releases it. A subclass supplies only _bake(baked),
+# returning the key, number of bytes and fill function of its table (see acquire_lut()),
+# its number of entries, and the shift from a 16-bit phase to an index of it (see
+# lut_size()). The table is held in the _lut attribute while baked is not 0
+class Bakeable:
+    _baked = 0
+    _lut = None
+    _lut_key = None
+    _lut_shift = 0
+
+    @property
+    def baked(self):
+        # the number of entries of the baked table, or 0 if not baked
+        return self._baked
+
+    @baked.setter
+    def baked(self, baked):
+        self.close()
+        if baked:
+            key, nbytes, fill, self._baked, self._lut_shift = self._bake(baked)
+            try:
+                self._lut = acquire_lut(key, nbytes, fill)
+            except MemoryError:
+                self._baked = 0
+                raise
+            self._lut_key = key
+
+    def rebake(self):
+        # Bake again, if baked, once the settings from which the table is filled change
+        if self._baked:
+            self.baked = self._baked
+
+    def close(self):
+        # Release the baked table, if any, so that its memory may be freed
+        if self._lut_key is not None:
+            release_lut(self._lut_key)
+        self._baked, self._lut, self._lut_key = 0, None, None
+
+
+def hsv_u16_into(buf, j, h, s, v):
+    # As rgb_from_hsv_u16(), writing r, g and b into buf from index j rather than
+    # returning a tuple
+    if s == 0:
+        buf[j] = buf[j + 1] = buf[j + 2] = v
+        return
+    h6 = (h & 0xFFFF) * 6
+    i = h6 >> 16
+    f = ((h6 & 0xFFFF) * 255 + 0x8000) >> 16
+    p = (v * (255 - s)) // 255
+    if i & 1:
+        q = (v * (65025 - s * f)) // 65025
+        if i == 1:
+            buf[j], buf[j + 1], buf[j + 2] = q, v, p
+        elif i == 3:
+            buf[j], buf[j + 1], buf[j + 2] = p, q, v
+        else:
+            buf[j], buf[j + 1], buf[j + 2] = v, p, q
+    else:
+        t = (v * (65025 - s * (255 - f))) // 65025
+        if i == 0:
+            buf[j], buf[j + 1], buf[j + 2] = v, t, p
+        elif i == 2:
+            buf[j], buf[j + 1], buf[j + 2] = p, v, t
+        else:
+            buf[j], buf[j + 1], buf[j + 2] = t, p, v
+
+
+def rgb_from_hsv_u16(h, s, v):
+    # An integer equivalent of rgb_from_hsv(): h is a 16-bit phase, s and v are 0-255,
+    # returning r, g and b as 0-255 (truncated, as by RainbowFX). Intermediate values
+    # remain small ints
+    if s == 0:
+        return v, v, v
+    h6 = (h & 0xFFFF) * 6
+    i = h6 >> 16
+    f = ((h6 & 0xFFFF) * 255 + 0x8000) >> 16
+    p = (v * (255 - s)) // 255
+    q = (v * (65025 - s * f)) // 65025
+    t = (v * (65025 - s * (255 - f))) // 65025
+    if i == 0:
+        return v, t, p
+    elif i == 1:
+        return q, v, p
+    elif i == 2:
+        return p, v, t
+    elif i == 3:
+        return p, q, v
+    elif i == 4:
+        return t, p, v
+    else:
+        return v, p, q
+
 
 class Updateable:
     def __init__(self):
@@ -78,92 +375,188 @@ class Updateable:
         pass
 
 
+# The position within the cycle is an integer phase accumulator: 24 bits per cycle,
+# advanced by a per-millisecond step derived from the speed (in cycles per second),
+# so that ticking involves no float arithmetic. Its upper 16 bits are kept in the
+# offset_u16 attribute, read by effects as a plain attribute rather than a property
 class Cycling(Updateable):
     def __init__(self, speed):
         self.speed = speed
-        self.__offset_ms = 0
-        self.__offset = 0
+        self.__phase = 0
+        self.offset_u16 = 0
+
+    @property
+    def speed(self):
+        return self.__speed
+
+    @speed.setter
+    def speed(self, speed):
+        self.__speed = speed
+        self.__step = int(speed * (1 << 24) / 1000 + 0.5)
 
     def tick(self, delta_ms):
-        self.__offset_ms = (self.__offset_ms + int(delta_ms * self.speed)) % 1000
-        self.__offset = self.__offset_ms / 1000
+        # delta_ms is an integer, as from ticks_diff()
+        self.__phase = phase = (self.__phase + delta_ms * self.__step) & 0xFFFFFF
+        self.offset_u16 = phase >> 8
 
     def reset(self):
-        self.__offset_ms = 0
-        self.__offset = 0
+        self.__phase = 0
+        self.offset_u16 = 0
+
+    @property
+    def offset(self):
+        # the position within the current cycle, from 0.0 to 1.0, for use by
+        # subclasses (a private name would be mangled per class on CPython)
+        return self.offset_u16 / PHASE_ONE
+
+
+# The base class of the wave effects, whose output varies along a strip with the
+# position of each LED. A subclass supplies _at_phase(phase), its output at a 16-bit
+# phase, to which __call__(pos) gives the per-LED effect of each position, adding the
+# offset, the phase (held in the phase_u16 attribute, as offset_u16 is) and that of
+# the position, converted again only if the length changes. A wave renders the entire
+# strip into a frame buffer with render(). By default this calls the effect of each
+# position in turn; a subclass may override it to render faster, using a table of the
+# phase of each position, calculated again only if the number of LEDs or the length
+# changes
+class Wave(Cycling):
+    def __init__(self, speed, length, phase=0.0):
+        super().__init__(speed)
+        self.length = length
+        self.phase = phase
+        self.__phases = None
+        self.__length = None
+        self.__effects = None
+
+    @property
+    def phase(self):
+        return self.__phase
+
+    @phase.setter
+    def phase(self, phase):
+        self.__phase = phase
+        self.phase_u16 = phase_u16(phase)
+
+    def __call__(self, pos):
+        length = None
+        pos_u16 = 0
+
+        def fx():
+            nonlocal length, pos_u16
+            if length != self.length:
+                length = self.length
+                pos_u16 = phase_u16(pos / length)
+            return self._at_phase((self.offset_u16 + self.phase_u16 + pos_u16) & 0xFFFF)
+        return self, fx
+
+    def phases(self, count):
+        # Return the 16-bit phase of positions 0 to count - 1 along the wave
+        phases = self.__phases
+        if phases is None or len(phases) != count or self.__length != self.length:
+            length = self.__length = self.length
+            phases = self.__phases = array("H", [phase_u16(pos / length) for pos in range(count)])
+        return phases
+
+    def render(self, frame, count):
+        # Render the first count LEDs into frame, a bytearray of r, g and b per LED
+        effects = self.__effects
+        if effects is None or len(effects) != count:
+            effects = self.__effects = [_effect_of(self(pos)) for pos in range(count)]
+        j = 0
+        for fx, data in effects:
+            colours = fx(*data)
+            if isinstance(colours, tuple):
+                frame[j], frame[j + 1], frame[j + 2] = colours
+            else:
+                frame[j] = frame[j + 1] = frame[j + 2] = int(colours * 255)
+            j += 3
+
+
+def _effect_of(item):
+    # Return the effect function and data of an item of an effect list, as accepted
+    # by EffectPlayer.effects, e.g., the (updateable, fx) of a wave's __call__(pos)
+    if isinstance(item, tuple):
+        first, *rest = item
+        if isinstance(first, Updateable) and rest and callable(rest[0]):
+            return rest[0], tuple(rest[1:])
+        return first, tuple(rest)
+    return item, ()
 
 
 class EffectPlayer:
     DEFAULT_FPS = 100
 
     def __init__(self, leds, num_leds=None):
-        self.__leds = leds if isinstance(leds, (tuple, list)) else [leds]
-        self.__num_leds = len(self.__leds) if num_leds is None else num_leds
+        self._leds = leds if isinstance(leds, (tuple, list)) else [leds]
+        self._num_leds = len(self._leds) if num_leds is None else num_leds
 
-        self.__effects = [None] * self.__num_leds
-        self.__data = [()] * self.__num_leds
-        self.__updateables = set()
+        self._effects = [None] * self._num_leds
+        self._data = [()] * self._num_leds
+        self._updateables = set()
 
-        self.__period = 1000
+        self._period = 1000
         self.__timer = Timer()
-        self.__paired = None
+        self._paired = None
         self.__running = False
 
     def start(self, fps=DEFAULT_FPS, force=False):
         if not self.is_running() or force:
             self.stop()
 
-            self.__period = int(1000 / fps)
-            if self.__paired is not None:
-                self.__paired.__period = self.__period
+            self._period = int(1000 / fps)
+            if self._paired is not None:
+                self._paired._period = self._period
 
-            self.__timer.init(mode=Timer.PERIODIC, period=self.__period, callback=self.__update)
+            self.__timer.init(mode=Timer.PERIODIC, period=self._period, callback=self._update)
             self.__running = True
 
     def stop(self, reset_fx=False):
         self.__timer.deinit()
         self.__running = False
         if reset_fx:
-            for ufx in self.__updateables:
+            for ufx in self._updateables:
                 ufx.reset()
 
     def is_running(self):
         return self.__running
 
-    def __show(self):
+    def _show(self):
         pass
 
     def pair(self, player):
-        self.__paired = player
+        self._paired = player
 
-    def __update(self, timer):
+    def _update(self, timer):
         try:
-            for ufx in self.__updateables:
-                ufx.tick(self.__period)
+            for ufx in self._updateables:
+                ufx.tick(self._period)
 
-            self.__show()
+            self._show()
 
-            if self.__paired is not None:
-                self.__paired.__update(timer)
+            if self._paired is not None:
+                self._paired._update(timer)
         except Exception as e:
             self.stop()
             raise e
 
     @property
     def effects(self):
-        return tuple(self.__effects)
+        return tuple(self._effects)
 
     @effects.setter
     def effects(self, effect_list):
-        effect_list = effect_list if isinstance(effect_list, list) else [effect_list] * self.__num_leds
+        self._set_effects(effect_list)
 
-        if len(effect_list) > self.__num_leds:
-            raise ValueError(f"`effect_list` must have a length less or equal to {self.__num_leds}")
+    def _set_effects(self, effect_list):
+        effect_list = effect_list if isinstance(effect_list, list) else [effect_list] * self._num_leds
 
-        self.__updateables = set()
+        if len(effect_list) > self._num_leds:
+            raise ValueError(f"`effect_list` must have a length less or equal to {self._num_leds}")
+
+        self._updateables = set()
         for i, item in enumerate(effect_list):
-            self.__effects[i] = None
-            self.__data[i] = ()
+            self._effects[i] = None
+            self._data[i] = ()
 
             # Skip the item if it is none
             if item is None:
@@ -172,11 +565,11 @@ class EffectPlayer:
             # Is the item on its own and callable?
             if callable(item):
                 # It must therefore be an effect function
-                self.__effects[i] = item
+                self._effects[i] = item
 
                 # Is the effect an Updateable class too?
                 if isinstance(item, Updateable):
-                    self.__updateables.add(item)    # Add it to the updateables set
+                    self._updateables.add(item)    # Add it to the updateables set
 
             # Is the item a tuple?
             elif isinstance(item, tuple):
@@ -184,64 +577,110 @@ class EffectPlayer:
 
                 # Is the first element an Updateable class?
                 if isinstance(first, Updateable):
-                    self.__updateables.add(first)   # Add it to the updateables set
+                    self._updateables.add(first)   # Add it to the updateables set
 
                     # Are there are other elements, and is the second element callable?
                     if rest and callable(rest[0]):
                         # Assume the effect function is the second element, and the first is its parent class. All elements that follow are data
-                        self.__effects[i] = rest[0]
-                        self.__data[i] = tuple(rest[1:])
+                        self._effects[i] = rest[0]
+                        self._data[i] = tuple(rest[1:])
                     else:
                         # The first element is both the effect function and Updateable class. All elements that follow are data
-                        self.__effects[i] = first
-                        self.__data[i] = tuple(rest)
+                        self._effects[i] = first
+                        self._data[i] = tuple(rest)
 
                 # Is the first element only callable?
                 elif callable(first):
                     # It must therefore be an effect function. All elements that follow are data
-                    self.__effects[i] = first
-                    self.__data[i] = tuple(rest)
+                    self._effects[i] = first
+                    self._data[i] = tuple(rest)
 
         # Clear out excess effects
-        if len(effect_list) < self.__num_leds:
-            for i in range(len(effect_list), self.__num_leds):
-                self.__effects[i] = None
-                self.__data[i] = ()
+        if len(effect_list) < self._num_leds:
+            for i in range(len(effect_list), self._num_leds):
+                self._effects[i] = None
+                self._data[i] = ()
 
 
 class MonoPlayer(EffectPlayer):
     def __init__(self, mono_leds):
         super().__init__(mono_leds)
 
-    def __show(self):
-        for i in range(self.__num_leds):
-            if self.__effects[i] is not None:
-                self.__leds[i].brightness(self.__effects[i](*self.__data[i]))
+    def _show(self):
+        for i in range(self._num_leds):
+            if self._effects[i] is not None:
+                self._leds[i].brightness(self._effects[i](*self._data[i]))
 
 
 class ColourPlayer(EffectPlayer):
     def __init__(self, rgb_leds):
         super().__init__(rgb_leds)
 
-    def __show(self):
-        for i in range(self.__num_leds):
-            if self.__effects[i] is not None:
-                colours = self.__effects[i](*self.__data[i])
+    def _show(self):
+        for i in range(self._num_leds):
+            if self._effects[i] is not None:
+                colours = self._effects[i](*self._data[i])
                 if not isinstance(colours, tuple):
                     colours = [int(colours * 255)] * 3
 
-                self.__leds[i].set_rgb(*colours)
+                self._leds[i].set_rgb(*colours)
 
 
+# Renders a frame of the strip into a bytearray of r, g and b per LED, then flushes
+# the LEDs that changed since the last frame. A wave effect (see Wave) may be given
+# as the effects of the entire strip, e.g., player.effects = RainbowWaveFX(length=60),
+# which renders the frame in one call. Otherwise each LED's effect is called in turn.
+# A subclass may override _flush() for a strip driver that accepts a whole buffer
 class StripPlayer(EffectPlayer):
     def __init__(self, rgb_leds, num_leds=60):
         super().__init__(rgb_leds, num_leds)
+        self._strip = rgb_leds
+        self._frame = bytearray(num_leds * 3)
+        self._shown = bytearray(num_leds * 3)  # the frame last flushed
+        self._flushed = False
+        self._wave = None
+
+    def _set_effects(self, effect_list):
+        if isinstance(effect_list, Wave):
+            super()._set_effects([])
+            self._wave = effect_list
+            self._updateables.add(effect_list)
+        else:
+            self._wave = None
+            super()._set_effects(effect_list)
 
-    def __show(self):
-        for i in range(self.__num_leds):
-            if self.__effects[i] is not None:
-                colours = self.__effects[i](*self.__data[i])
-                if not isinstance(colours, tuple):
-                    colours = [int(colours * 255)] * 3
-
-                self.__leds.set_rgb(i, *colours)
+    @property
+    def frame(self):
+        # the frame buffer, r, g and b per LED
+        return self._frame
+
+    def _show(self):
+        frame = self._frame
+        if self._wave is not None:
+            self._wave.render(frame, self._num_leds)
+        else:
+            for i in range(self._num_leds):
+                if self._effects[i] is not None:
+                    colours = self._effects[i](*self._data[i])
+                    j = i * 3
+                    if isinstance(colours, tuple):
+                        frame[j], frame[j + 1], frame[j + 2] = colours
+                    else:
+                        frame[j] = frame[j + 1] = frame[j + 2] = int(colours * 255)
+        self._flush()
+
+    def _flush(self):
+        frame = self._frame
+        shown = self._shown
+        if self._flushed and frame == shown:
+            return
+        strip = self._strip
+        for i in range(self._num_leds):
+            j = i * 3
+            r = frame[j]
+            g = frame[j + 1]
+            b = frame[j + 2]
+            if not self._flushed or r != shown[j] or g != shown[j + 1] or b != shown[j + 2]:
+                strip.set_rgb(i, r, g, b)
+        shown[:] = frame
+        self._flushed = True
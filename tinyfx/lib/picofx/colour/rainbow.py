@@ -2,32 +2,125 @@
 #
 # SPDX-License-Identifier: MIT
 
-from picofx import Cycling, rgb_from_hsv
+from picofx import Cycling, Wave, Bakeable, rgb_from_hsv, rgb_from_hsv_u16, hsv_u16_into, lut_size
 
 
-class RainbowFX(Cycling):
-    def __init__(self, speed=1.0, sat=1.0, val=1.0):
+def _u8(fraction):
+    return min(255, max(0, int(fraction * 255 + 0.5)))
+
+
+def bake_rainbow(baked, sat, val):
+    # Return the table of a baked rainbow, as returned by Bakeable._bake(): the r, g
+    # and b at the centre of each of its samples
+    size, shift = lut_size(baked)
+
+    def fill(table):
+        for i in range(size):
+            r, g, b = rgb_from_hsv((i + 0.5) / size, sat, val)
+            table[i * 3] = int(r * 255)
+            table[i * 3 + 1] = int(g * 255)
+            table[i * 3 + 2] = int(b * 255)
+    return ("rainbow", size, sat, val), size * 3, fill, size, shift
+
+
+# The saturation and value are held as 0-255 integers alongside their float values,
+# so that each call uses integer arithmetic only (see rgb_from_hsv_u16)
+#
+# Either rainbow may be baked, e.g., baked=True or baked=64 (see lut_size()), in
+# which case its colour is looked up in a table of one cycle, baked again if the
+# saturation or value is changed. Its table is released by close() or by setting
+# baked to False
+class RainbowFX(Cycling, Bakeable):
+    def __init__(self, speed=1.0, sat=1.0, val=1.0, baked=False):
         Cycling.__init__(self, speed)
         self.sat = sat
         self.val = val
+        self.baked = baked
+
+    @property
+    def sat(self):
+        return self.__sat
+
+    @sat.setter
+    def sat(self, sat):
+        self.__sat = sat
+        self.__sat_u8 = _u8(sat)
+        self.rebake()
+
+    @property
+    def val(self):
+        return self.__val
+
+    @val.setter
+    def val(self, val):
+        self.__val = val
+        self.__val_u8 = _u8(val)
+        self.rebake()
+
+    def _bake(self, baked):
+        return bake_rainbow(baked, self.__sat, self.__val)
 
     def __call__(self):
-        r, g, b = rgb_from_hsv(self.__offset, self.sat, self.val)
-        return int(r * 255), int(g * 255), int(b * 255)
+        if self._baked:
+            i = (self.offset_u16 >> self._lut_shift) * 3
+            lut = self._lut
+            return lut[i], lut[i + 1], lut[i + 2]
+        return rgb_from_hsv_u16(self.offset_u16, self.__sat_u8, self.__val_u8)
 
 
-class RainbowWaveFX(Cycling):
-    def __init__(self, speed=1, length=1, sat=1, val=1):
-        super().__init__(speed)
-        self.length = length
+class RainbowWaveFX(Wave, Bakeable):
+    def __init__(self, speed=1, length=1, sat=1, val=1, baked=False, phase=0.0):
+        super().__init__(speed, length, phase)
         self.sat = sat
         self.val = val
+        self.baked = baked
+
+    @property
+    def sat(self):
+        return self.__sat
+
+    @sat.setter
+    def sat(self, sat):
+        self.__sat = sat
+        self.__sat_u8 = _u8(sat)
+        self.rebake()
+
+    @property
+    def val(self):
+        return self.__val
+
+    @val.setter
+    def val(self, val):
+        self.__val = val
+        self.__val_u8 = _u8(val)
+        self.rebake()
+
+    def _bake(self, baked):
+        return bake_rainbow(baked, self.__sat, self.__val)
+
+    def _at_phase(self, phase):
+        if self._baked:
+            i = (phase >> self._lut_shift) * 3
+            lut = self._lut
+            return lut[i], lut[i + 1], lut[i + 2]
+        return rgb_from_hsv_u16(phase, self.__sat_u8, self.__val_u8)
 
-    def __call__(self, pos):
-        def fx():
-            nonlocal pos
-            phase = pos / self.length
-            hue = (self.__offset + phase) % 1.0
-            r, g, b = rgb_from_hsv(hue, self.sat, self.val)
-            return int(r * 255), int(g * 255), int(b * 255)
-        return self, fx
+    def render(self, frame, count):
+        phases = self.phases(count)
+        offset = self.offset_u16 + self.phase_u16
+        j = 0
+        if self._baked:
+            lut = self._lut
+            shift = self._lut_shift
+            for i in range(count):
+                k = (((offset + phases[i]) & 0xFFFF) >> shift) * 3
+                frame[j] = lut[k]
+                frame[j + 1] = lut[k + 1]
+                frame[j + 2] = lut[k + 2]
+                j += 3
+        else:
+            sat = self.__sat_u8
+            val = self.__val_u8
+            for i in range(count):
+                hsv_u16_into(frame, j, offset + phases[i], sat, val)
+                j += 3
@@ -2,11 +2,14 @@
 #
 # SPDX-License-Identifier: MIT
 
-from picofx import Updateable, rgb_from_hsv
+from picofx import Updateable, Bakeable, rgb_from_hsv
 
 
-class HueStepFX(Updateable):
-    def __init__(self, interval=1.0, hue=0.0, sat=1.0, val=1.0, steps=6):
+# The step may be baked (baked=True), in which case the colour of each of its steps
+# is looked up in a table, baked again if the hue, saturation or value is changed.
+# Its table is released by close() or by setting baked to False
+class HueStepFX(Updateable, Bakeable):
+    def __init__(self, interval=1.0, hue=0.0, sat=1.0, val=1.0, steps=6, baked=False):
         self.interval = interval
         self.start_hue = hue
         self.sat = sat
@@ -14,12 +17,55 @@ class HueStepFX(Updateable):
         self.__steps = steps
         self.__current_step = 0
         self.__time = 0
+        self.baked = baked
 
-    def __call__(self):
-        hue = (self.start_hue + (self.__current_step / self.__steps)) % 1.0
-        r, g, b = rgb_from_hsv(hue, self.sat, self.val)
+    def __colour(self, step):
+        hue = (self.__start_hue + (step / self.__steps)) % 1.0
+        r, g, b = rgb_from_hsv(hue, self.__sat, self.__val)
         return int(r * 255), int(g * 255), int(b * 255)
 
+    @property
+    def start_hue(self):
+        return self.__start_hue
+
+    @start_hue.setter
+    def start_hue(self, hue):
+        self.__start_hue = hue
+        self.rebake()
+
+    @property
+    def sat(self):
+        return self.__sat
+
+    @sat.setter
+    def sat(self, sat):
+        self.__sat = sat
+        self.rebake()
+
+    @property
+    def val(self):
+        return self.__val
+
+    @val.setter
+    def val(self, val):
+        self.__val = val
+        self.rebake()
+
+    def _bake(self, baked):
+        # the colour of each step, as returned by Bakeable._bake()
+        def fill(table):
+            for step in range(self.__steps):
+                table[step * 3], table[step * 3 + 1], table[step * 3 + 2] = self.__colour(step)
+        key = ("huestep", self.__steps, self.__start_hue, self.__sat, self.__val)
+        return key, self.__steps * 3, fill, self.__steps, 0
+
+    def __call__(self):
+        if self._baked:
+            i = self.__current_step * 3
+            lut = self._lut
+            return lut[i], lut[i + 1], lut[i + 2]
+        return self.__colour(self.__current_step)
+
     def tick(self, delta_ms):
         self.__time += delta_ms
 
@@ -2,31 +2,62 @@
 #
 # SPDX-License-Identifier: MIT
 
-from picofx import Cycling
+from picofx import Cycling, Wave, phase_u16, fraction_u16
 
 
+# The phase and duty are held as 16-bit integers alongside their float values,
+# so that each call compares integers only (see Cycling)
 class BlinkFX(Cycling):
     def __init__(self, speed=1, phase=0.0, duty=0.5):
         super().__init__(speed)
         self.phase = phase
         self.duty = duty
 
+    @property
+    def phase(self):
+        return self.__phase
+
+    @phase.setter
+    def phase(self, phase):
+        self.__phase = phase
+        self.__phase_u16 = phase_u16(phase)
+
+    @property
+    def duty(self):
+        return self.__duty
+
+    @duty.setter
+    def duty(self, duty):
+        self.__duty = duty
+        self.__duty_u16 = fraction_u16(duty)
+
     def __call__(self):
-        percent = (self.__offset + self.phase) % 1.0
-        return 1.0 if percent < self.duty else 0.0
+        percent = (self.offset_u16 + self.__phase_u16) & 0xFFFF
+        return 1.0 if percent < self.__duty_u16 else 0.0
 
 
-class BlinkWaveFX(Cycling):
+class BlinkWaveFX(Wave):
     def __init__(self, speed=1, length=1, phase=0.0, duty=0.5):
-        super().__init__(speed)
-        self.length = length
-        self.phase = phase
+        super().__init__(speed, length, phase)
         self.duty = duty
 
-    def __call__(self, pos):
-        def fx():
-            nonlocal pos
-            phase = (pos / self.length)
-            percent = (self.__offset + self.phase + phase) % 1.0
-            return 1.0 if percent < self.duty else 0.0
-        return self, fx
+    @property
+    def duty(self):
+        return self.__duty
+
+    @duty.setter
+    def duty(self, duty):
+        self.__duty = duty
+        self.__duty_u16 = fraction_u16(duty)
+
+    def _at_phase(self, phase):
+        return 1.0 if phase < self.__duty_u16 else 0.0
+
+    def render(self, frame, count):
+        phases = self.phases(count)
+        offset = self.offset_u16 + self.phase_u16
+        duty = self.__duty_u16
+        j = 0
+        for i in range(count):
+            frame[j] = frame[j + 1] = frame[j + 2] = 255 if ((offset + phases[i]) & 0xFFFF) < duty else 0
+            j += 3
@@ -2,9 +2,13 @@
 #
 # SPDX-License-Identifier: MIT
 
-from picofx import Cycling
+from picofx import Cycling, Wave, PHASE_ONE, phase_u16, fraction_u16
 
 
+# The window, phase and duty are held as integers alongside their float values, so
+# that each call uses integer arithmetic only (see Cycling). A flash is on while
+# (offset * flashes) % window < duty * window, i.e., within the first part of each
+# of the flashes spread across the window
 class FlashFX(Cycling):
     def __init__(self, speed=1, flashes=2, window=0.5, phase=0.0, duty=0.5):
         super().__init__(speed)
@@ -24,21 +28,53 @@ class FlashFX(Cycling):
 
         self.__flashes = int(flashes)
 
+    @property
+    def window(self):
+        return self.__window
+
+    @window.setter
+    def window(self, window):
+        self.__window = window
+        self.__window_u16 = max(0, int(window * PHASE_ONE))  # may exceed a cycle
+        self.__update_on()
+
+    @property
+    def phase(self):
+        return self.__phase
+
+    @phase.setter
+    def phase(self, phase):
+        self.__phase = phase
+        self.__phase_u16 = phase_u16(phase)
+
+    @property
+    def duty(self):
+        return self.__duty
+
+    @duty.setter
+    def duty(self, duty):
+        self.__duty = duty
+        self.__update_on()
+
+    def __update_on(self):
+        # the part of the window in which a flash is on, once both are set
+        try:
+            self.__on = (fraction_u16(self.__duty) * self.__window_u16) // PHASE_ONE
+        except AttributeError:
+            pass
+
     def __call__(self):
-        offset = (self.__offset + self.phase) % 1.0
-        if offset < self.window:
-            percent = ((offset * self.__flashes) / self.window) % 1.0
-            return 1.0 if percent < self.duty else 0.0
+        offset = (self.offset_u16 + self.__phase_u16) & 0xFFFF
+        if offset < self.__window_u16:
+            return 1.0 if (offset * self.__flashes) % self.__window_u16 < self.__on else 0.0
         return 0.0
 
 
-class FlashSequenceFX(Cycling):
+class FlashSequenceFX(Wave):
     def __init__(self, speed=1, length=1, flashes=1, window=1, phase=0.0, duty=0.5):
-        super().__init__(speed)
-        self.length = length
+        super().__init__(speed, length, phase)
         self.flashes = flashes
         self.window = window
-        self.phase = phase
         self.duty = duty
 
     @property
@@ -52,13 +88,44 @@ class FlashSequenceFX(Cycling):
 
         self.__flashes = int(flashes)
 
-    def __call__(self, pos):
-        def fx():
-            nonlocal pos
-            phase = pos / self.length
-            offset = (self.__offset + self.phase + phase) % 1.0
-            if offset < self.window:
-                percent = ((offset * self.__flashes) / self.window) % 1.0
-                return 1.0 if percent < self.duty else 0.0
-            return 0.0
-        return self, fx
+    @property
+    def window(self):
+        return self.__window
+
+    @window.setter
+    def window(self, window):
+        self.__window = window
+        self.__window_u16 = max(0, int(window * PHASE_ONE))  # may exceed a cycle
+        self.__update_on()
+
+    @property
+    def duty(self):
+        return self.__duty
+
+    @duty.setter
+    def duty(self, duty):
+        self.__duty = duty
+        self.__update_on()
+
+    def __update_on(self):
+        try:
+            self.__on = (fraction_u16(self.__duty) * self.__window_u16) // PHASE_ONE
+        except AttributeError:
+            pass
+
+    def _at_phase(self, phase):
+        if phase < self.__window_u16:
+            return 1.0 if (phase * self.__flashes) % self.__window_u16 < self.__on else 0.0
+        return 0.0
+
+    def render(self, frame, count):
+        phases = self.phases(count)
+        start = self.offset_u16 + self.phase_u16
+        flashes = self.__flashes
+        window = self.__window_u16
+        on = self.__on
+        j = 0
+        for i in range(count):
+            offset = (start + phases[i]) & 0xFFFF
+            frame[j] = frame[j + 1] = frame[j + 2] = 255 if offset < window and (offset * flashes) % window < on else 0
+            j += 3
@@ -3,29 +3,94 @@
 # SPDX-License-Identifier: MIT
 
 import math
-from picofx import Cycling
+from array import array
+from picofx import Cycling, Wave, Bakeable, phase_u16, brightness_levels, lut_size
 
 
-class PulseFX(Cycling):
-    def __init__(self, speed=1, phase=0):
+# One cycle of the pulse, (sin(angle) + 1) / 2, as 16-bit values at 256 points
+# (plus the first repeated, for interpolation), shared by all pulses
+SINE_TABLE = array("H", [int((math.sin(i * math.pi / 128) + 1) * 32767.5 + 0.5) for i in range(257)])
+
+
+def pulse_u16(phase):
+    # Return the pulse at a 16-bit phase as a level from 0 to 255, interpolating
+    # between the points of the table
+    i = phase >> 8
+    a = SINE_TABLE[i]
+    level = a + (((SINE_TABLE[i + 1] - a) * (phase & 0xFF)) >> 8)
+    return (level * 255 + 32767) >> 16
+
+
+def bake_pulse(baked):
+    # Return the table of a baked pulse, as returned by Bakeable._bake(): the levels at
+    # the centre of each of its samples
+    size, shift = lut_size(baked)
+
+    def fill(table):
+        for i in range(size):
+            table[i] = int((math.sin((i + 0.5) * math.pi * 2 / size) + 1) * 127.5 + 0.5)
+    return ("pulse", size), size, fill, size, shift
+
+
+# Either pulse may be baked, e.g., baked=True or baked=64 (see lut_size()), in which
+# case its output is looked up in a table of one cycle, without interpolation. Its
+# table is released by close() or by setting baked to False
+class PulseFX(Cycling, Bakeable):
+    def __init__(self, speed=1, phase=0, baked=False):
         super().__init__(speed)
         self.phase = phase
+        self.__levels = brightness_levels()
+        self.baked = baked
+
+    @property
+    def phase(self):
+        return self.__phase
+
+    @phase.setter
+    def phase(self, phase):
+        self.__phase = phase
+        self.__phase_u16 = phase_u16(phase)
+
+    def _bake(self, baked):
+        return bake_pulse(baked)
 
     def __call__(self):
-        angle = (self.__offset + self.phase) * math.pi * 2
-        return (math.sin(angle) + 1) / 2.0
+        phase = (self.offset_u16 + self.__phase_u16) & 0xFFFF
+        if self._baked:
+            return self.__levels[self._lut[phase >> self._lut_shift]]
+        return self.__levels[pulse_u16(phase)]
 
 
-class PulseWaveFX(Cycling):
-    def __init__(self, speed=1, length=1, phase=0.0):
-        super().__init__(speed)
-        self.length = length
-        self.phase = phase
+class PulseWaveFX(Wave, Bakeable):
+    def __init__(self, speed=1, length=1, phase=0.0, baked=False):
+        super().__init__(speed, length, phase)
+        self.__levels = brightness_levels()
+        self.baked = baked
+
+    def _bake(self, baked):
+        return bake_pulse(baked)
+
+    def _at_phase(self, phase):
+        if self._baked:
+            return self.__levels[self._lut[phase >> self._lut_shift]]
+        return self.__levels[pulse_u16(phase)]
 
-    def __call__(self, pos):
-        def fx():
-            nonlocal pos
-            phase = pos / self.length
-            angle = (self.__offset + self.phase + phase) * math.pi * 2
-            return (math.sin(angle) + 1) / 2.0
-        return self, fx
+    def render(self, frame, count):
+        phases = self.phases(count)
+        offset = self.offset_u16 + self.phase_u16
+        j = 0
+        if self._baked:
+            lut = self._lut
+            shift = self._lut_shift
+            for i in range(count):
+                frame[j] = frame[j + 1] = frame[j + 2] = lut[((offset + phases[i]) & 0xFFFF) >> shift]
+                j += 3
+        else:
+            sine = SINE_TABLE
+            for i in range(count):
+                phase = (offset + phases[i]) & 0xFFFF
+                k = phase >> 8
+                a = sine[k]
+                level = a + (((sine[k + 1] - a) * (phase & 0xFF)) >> 8)
+                frame[j] = frame[j + 1] = frame[j + 2] = (level * 255 + 32767) >> 16
+                j += 3
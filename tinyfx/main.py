@@ -1,22 +1,26 @@
 #!/micropython
 # -*- coding: utf-8 -*-
 #
-# Copyright 2020-2025 by Ichiro Furusato. All rights reserved. This file is part
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
 # of the Robot Operating System project, released under the MIT License. Please
 # see the LICENSE file included as part of this package.
 #
 # author:   Ichiro Furusato
 # created:  2025-11-16
-# modified: 2025-11-22
+# modified: 2026-10-16
 
 import sys
 import time
 from i2c_slave import I2CSlave
 
 __USE_TINYFX = True # set False to use the generic Controller
+__I2C_ADDRESS = 0x43 # each TinyFX sharing a bus requires its own address
+__HEAP_LOCK_TEST = False # set True to verify the I2C IRQ handler does not allocate
+__PERF_STATS = False # set True to keep performance counters, read by a 'stats' data request
+__USE_REGISTERS = False # set True to use the register-mapped memory slave (see registers.py)
 
 # auto-clear: remove cached modules to force reload
-for mod in ['main', 'i2c_slave', 'controller', 'tinyfx_controller']:
+for mod in ['main', 'i2c_slave', 'dispatcher', 'controller', 'tinyfx_controller', 'perf_stats', 'i2c_slave_mem']:
     if mod in sys.modules:
         del sys.modules[mod]
 
@@ -33,10 +37,17 @@ def main():
 
         controller = Controller()
 
-    slave = I2CSlave()
+    if __USE_REGISTERS:
+        from i2c_slave_mem import I2CSlave as RegisterSlave
+
+        slave = RegisterSlave(i2c_address=__I2C_ADDRESS, sda_pin=16, scl_pin=17, registers=True)
+
+    else:
+        slave = I2CSlave(i2c_address=__I2C_ADDRESS, heap_lock_test=__HEAP_LOCK_TEST, perf_stats=__PERF_STATS)
 #   slave.add_callback(controller.process)
     controller.set_slave(slave)
     slave.enable()
+    perf = slave.perf_stats # None unless enabled
     last_time = time.ticks_ms()
 
     try:
@@ -44,7 +55,13 @@ def main():
             current_time = time.ticks_ms()
             delta_ms = time.ticks_diff(current_time, last_time)
             last_time = current_time
+            if perf:
+                tick_start = perf.loop_start()
+            slave.hold(True) # don't apply commands part way through a frame
             controller.tick(delta_ms)
+            slave.hold(False)
+            if perf:
+                perf.tick_end(tick_start)
             slave.check_and_process()
             time.sleep_ms(1)
     except KeyboardInterrupt:
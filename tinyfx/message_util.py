@@ -1,34 +1,44 @@
 #!/micropython
 # -*- coding: utf-8 -*-
 #
-# Copyright 2020-2025 by Ichiro Furusato. All rights reserved. This file is part
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
 # of the Robot Operating System project, released under the MIT License. Please
 # see the LICENSE file included as part of this package.
 #
 # author:   Ichiro Furusato
 # created:  2025-11-16
-# modified: 2025-11-16
+# modified: 2026-10-16
 
 import sys
 
 try:
-    from upy.crc8_table import CRC8_TABLE
+    from upy.crc8_util import crc8, calculate_crc8
+    from upy.opcodes import OP_BATCH, OP_REQUEST
 except ImportError:
-    from crc8_table import CRC8_TABLE
+    from crc8_util import crc8, calculate_crc8
+    from opcodes import OP_BATCH, OP_REQUEST
 
-def calculate_crc8(data):
-    crc = 0
-    for b in data:
-        crc = CRC8_TABLE[crc ^ b]
-    return crc
+class CrcError(ValueError):
+    '''
+    Raised when a message fails its CRC check.
+    '''
+    pass
 
-def pack_message(payload_str):
+def pack_message(payload, request_id=None):
     '''
-    Pack a string payload into i2c message: [length][payload_bytes][crc8]
-    payload_str: ASCII string (or convertible to bytes)
+    Pack a payload into i2c message: [length][payload_bytes][crc8]
+    payload: ASCII string (or convertible to bytes), or a bytes-like binary payload
+    request_id: optional ID (1-255) prefixed to the payload, echoed in the response
     returns: bytes object to transmit
     '''
-    payload_bytes = payload_str.encode('ascii')
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        payload_bytes = bytes(payload)
+    else:
+        payload_bytes = str(payload).encode('ascii')
+    if request_id is not None:
+        if not 1 <= request_id <= 255:
+            raise ValueError('request ID must be from 1 to 255 (got {})'.format(request_id))
+        payload_bytes = bytes([OP_REQUEST, request_id]) + payload_bytes
     length = len(payload_bytes)
     if length > 255:
         raise ValueError('payload too long (max 255 bytes)')
@@ -36,20 +46,75 @@ def pack_message(payload_str):
     crc = calculate_crc8(msg)
     return msg + bytes([crc])
 
+def pack_opcode(opcode, *operands):
+    '''
+    Pack a binary command, an opcode followed by single-byte operands,
+    into an i2c message: [length][opcode][operands...][crc8]
+    '''
+    return pack_message(bytes([opcode]) + bytes(operands))
+
+def pack_batch(payloads):
+    '''
+    Pack a list of command payloads (ASCII strings or binary payloads) into
+    a single batch message: [length][OP_BATCH][count]([length][payload])...[crc8]
+    Raises ValueError if the batch exceeds the 255 byte payload of a message.
+    '''
+    encoded = [ payload.encode('ascii') if isinstance(payload, str) else bytes(payload) for payload in payloads ]
+    length = 2 + sum(1 + len(payload_bytes) for payload_bytes in encoded)
+    if length > 255:
+        raise ValueError('batch of {} commands too long: {} bytes (max 255)'.format(len(encoded), length))
+    batch = bytearray([OP_BATCH, len(encoded)])
+    for payload_bytes in encoded:
+        batch.append(len(payload_bytes))
+        batch.extend(payload_bytes)
+    return pack_message(batch)
+
+def validate_frame(buf, offset, length):
+    '''
+    Validate the message [length][payload][crc8] occupying length bytes at
+    offset within buf, in place and without allocating. Return the payload
+    length if CRC ok, else raise ValueError (a CrcError if the CRC fails).
+    The payload (e.g., its opcode) may then be read directly from buf,
+    starting at offset + 1.
+    '''
+    if length < 2:
+        raise ValueError('message too short')
+    msg_len = buf[offset]
+    if length != msg_len + 2:
+        raise ValueError('bad message length (expected {}, got {})'.format(msg_len+2, length))
+    if buf[offset + length - 1] != crc8(buf, offset, offset + length - 1):
+        raise CrcError('crc8 mismatch')
+    return msg_len
+
+def unpack_frame(buf, offset, length):
+    '''
+    Validate the message occupying length bytes at offset within buf, in place.
+    Return a memoryview of the payload if CRC ok, else raise ValueError. The
+    memoryview refers to buf, so is only valid until buf is reused.
+    '''
+    msg_len = validate_frame(buf, offset, length)
+    return memoryview(buf)[offset + 1:offset + 1 + msg_len]
+
+def unpack_payload(msg_bytes):
+    '''
+    Unpack message from [length][payload][crc8]. Return the payload bytes if CRC ok, else raise ValueError.
+    '''
+    return bytes(unpack_frame(msg_bytes, 0, len(msg_bytes)))
+
+def split_request_id(payload_bytes):
+    '''
+    Split an unpacked payload into its request ID and the payload that
+    follows it, returning a tuple of (request_id, payload_bytes). The
+    request ID is None if the payload was not tagged with one.
+    '''
+    if len(payload_bytes) >= 2 and payload_bytes[0] == OP_REQUEST:
+        return payload_bytes[1], payload_bytes[2:]
+    return None, payload_bytes
+
 def unpack_message(msg_bytes):
     '''
     Unpack message from [length][payload][crc8]. Return payload string if CRC ok, else raise ValueError.
     '''
-    if len(msg_bytes) < 2:
-        raise ValueError('message too short')
-    length = msg_bytes[0]
-    if len(msg_bytes) != length + 2:
-        raise ValueError('bad message length (expected {}, got {})'.format(length+2, len(msg_bytes)))
-    payload_bytes = msg_bytes[1:1+length]
-    crc_in_msg = msg_bytes[-1]
-    crc_check = calculate_crc8(msg_bytes[:-1])
-    if crc_in_msg != crc_check:
-        raise ValueError('crc8 mismatch')
-    return payload_bytes.decode('ascii')
+    return unpack_payload(msg_bytes).decode('ascii')
 
 #EOF
@@ -0,0 +1,68 @@
+#!/micropython
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# Opcodes for the compact binary command protocol.
+#
+# A binary payload travels inside the same [length][payload][crc8] frame as an
+# ASCII command string. It is distinguished from ASCII by its first byte, the
+# opcode, which always has its high bit set; this can never occur as the first
+# character of a 7-bit ASCII command. The opcode is followed by a fixed number
+# of single-byte operands, as listed in OPERAND_LENGTHS. The exception is
+# OP_BATCH, which carries a number of complete command payloads (ASCII or
+# binary) that the target applies together, and OP_REQUEST, which tags any
+# payload with a request ID that is echoed back in its response.
+
+OPCODE_FLAG  = 0x80
+
+OP_PING      = 0x80  # no operands; returns 'ACK'
+OP_CHANNEL   = 0x81  # [channel: 0=all, 1-6][state: 0=off, 1=on]
+OP_HEARTBEAT = 0x82  # [state: 0=off, 1=on]
+OP_COLOR     = 0x83  # [red][green][blue]
+OP_PIR       = 0x84  # no operands; data request
+OP_BATCH     = 0x85  # [count] then per command: [length][payload]
+OP_REQUEST   = 0x86  # [request id][payload]; response: [OP_REQUEST][request id][response]
+OP_FETCH     = 0x87  # [request id]; returns the stored response to that request
+
+# per-command status codes returned in a batch response: [OP_BATCH][status]...
+STATUS_ACK   = 0x00
+STATUS_NACK  = 0x01
+STATUS_ERR   = 0x02
+
+# the status byte preceding a response in the target's transmit buffer
+RESPONSE_PENDING = 0x00  # the message is being processed
+RESPONSE_READY   = 0xA5  # the response to the message follows
+
+# the number of operand bytes following each opcode
+OPERAND_LENGTHS = {
+    OP_PING:      0,
+    OP_CHANNEL:   2,
+    OP_HEARTBEAT: 1,
+    OP_COLOR:     3,
+    OP_PIR:       0,
+    OP_FETCH:     1
+}
+
+def is_binary(payload):
+    '''
+    Returns True if the payload is a binary (opcode) payload rather than
+    an ASCII command string.
+    '''
+    return len(payload) > 0 and (payload[0] & OPCODE_FLAG) != 0
+
+def operands_valid(payload):
+    '''
+    Returns True if the binary payload has the number of operands
+    expected for its opcode.
+    '''
+    expected = OPERAND_LENGTHS.get(payload[0])
+    return expected is not None and len(payload) == 1 + expected
+
+#EOF
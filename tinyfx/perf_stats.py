@@ -0,0 +1,142 @@
+#!/micropython
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+
+import time
+
+try:
+    from micropython import const
+except ImportError: # CPython
+    const = lambda x: x
+
+BUCKETS    = const(16)   # log2 buckets, the last being open-ended (16.4ms or more)
+OVERRUN_US = const(2000) # a loop period longer than this is counted as an overrun
+
+class Histogram:
+    '''
+    A histogram of durations in microseconds, in fixed log2 buckets: bucket
+    0 counts zero, bucket i counts durations from 2^(i-1) up to 2^i, and
+    the last bucket counts anything longer. The count, total and maximum
+    are also kept, so the mean and maximum are exact.
+    '''
+    def __init__(self):
+        self.buckets = [0] * BUCKETS
+        self.reset()
+
+    def reset(self):
+        for i in range(BUCKETS):
+            self.buckets[i] = 0
+        self.count = 0
+        self.total = 0
+        self.max   = 0
+
+    def record(self, value):
+        if value < 0:
+            value = 0
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        i = 0
+        while value and i < BUCKETS - 1:
+            value >>= 1
+            i += 1
+        self.buckets[i] += 1
+
+    def percentile(self, percent):
+        '''
+        Returns the upper bound of the bucket containing the percentile,
+        or the maximum if that is lower.
+        '''
+        if self.count == 0:
+            return 0
+        target = (self.count * percent + 99) // 100
+        cumulative = 0
+        for i in range(BUCKETS):
+            cumulative += self.buckets[i]
+            if cumulative >= target:
+                return min(1 << i, self.max)
+        return self.max
+
+    def summary(self):
+        '''
+        Returns 'count/mean/p50/p99/max', in microseconds.
+        '''
+        return '{}/{}/{}/{}/{}'.format(self.count, self.total // self.count if self.count else 0,
+                self.percentile(50), self.percentile(99), self.max)
+
+class PerfStats:
+    '''
+    Performance counters for the target, measured in microseconds:
+
+      loop      the main loop period, counting overruns
+      tick      the duration of the controller's tick (the frame update)
+      dispatch  the time to dispatch a command, including the controller
+      latency   the time from the end of a write (in the IRQ) until the
+                message is processed
+
+    along with the number of messages failing their CRC check. These are
+    integers in fixed-size histograms, so recording does not allocate
+    (barring counts beyond a small int). The I2CSlave creates these only
+    if enabled; otherwise each measurement point is a single test of None.
+    '''
+    NAMES = ('loop', 'tick', 'dispatch', 'latency')
+
+    def __init__(self):
+        self.loop     = Histogram()
+        self.tick     = Histogram()
+        self.dispatch = Histogram()
+        self.latency  = Histogram()
+        self.overruns     = 0
+        self.crc_failures = 0
+        self._loop_start  = None
+
+    def reset(self):
+        for name in PerfStats.NAMES:
+            getattr(self, name).reset()
+        self.overruns     = 0
+        self.crc_failures = 0
+        self._loop_start  = None
+
+    def loop_start(self):
+        '''
+        Called at the start of each iteration of the main loop, recording
+        the loop period. Returns the start time, for tick_end().
+        '''
+        now = time.ticks_us()
+        if self._loop_start is not None:
+            period = time.ticks_diff(now, self._loop_start)
+            self.loop.record(period)
+            if period > OVERRUN_US:
+                self.overruns += 1
+        self._loop_start = now
+        return now
+
+    def tick_end(self, start):
+        '''
+        Called following the controller's tick, recording its duration.
+        '''
+        self.tick.record(time.ticks_diff(time.ticks_us(), start))
+
+    def histogram(self, name):
+        '''
+        Returns the named histogram's bucket counts as a comma-separated
+        string, or None if there is no such histogram.
+        '''
+        if name not in PerfStats.NAMES:
+            return None
+        return '{} {}'.format(name, ','.join(str(n) for n in getattr(self, name).buckets))
+
+    def summary(self):
+        return '{} overruns={} crc={}'.format(
+                ' '.join('{}={}'.format(name, getattr(self, name).summary()) for name in PerfStats.NAMES),
+                self.overruns, self.crc_failures)
+
+#EOF
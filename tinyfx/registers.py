@@ -0,0 +1,49 @@
+#!/micropython
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# The register map of the register-mapped mode of the memory I2C slave (see
+# i2c_slave_mem.py). The master writes the state registers directly, e.g.,
+# writeto_mem(addr, REG_CH1, b'\xcc'), and the change is applied on the next
+# frame; the telemetry registers are read-only.
+
+# state registers (read-write)
+REG_CH1       = 0x00  # channel 1 brightness [0=off, 1-255]
+REG_CH2       = 0x01
+REG_CH3       = 0x02
+REG_CH4       = 0x03
+REG_CH5       = 0x04
+REG_CH6       = 0x05
+REG_RED       = 0x06  # RGB LED [0-255]
+REG_GREEN     = 0x07
+REG_BLUE      = 0x08
+REG_HEARTBEAT = 0x09  # [0=off, 1=on]
+REG_SOUND     = 0x0A  # [0=none, 1-255] sound index; cleared once played
+
+# telemetry registers (read-only)
+REG_STATUS    = 0x10  # STATUS_* flags
+REG_FRAMES    = 0x11  # frame count, 16 bits little-endian (0x11-0x12)
+REG_APPLIED   = 0x13  # register writes applied, 16 bits little-endian (0x13-0x14)
+REG_REJECTED  = 0x15  # writes to read-only registers, 8 bits (saturating)
+
+WRITABLE_COUNT = 0x10 # registers below this are writable
+REGISTER_COUNT = 0x20 # the size of the register map, a single SMBus block read
+
+# REG_STATUS flags
+STATUS_RUNNING = 0x01 # the target is processing registers
+STATUS_ERROR   = 0x02 # applying the last change raised an error
+
+CHANNEL_MASK   = 0x003F # the bits in a change mask of the channel registers
+COLOR_MASK     = (1 << REG_RED) | (1 << REG_GREEN) | (1 << REG_BLUE)
+HEARTBEAT_MASK = 1 << REG_HEARTBEAT
+SOUND_MASK     = 1 << REG_SOUND
+TRIGGER_MASK   = SOUND_MASK # registers cleared once applied
+
+#EOF
@@ -0,0 +1,131 @@
+#!/micropython
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# A table-driven router for ASCII command strings.
+
+MAX_ARGS = 3 # the maximum number of arguments of a command
+
+# argument types: each converts an argument string, raising ValueError if invalid
+
+def text(arg):
+    '''
+    An argument passed as is, e.g., a sound name.
+    '''
+    return arg
+
+def word(arg):
+    '''
+    An argument passed in lower case, e.g., a color name.
+    '''
+    return arg.lower()
+
+def integer(arg):
+    return int(arg)
+
+def state(arg):
+    '''
+    An 'on' or 'off' argument, passed as True or False.
+    '''
+    arg = arg.lower()
+    if arg == 'on':
+        return True
+    elif arg == 'off':
+        return False
+    raise ValueError("expected 'on' or 'off', not '{}'".format(arg))
+
+class Router:
+    '''
+    Routes command strings to the handlers registered for them. A command
+    string is split once into its command name (matched in lower case) and
+    arguments, each argument is converted by the type declared for it into
+    a preallocated slot, and the handler is looked up in a dict and called
+    with the converted arguments.
+
+    A handler returns its response string, or None for 'ACK'. A command
+    with the wrong number of arguments is answered with the mismatch
+    response of its route ('ERR' by default), unless its route ignores
+    extra arguments. A command with an argument its type rejects is
+    answered with 'ERR'. An unregistered command is passed, as the entire
+    command string, to the default handler if set, otherwise it is
+    answered with 'NACK'.
+    '''
+    def __init__(self):
+        self._routes = {}
+        self._slots  = [None] * MAX_ARGS
+        self.default = None
+
+    def add(self, name, handler, *arg_types, min_args=None, ignore_extra=False, mismatch='ERR'):
+        '''
+        Registers the handler of the named command, which accepts arguments
+        of the given types (see text, word, integer and state). If min_args
+        is less than the number of types, the remainder are optional and
+        passed as None if absent. If ignore_extra is True, arguments beyond
+        the types are ignored. Otherwise, as with fewer than min_args, the
+        command is answered with the mismatch response. Registering a name
+        again replaces its handler.
+        '''
+        if len(arg_types) > MAX_ARGS:
+            raise ValueError('too many arguments for {} (max {})'.format(name, MAX_ARGS))
+        if min_args is None:
+            min_args = len(arg_types)
+        self._routes[name.lower()] = (handler, arg_types, min_args, ignore_extra, mismatch)
+
+    def remove(self, name):
+        self._routes.pop(name.lower(), None)
+
+    def get(self, name):
+        '''
+        Returns the route of the named command as a tuple of its handler,
+        argument types, minimum number of arguments, whether it ignores
+        extra arguments and its mismatch response, or None.
+        '''
+        return self._routes.get(name.lower())
+
+    @property
+    def commands(self):
+        '''
+        Returns a sorted list of the registered command names.
+        '''
+        return sorted(self._routes)
+
+    def route(self, cmd):
+        '''
+        Routes the command string to its handler, returning the response.
+        '''
+        parts = cmd.split()
+        if not parts:
+            return 'ERR'
+        route = self._routes.get(parts[0].lower())
+        if route is None:
+            return self.default(cmd) if self.default else 'NACK'
+        handler, arg_types, min_args, ignore_extra, mismatch = route
+        nargs = len(parts) - 1
+        if nargs < min_args or (nargs > len(arg_types) and not ignore_extra):
+            return mismatch
+        slots = self._slots
+        try:
+            for i in range(len(arg_types)):
+                slots[i] = arg_types[i](parts[i + 1]) if i < nargs else None
+        except ValueError:
+            return 'ERR'
+        # called by arity rather than with *slots, which would allocate a tuple
+        count = len(arg_types)
+        if count == 0:
+            response = handler()
+        elif count == 1:
+            response = handler(slots[0])
+        elif count == 2:
+            response = handler(slots[0], slots[1])
+        else:
+            response = handler(slots[0], slots[1], slots[2])
+        return 'ACK' if response is None else response
+
+#EOF
@@ -1,13 +1,13 @@
 #!/micropython
 # -*- coding: utf-8 -*-
 #
-# Copyright 2020-2025 by Ichiro Furusato. All rights reserved. This file is part
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
 # of the Robot Operating System project, released under the MIT License. Please
 # see the LICENSE file included as part of this package.
 #
 # author:   Ichiro Furusato
 # created:  2024-12-17
-# modified: 2025-11-16
+# modified: 2026-10-16
 #
 # A Tiny FX device that responds immediately to set() commands.
 
@@ -19,6 +19,14 @@ class SettableFX(Updateable):
         self._brightness = brightness
         self._state = False
 
+    @property
+    def brightness(self):
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, brightness):
+        self._brightness = brightness
+
     def __call__(self):
         return self._brightness if self._state else 0.0
 
@@ -1,17 +1,17 @@
 #!/micropython
 # -*- coding: utf-8 -*-
 #
-# Copyright 2020-2025 by Ichiro Furusato. All rights reserved. This file is part
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
 # of the Robot Operating System project, released under the MIT License. Please
 # see the LICENSE file included as part of this package.
 #
 # author:   Ichiro Furusato
 # created:  2024-09-07
-# modified: 2025-11-16
+# modified: 2026-10-16
 #
 # A Tiny FX device that blinks according to values set via a method.
 
-from picofx import Cycling
+from picofx import Cycling, phase_u16, fraction_u16
 
 class SettableBlinkFX(Cycling):
     def __init__(self, interval=0.1, speed=1, phase=0.0, duty=0.5):
@@ -19,9 +19,32 @@ class SettableBlinkFX(Cycling):
         super().__init__(speed)
         self.phase = phase
         self.duty  = duty
+        self.brightness = 1.0
         self._state = False
         self.__time = 0
 
+    @property
+    def phase(self):
+        return self._phase
+
+    @phase.setter
+    def phase(self, phase):
+        '''
+        Sets the phase, also held as a 16-bit integer so that each call
+        compares integers only.
+        '''
+        self._phase     = phase
+        self._phase_u16 = phase_u16(phase)
+
+    @property
+    def duty(self):
+        return self._duty
+
+    @duty.setter
+    def duty(self, duty):
+        self._duty     = duty
+        self._duty_u16 = fraction_u16(duty)
+
     def set(self, state):
         self._state = state
 
@@ -33,8 +56,8 @@ class SettableBlinkFX(Cycling):
 
     def __call__(self):
         if self._state:
-            percent = (self.__offset + self.phase) % 1.0
-            return 1.0 if percent < self.duty else 0.0
+            percent = (self.offset_u16 + self._phase_u16) & 0xFFFF
+            return self.brightness if percent < self._duty_u16 else 0.0
         else:
             return 0.0
 
@@ -1,13 +1,14 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 #
-# Copyright 2020-2025 by Murray Altheim. All rights reserved. This file is part
+# Copyright 2020-2026 by Murray Altheim. All rights reserved. This file is part
 # of the Robot Operating System project, released under the MIT License.
 #
 # author:   Murray Altheim
 # created:  2025-11-16
-# modified: 2025-11-22
+# modified: 2026-10-16
 
+import os
 from tiny_fx import TinyFX
 from manual_player import ManualPlayer
 from settable import SettableFX
@@ -15,6 +16,10 @@ from settable_blink import SettableBlinkFX
 from pir import PassiveInfrared
 from colors import *
 from controller import Controller
+from router import text, word, state
+from opcodes import OP_PING, OP_CHANNEL, OP_HEARTBEAT, OP_COLOR, OP_PIR, operands_valid
+from registers import (REG_CH1, REG_RED, REG_GREEN, REG_BLUE, REG_HEARTBEAT, REG_SOUND,
+        CHANNEL_MASK, COLOR_MASK, HEARTBEAT_MASK, SOUND_MASK)
 
 class TinyFxController(Controller):
     '''
@@ -26,9 +31,13 @@ class TinyFxController(Controller):
       all on|off            turn all channels on or off (including RGB LED)
       heartbeat on|off      blinking RGB LED
       color [name]          set RGB LED to color name (see colors.py)
+      stats [reset|name]    performance statistics (data request), if enabled
 
     Setting the heartbeat or color will disable the other.
     PIR sensor functionality currently has not been tested.
+
+    Commands are added to the router by the constructor; a subclass may
+    add its own, or replace these, with add_command().
     '''
     def __init__(self, blink_channels=None):
         super().__init__()
@@ -37,7 +46,9 @@ class TinyFxController(Controller):
             blink_channels = [False, False, False, False, False, False]
         if len(blink_channels) != 6:
             raise ValueError("blink_channels must have exactly 6 boolean values")
-        self._tinyfx  = TinyFX(init_wav=True, wav_root='/sounds')
+        self._wav_root = '/sounds'
+        self._sounds   = None # sound names by index, listed when first required
+        self._tinyfx  = TinyFX(init_wav=True, wav_root=self._wav_root)
         self._rgbled  = self._tinyfx.rgb
         self._playing = False
         # channel definitions
@@ -47,9 +58,8 @@ class TinyFxController(Controller):
         self._channel4_fx = self._get_channel(4, blink_channels[3])
         self._channel5_fx = self._get_channel(5, blink_channels[4])
         self._channel6_fx = self._get_channel(6, blink_channels[5])
-        # set up the effects to play
-        self._player = ManualPlayer(self._tinyfx.outputs)
-        self._player.effects = [
+        # channels indexed 0-5, used by binary commands
+        self._channels = [
             self._channel1_fx,
             self._channel2_fx,
             self._channel3_fx,
@@ -57,6 +67,9 @@ class TinyFxController(Controller):
             self._channel5_fx,
             self._channel6_fx
         ]
+        # set up the effects to play
+        self._player = ManualPlayer(self._tinyfx.outputs)
+        self._player.effects = self._channels
         # name map of channels (you can add aliases here)
         self._channel_map = {
             'ch1': self._channel1_fx,
@@ -76,6 +89,18 @@ class TinyFxController(Controller):
         self._pir_sensor    = PassiveInfrared()
         self._pir_triggered = False
         self._pir_enabled   = False # default disabled
+        # commands, routed by process(); a channel command without exactly
+        # one argument is unrecognised, other commands ignore extra arguments
+        self.add_command('all', self._set_all, state, mismatch='NACK')
+        for name, fx in self._channel_map.items():
+            self.add_command(name, fx.set, state, mismatch='NACK')
+        self.add_command('heartbeat', self._set_heartbeat, state, ignore_extra=True)
+        self.add_command('color',     self._set_color, word, min_args=0, ignore_extra=True)
+        self.add_command('play',      self._play_sound, text, ignore_extra=True)
+        self.add_command('respond',   self._respond, min_args=0, ignore_extra=True)
+        self.add_command('pir',       self._get_pir, ignore_extra=True)
+        self._router.remove('rand') # a command of the generic controller only
+        self._router.default = self._on_unrecognised
         self.play('arming-tone')
         # ready.
 
@@ -123,91 +148,127 @@ class TinyFxController(Controller):
     def process(self, cmd):
         '''
         Processes the callback from the I2C slave, returning 'ACK', 'NACK'
-        or 'ERR'. Data requests are for 'pir' and use three transactions, 
-        the first is followed by 'get' and then 'clear', somewhat arbitrary
-        tokens that return the previous response and then clear the buffer.
+        or 'ERR'. Data requests are for 'pir' and 'stats' and are answered
+        directly. The 'get' and 'clear' tokens are still accepted from older
+        masters that retrieve data over three transactions.
         '''
         try:
             print("cmd: '{}'".format(cmd))
-            parts = cmd.lower().split()
-            if len(parts) == 0:
+            return self._router.route(cmd)
+        except Exception as e:
+            print("ERROR: {} raised by tinyfx controller: {}".format(type(e), e))
+            return 'ERR'
+
+    def _set_all(self, on):
+        for fx in self._player.effects:
+            fx.set(on)
+        self._heartbeat_enabled = on
+        if not on:
+            self._set_color('black')
+
+    def _set_heartbeat(self, on):
+        self._heartbeat_enabled = on
+
+    def _respond(self, *args):
+        print('responded') # ignored
+
+    def _on_unrecognised(self, cmd):
+        print("unrecognised command: '{}' (ignored)".format(cmd))
+        return 'NACK'
+
+    def process_binary(self, payload):
+        '''
+        Processes a binary command from the I2C slave, returning 'ACK',
+        'NACK' or 'ERR'. The payload is an opcode byte followed by its
+        operands, as defined in opcodes.py. Unlike process(), this does not
+        create any strings, so it is suited to high command rates.
+        '''
+        try:
+            if not operands_valid(payload):
                 return 'ERR'
-            _command = parts[0]
-            _action  = parts[1] if len(parts) > 1 else None
-            _value   = parts[2] if len(parts) > 2 else None
-            if _command in ['all', 'ch1', 'ch2', 'ch3', 'ch4', 'ch5', 'ch6'] and len(parts) == 2:
-                print('action: {}'.format(_action))
-                if _command == 'all':
-                    if _action == 'on':
-                        for fx in self._player.effects:
-                            fx.set(True)
-                        self._heartbeat_enabled = True
-                    elif _action == 'off':
-                        for fx in self._player.effects:
-                            fx.set(False)
-                        self._heartbeat_enabled = False
-                        self._show_color('color black')
-                    else:
-                        return 'ERR'
-                else:
-                    fx = self._channel_map[_command]
-                    if _action == 'on':
-                        fx.set(True)
-                    elif _action == 'off':
-                        fx.set(False)
-                    else:
-                        return 'ERR'
-            elif _command == "heartbeat":
-                if _action == 'on':
-                    self._heartbeat_enabled = True
-                elif _action == 'off':
-                    self._heartbeat_enabled = False
+            opcode = payload[0]
+            if opcode == OP_CHANNEL:
+                channel = payload[1]
+                state   = payload[2] != 0
+                if channel == 0:
+                    for fx in self._channels:
+                        fx.set(state)
+                    self._heartbeat_enabled = state
+                    if not state:
+                        self._rgbled.set_rgb(0, 0, 0)
+                elif channel <= 6:
+                    self._channels[channel - 1].set(state)
                 else:
                     return 'ERR'
-            elif _command == "color":
+            elif opcode == OP_HEARTBEAT:
+                self._heartbeat_enabled = payload[1] != 0
+            elif opcode == OP_COLOR:
                 self._heartbeat_enabled = False
-                self._show_color(cmd)
-            elif _command == "play":
-                self.play(cmd)
-            elif _command == "respond":
-                print('responded')
-                pass # ignored
-            elif _command == "pir":
-                print('PIR')
+                self._rgbled.set_rgb(payload[1], payload[2], payload[3])
+            elif opcode == OP_PIR:
                 return self._get_pir()
-            elif _command == "get":
-                return 'ACK' # called on 2nd request for data
-            elif _command == "clear":
-                return 'ACK' # called on 3rd request for data
-            else:
-                print("unrecognised command: '{}' (ignored)".format(_command))
+            elif opcode != OP_PING:
                 return 'NACK'
             return 'ACK'
         except Exception as e:
             print("ERROR: {} raised by tinyfx controller: {}".format(type(e), e))
             return 'ERR'
 
+    def on_registers(self, registers, changed):
+        '''
+        Applies the state registers changed in register-mapped mode: a
+        channel's register sets its brightness (0 being off), the RGB
+        registers the color, the heartbeat register enables or disables
+        it, and the sound register plays the sound of that index (1 being
+        the first WAV file in the sounds directory, in alphabetical order).
+        '''
+        if changed & CHANNEL_MASK:
+            for i in range(6):
+                if changed & (1 << (REG_CH1 + i)):
+                    value = registers[REG_CH1 + i]
+                    fx = self._channels[i]
+                    if value:
+                        fx.brightness = value / 255
+                    fx.set(value != 0)
+        if changed & HEARTBEAT_MASK:
+            self._heartbeat_enabled = registers[REG_HEARTBEAT] != 0
+        if changed & COLOR_MASK:
+            self._heartbeat_enabled = False
+            self._rgbled.set_rgb(registers[REG_RED], registers[REG_GREEN], registers[REG_BLUE])
+        if changed & SOUND_MASK and registers[REG_SOUND]:
+            if self._sounds is None:
+                self._sounds = sorted(name[:-4] for name in os.listdir(self._wav_root) if name.endswith('.wav'))
+            index = registers[REG_SOUND] - 1
+            if index >= len(self._sounds):
+                raise ValueError('no sound at index {}'.format(index + 1))
+            self._play_sound(self._sounds[index])
+
     def play(self, cmd):
-        print("playing sound for command: {}".format(cmd))
+        '''
+        Plays the sound named by the command string, either 'play [name]'
+        or the name alone.
+        '''
+        parts = cmd.split()
+        self._play_sound(parts[1] if len(parts) > 1 else cmd)
+
+    def _play_sound(self, sound_name):
+        print("playing sound: {}…".format(sound_name))
         try:
             self._playing = True
-            parts = cmd.split()
-            if len(parts) < 2:
-                sound_name = cmd
-            else:
-                sound_name = parts[1]
-            print('playing: {}…'.format(sound_name))
             file_name = '{}.wav'.format(sound_name)
             self._tinyfx.wav.play_wav(file_name)
         finally:
             self._playing = False
 
-    def _show_color(self, cmd):
-        parts = cmd.split()
-        if len(parts) < 2:
+    def _set_color(self, color_name):
+        '''
+        Sets the RGB LED to the named color (see colors.py), disabling the
+        heartbeat.
+        '''
+        self._heartbeat_enabled = False
+        if color_name is None:
             print("ERROR: show color command missing color name.")
             return
-        color_name = parts[1]
         color = get_color_by_name(color_name)
         if color:
             print('showing color: {}…'.format(color.description))
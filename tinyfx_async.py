@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# An asyncio client for the TinyFX I2C target, for use from asyncio-based
+# control stacks in place of the blocking functions of tinyfx_ctrl.py.
+
+import os, sys
+import asyncio
+import smbus2
+from concurrent.futures import ThreadPoolExecutor
+
+# add ./tinyfx/ to sys.path
+if os.path.isdir("tinyfx") and "tinyfx" not in sys.path:
+    sys.path.insert(0, "tinyfx")
+
+from tinyfx.message_util import pack_message, unpack_message
+from tinyfx_ctrl import i2c_write, response_extent, encode_command, readiness
+
+# ┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈
+
+READ_CHUNK = 32 # the maximum length of an SMBus block read
+
+class AsyncTinyFxClient:
+    '''
+    An asyncio client for the TinyFX. Commands are placed on a queue and
+    performed in order by a single background worker that owns the bus,
+    so any number of coroutines may send commands concurrently without
+    interleaving their transactions. The blocking bus calls are made on a
+    single dedicated thread and all delays are non-blocking, so the event
+    loop is never blocked.
+
+    Usage:
+
+        async with AsyncTinyFxClient() as tinyfx:
+            await tinyfx.send('ch1 on')
+            pir = await tinyfx.query('pir')
+
+    Args:
+        bus_number:    the I2C bus number, used if no bus is provided
+        address:       the I2C address of the target
+        bus:           an optional open SMBus instance, which is not closed on stop
+        queue_size:    the maximum number of pending commands (0 is unlimited)
+        poller:        the ReadinessPoller used while a response is pending,
+                       by default that of tinyfx_ctrl
+    '''
+    def __init__(self, bus_number=1, address=0x43, bus=None, queue_size=32, poller=None):
+        self._bus_number    = bus_number
+        self._address       = address
+        self._bus           = bus
+        self._owns_bus      = bus is None
+        self._queue_size    = queue_size
+        self._poller        = poller or readiness
+        self._queue    = None
+        self._worker   = None
+        self._executor = None
+
+    @property
+    def address(self):
+        return self._address
+
+    @property
+    def pending(self):
+        '''
+        The number of commands waiting to be performed.
+        '''
+        return self._queue.qsize() if self._queue else 0
+
+    async def start(self):
+        '''
+        Open the bus (if not provided) and start the background worker.
+        '''
+        if self._worker:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tinyfx-i2c')
+        if self._bus is None:
+            self._bus = await self._run(smbus2.SMBus, self._bus_number)
+        self._queue  = asyncio.Queue(self._queue_size)
+        self._worker = asyncio.get_running_loop().create_task(self._work())
+
+    async def stop(self):
+        '''
+        Perform any commands already queued, then stop the background
+        worker and close the bus (if opened by this client).
+        '''
+        if not self._worker:
+            return
+        await self._queue.put(None)
+        await self._worker
+        self._worker = None
+        if self._owns_bus:
+            await self._run(self._bus.close)
+            self._bus = None
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def send(self, message, binary=False):
+        '''
+        Send a command (an ASCII string or binary payload) and return its
+        response, typically 'ACK'. If binary is True, a command string with
+        a binary equivalent is sent in its binary form.
+        '''
+        if binary and isinstance(message, str):
+            payload = encode_command(message)
+            if payload is not None:
+                message = payload
+        return await self._submit(pack_message(message))
+
+    async def query(self, message):
+        '''
+        Send a data request (e.g., 'pir') and return the data.
+        '''
+        return await self._submit(pack_message(message))
+
+    async def _submit(self, packed):
+        if not self._worker:
+            raise RuntimeError('client not started.')
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((packed, future))
+        return await future
+
+    async def _work(self):
+        '''
+        The background worker, performing each queued command in turn.
+        '''
+        while True:
+            item = await self._queue.get()
+            try:
+                if item is None:
+                    return
+                packed, future = item
+                if future.cancelled():
+                    continue
+                try:
+                    response = await self._transact(packed)
+                except Exception as e:
+                    if not future.cancelled():
+                        future.set_exception(e)
+                else:
+                    if not future.cancelled():
+                        future.set_result(response)
+            finally:
+                self._queue.task_done()
+
+    async def _transact(self, packed):
+        '''
+        Write the packed message and read its response, polling while the
+        response is pending.
+        '''
+        await self._run(i2c_write, self._bus, self._address, packed)
+        wait = self._poller.delays()
+        for delay in wait:
+            if delay:
+                await asyncio.sleep(delay)
+            resp_buf = await self._run(self._bus.read_i2c_block_data, self._address, 0, READ_CHUNK)
+            extent = response_extent(resp_buf)
+            if extent is not None:
+                wait.ready()
+                start, length = extent
+                chunk = 1
+                while start + length > len(resp_buf):
+                    # a long response: read the next chunk, selected by register
+                    resp_buf += await self._run(self._bus.read_i2c_block_data, self._address, chunk, READ_CHUNK)
+                    chunk += 1
+                return unpack_message(bytes(resp_buf[start:start+length]))
+        raise RuntimeError("slave not ready.")
+
+    def _run(self, func, *args):
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+# ┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈
+
+async def _demo():
+    '''
+    Two coroutines driving the TinyFX concurrently: one blinking channel 1,
+    the other polling the PIR sensor.
+    '''
+    async with AsyncTinyFxClient() as tinyfx:
+        async def blink():
+            for i in range(10):
+                print('ch1: {}'.format(await tinyfx.send('ch1 on' if i % 2 == 0 else 'ch1 off', binary=True)))
+                await asyncio.sleep(0.5)
+        async def poll_pir():
+            for _ in range(10):
+                print('pir: {}'.format(await tinyfx.query('pir')))
+                await asyncio.sleep(0.5)
+        await asyncio.gather(blink(), poll_pir())
+
+if __name__ == '__main__':
+    try:
+        asyncio.run(_demo())
+    except KeyboardInterrupt:
+        print('Ctrl-C caught, exiting…')
+
+#EOF
@@ -1,49 +1,211 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 #
-# Copyright 2020-2025 by Ichiro Furusato. All rights reserved. This file is part
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
 # of the Robot Operating System project, released under the MIT License. Please
 # see the LICENSE file included as part of this package.
 #
 # author:   Ichiro Furusato
 # created:  2025-11-16
-# modified: 2025-11-22
+# modified: 2026-10-16
 
 import os, sys
 import time
 import smbus2
+from smbus2 import i2c_msg
 import traceback
+import threading
+from collections import deque
 
 # add ./tinyfx/ to sys.path
 if os.path.isdir("tinyfx") and "tinyfx" not in sys.path:
     sys.path.insert(0, "tinyfx")
 
-from tinyfx.message_util import pack_message, unpack_message
+from tinyfx.message_util import (pack_message, pack_batch, unpack_message, unpack_payload,
+                                 split_request_id)
+from tinyfx.opcodes import (OP_PING, OP_CHANNEL, OP_HEARTBEAT, OP_COLOR, OP_PIR,
+                            OP_BATCH, OP_FETCH, STATUS_ACK, STATUS_NACK, STATUS_ERR,
+                            RESPONSE_READY)
+from tinyfx.dispatcher import RESPONSE_TABLE_SIZE, RECEIVE_QUEUE_SIZE
+from tinyfx.registers import REGISTER_COUNT
+from tinyfx.colors import get_color_by_name
 
 # ┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈
 
 __I2C_BUS  = 1      # the I2C bus number; on a Raspberry Pi the default is 1
 __I2C_ADDR = 0x43   # the I2C address used to connect to the TinyFX
 
-def i2c_write_and_read(bus, address, out_msg):
-    bus.write_i2c_block_data(address, 0, list(out_msg))
-    time.sleep(0.002)
-    for _ in range(2):
-        resp_buf = bus.read_i2c_block_data(address, 0, 32)
-        # auto-detect and extract the real message
-        if resp_buf and resp_buf[0] == 0 and len(resp_buf) > 2:
-            # skip first byte, interpret the second as length
-            msg_len = resp_buf[1]
-            if 1 <= msg_len < 32:
-                resp_bytes = bytes(resp_buf[1:1+msg_len+2])
-                return resp_bytes
-        else:
-            msg_len = resp_buf[0]
-            if 1 <= msg_len < 32:
-                resp_bytes = bytes(resp_buf[:msg_len+2])
-                return resp_bytes
-        time.sleep(0.003)
-    raise RuntimeError("bad message length or slave not ready.")
+__READ_CHUNK = 32 # the maximum length of an SMBus block read
+__BLOCK_MAX  = 32 # the maximum length of an SMBus block write
+
+class ReadinessPoller:
+    '''
+    Waits for the target's response to become ready, polling its status
+    byte with a bounded exponential backoff: the first poll is immediate,
+    then the delay between polls doubles from initial_delay_s up to
+    max_delay_s, until the deadline has passed.
+
+    The time from the start of waiting to each response is recorded, so
+    that the delays and deadline may be tuned for a deployment; see
+    stats(). The most recent samples are retained for percentiles.
+
+    Each wait holds its own start time and backoff state (see delays()),
+    so one poller may be shared by several clients polling at once; only
+    the stats are shared.
+
+    Args:
+        initial_delay_s: the delay before the second poll
+        max_delay_s:     the maximum delay between polls
+        deadline_s:      the time after which the target is deemed not ready
+        samples:         the number of recent times to response retained
+    '''
+    def __init__(self, initial_delay_s=0.0002, max_delay_s=0.005, deadline_s=0.5, samples=1000):
+        self.initial_delay_s = initial_delay_s
+        self.max_delay_s     = max_delay_s
+        self.deadline_s      = deadline_s
+        self._samples = deque(maxlen=samples)
+        self._lock    = threading.Lock()
+        self.reset_stats()
+
+    def delays(self):
+        '''
+        Start a wait, returning an iterator of the delay to sleep before
+        each successive poll, the first being zero, until the deadline has
+        passed. Call its ready() once the response is ready, e.g.:
+
+            wait = poller.delays()
+            for delay in wait:
+                ...
+                wait.ready()
+        '''
+        return _Wait(self)
+
+    def _record(self, elapsed_ms):
+        with self._lock:
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            self._samples.append(elapsed_ms)
+
+    def _timed_out(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def reset_stats(self):
+        with self._lock:
+            self.count    = 0
+            self.timeouts = 0
+            self.total_ms = 0.0
+            self.max_ms   = 0.0
+            self._samples.clear()
+
+    def stats(self):
+        '''
+        Return a dict of the time to response: the number of responses and
+        timeouts, and the mean, p50, p99 and maximum times in milliseconds.
+        '''
+        with self._lock:
+            samples = sorted(self._samples)
+        def percentile(percent):
+            return samples[min(len(samples) - 1, int(percent / 100.0 * len(samples)))] if samples else 0.0
+        return {
+            'count':    self.count,
+            'timeouts': self.timeouts,
+            'mean_ms':  self.total_ms / self.count if self.count else 0.0,
+            'p50_ms':   percentile(50),
+            'p99_ms':   percentile(99),
+            'max_ms':   self.max_ms
+        }
+
+class _Wait:
+    '''
+    A single wait of a ReadinessPoller, iterating over the delays before
+    each poll. Its start time and backoff are its own.
+    '''
+    def __init__(self, poller):
+        self._poller   = poller
+        self._start    = time.perf_counter()
+        self._deadline = self._start + poller.deadline_s
+        self._delay    = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._delay is None:
+            self._delay = 0.0
+            return self._delay
+        now = time.perf_counter()
+        if now >= self._deadline:
+            self._poller._timed_out()
+            raise StopIteration
+        poller = self._poller
+        self._delay = min(poller.max_delay_s, max(poller.initial_delay_s, self._delay * 2), self._deadline - now)
+        return self._delay
+
+    def ready(self):
+        '''
+        Record the time to response of this wait.
+        '''
+        self._poller._record((time.perf_counter() - self._start) * 1000.0)
+
+# the default poller, whose settings and stats apply to all functions not passed a poller
+readiness = ReadinessPoller()
+
+def i2c_write(bus, address, out_msg):
+    '''
+    Write the packed message to the target. A message longer than an SMBus
+    block write (32 bytes), e.g., a large batch, is written as a single raw
+    I2C write, so that it still arrives in one transaction.
+    '''
+    if len(out_msg) <= __BLOCK_MAX:
+        bus.write_i2c_block_data(address, 0, list(out_msg))
+    else:
+        bus.i2c_rdwr(i2c_msg.write(address, bytes([0]) + bytes(out_msg)))
+
+def i2c_write_and_read(bus, address, out_msg, poller=None):
+    '''
+    Write the packed message and read the packed response to it. While the
+    target is processing the message its response is marked pending, so
+    this polls until the response is ready.
+    '''
+    i2c_write(bus, address, out_msg)
+    return i2c_read_response(bus, address, poller)
+
+def i2c_read_response(bus, address, poller=None):
+    '''
+    Read the packed response currently held by the target, polling while
+    it is pending. A response longer than a single block read is read in
+    further block reads, each selecting the next chunk of the response by
+    its register address.
+    '''
+    wait = (poller or readiness).delays()
+    for delay in wait:
+        if delay:
+            time.sleep(delay)
+        resp_buf = bus.read_i2c_block_data(address, 0, __READ_CHUNK)
+        extent = response_extent(resp_buf)
+        if extent is not None:
+            wait.ready()
+            start, length = extent
+            if start + length > len(resp_buf):
+                resp_buf = list(resp_buf)
+                chunk = 1
+                while start + length > len(resp_buf):
+                    resp_buf.extend(bus.read_i2c_block_data(address, chunk, __READ_CHUNK))
+                    chunk += 1
+            return bytes(resp_buf[start:start+length])
+    raise RuntimeError("slave not ready.")
+
+def response_extent(resp_buf):
+    '''
+    Return a tuple of the offset and length of the packed response within
+    the block read from the target (the length may exceed that of the
+    block), or None if the response is still pending.
+    '''
+    if resp_buf[0] != RESPONSE_READY:
+        return None
+    return 1, resp_buf[1] + 2
 
 def send_and_receive(bus, address, message):
     '''
@@ -61,29 +223,203 @@ def send_and_receive_data(bus, address, message):
     Send a message and return the response as data.
 
     If the original message begins with a '!' character this is treated as a data
-    request, causing three transactions to occur. The first sends the message but
-    its response is thrown away, as it will be an ACK. The second retrieves the
-    data, and the third clears the buffer.
-
-    This is due to a requirement on slave IRQ processing that limits the ability
-    to return the status of the current transaction (meaning the response returned
-    is always from the previous transaction).
+    request. Since the target marks its response as pending until it has processed
+    the message, the response returned is that of this request, so only a single
+    write and read (polling while pending) is required.
     '''
     try:
-        data_request_bytes = i2c_write_and_read(bus, address, pack_message(message))
-#       print("throwaway message: '{}'".format(unpack_message(data_request_bytes)))
-        time.sleep(0.005)
-        response_bytes = i2c_write_and_read(bus, address, pack_message('get')) # same message but really arbitrary
-        data_response = unpack_message(response_bytes)
-#       print("response: '{}'".format(data_response))
-        time.sleep(0.005)
-        clear_bytes = i2c_write_and_read(bus, address, pack_message('clear'))
-#       print("cleanup message: '{}'".format(unpack_message(clear_bytes)))
-        return data_response
+        return unpack_message(i2c_write_and_read(bus, address, pack_message(message)))
     except Exception as e:
         print('{} raised sending and receiving data message: {}\n{}'.format(type(e), e, traceback.format_exc()))
         return None
 
+def send_batch(bus, address, messages, binary=True):
+    '''
+    Send a list of command strings as a single batch message, which the
+    target applies together, returning a list containing the status
+    ('ACK', 'NACK' or 'ERR') of each command, or None upon failure.
+    A batch too large for a single message raises a ValueError.
+
+    If binary is True, commands with a binary equivalent are sent in
+    their binary form.
+    '''
+    payloads = []
+    for message in messages:
+        payload = encode_command(message) if binary else None
+        payloads.append(payload if payload is not None else message)
+    packed = pack_batch(payloads)
+    try:
+        response = unpack_payload(i2c_write_and_read(bus, address, packed))
+        if len(response) != len(messages) + 1 or response[0] != OP_BATCH:
+            raise ValueError('unexpected batch response: {}'.format(response))
+        names = { STATUS_ACK: 'ACK', STATUS_NACK: 'NACK', STATUS_ERR: 'ERR' }
+        return [ names.get(status, 'ERR') for status in response[1:] ]
+    except Exception as e:
+        print('{} raised sending batch: {}\n{}'.format(type(e), e, traceback.format_exc()))
+        return None
+
+def encode_command(message):
+    '''
+    Encode an ASCII command string as a binary (opcode) payload, returning
+    None if the command has no binary equivalent (e.g., 'play').
+    '''
+    parts = message.lower().split()
+    if len(parts) == 0:
+        return None
+    _command = parts[0]
+    _action  = parts[1] if len(parts) > 1 else None
+    state = 1 if _action == 'on' else 0 if _action == 'off' else None
+    if _command == 'ping':
+        return bytes([OP_PING])
+    elif _command == 'pir':
+        return bytes([OP_PIR])
+    elif _command == 'all' and state is not None:
+        return bytes([OP_CHANNEL, 0, state])
+    elif _command in ['ch1', 'ch2', 'ch3', 'ch4', 'ch5', 'ch6'] and state is not None:
+        return bytes([OP_CHANNEL, int(_command[2]), state])
+    elif _command == 'heartbeat' and state is not None:
+        return bytes([OP_HEARTBEAT, state])
+    elif _command == 'color' and _action:
+        color = get_color_by_name(_action)
+        if color:
+            return bytes([OP_COLOR, *color])
+    return None
+
+def send_and_receive_binary(bus, address, message):
+    '''
+    Send a message encoded as a binary command and return the response.
+    Commands without a binary equivalent are sent as ASCII.
+    '''
+    try:
+        payload = encode_command(message)
+        response_bytes = i2c_write_and_read(bus, address, pack_message(payload if payload is not None else message))
+        return unpack_message(response_bytes)
+    except Exception as e:
+        print('{} raised sending and receiving binary message: {}\n{}'.format(type(e), e, traceback.format_exc()))
+        return None
+
+def write_registers(bus, address, register, values):
+    '''
+    Write one or more consecutive registers of a target in register-mapped
+    mode (see tinyfx/registers.py), e.g., write_registers(bus, 0x43, REG_CH1, [0xcc]).
+    The change is applied on the target's next frame; there is no response.
+    '''
+    bus.write_i2c_block_data(address, register, list(values))
+
+def read_registers(bus, address, register=0, length=REGISTER_COUNT):
+    '''
+    Read length consecutive registers of a target in register-mapped mode,
+    by default the entire register map, returning them as bytes.
+    '''
+    return bytes(bus.read_i2c_block_data(address, register, length))
+
+def benchmark(bus, address, messages=None, count=50):
+    '''
+    Send each message count times over both the ASCII and binary paths,
+    printing the mean round trip time and frame size of each.
+    '''
+    if messages is None:
+        messages = ['ch1 on', 'ch1 off', 'heartbeat off', 'color violet', 'color black']
+    for message in messages:
+        results = []
+        for name, send in (('ascii', send_and_receive), ('binary', send_and_receive_binary)):
+            start = time.perf_counter()
+            for _ in range(count):
+                send(bus, address, message)
+            elapsed_ms = (time.perf_counter() - start) * 1000.0 / count
+            results.append((name, elapsed_ms))
+        payload = encode_command(message)
+        print("{:<16} ascii: {:6.2f}ms ({:>2} bytes)   binary: {:6.2f}ms ({:>2} bytes)".format(
+                message, results[0][1], len(pack_message(message)),
+                results[1][1], len(pack_message(payload if payload is not None else message))))
+
+class PipelinedClient:
+    '''
+    Submits commands tagged with request IDs without waiting for each
+    response, permitting several commands to be in flight at once. Their
+    responses are matched to requests by ID and collected afterwards,
+    either from the target's current response or, if that belongs to a
+    later request, from the target's table of recent responses.
+
+    Args:
+        bus:        the SMBus instance
+        address:    the I2C address of the target
+        window:     the maximum number of requests in flight, no more than
+                    the number of messages the target can queue (7), as a
+                    busy target would otherwise drop the last of them
+        interval_s: the minimum delay between submissions; as the window
+                    never exceeds the target's queue, by default there is none
+    '''
+    def __init__(self, bus, address, window=4, interval_s=0.0):
+        max_window = min(RECEIVE_QUEUE_SIZE, RESPONSE_TABLE_SIZE)
+        if not 1 <= window <= max_window:
+            raise ValueError('window must be between 1 and {}'.format(max_window))
+        self._bus        = bus
+        self._address    = address
+        self._window     = window
+        self._interval_s = interval_s
+        self._next_id    = 1
+        self._in_flight  = [] # request IDs, oldest first
+        self._responses  = {} # request ID -> response, collected early
+        self._last_submit = 0.0
+
+    @property
+    def in_flight(self):
+        return len(self._in_flight)
+
+    def submit(self, message):
+        '''
+        Submit a command (an ASCII string or binary payload) without waiting
+        for its response, returning its request ID. If the window is full
+        the oldest response is collected first.
+        '''
+        if len(self._in_flight) >= self._window:
+            oldest = self._in_flight[0]
+            self._responses[oldest] = self.collect(oldest)
+        request_id = self._next_id
+        self._next_id = self._next_id % 255 + 1 # IDs 1-255
+        wait_s = self._last_submit + self._interval_s - time.perf_counter()
+        if wait_s > 0:
+            time.sleep(wait_s)
+        i2c_write(self._bus, self._address, pack_message(message, request_id=request_id))
+        self._last_submit = time.perf_counter()
+        self._in_flight.append(request_id)
+        return request_id
+
+    def collect(self, request_id):
+        '''
+        Return the response to the request as a string (or bytes, for a
+        binary response), or None if it is no longer available. If reading
+        the response raises an error the request remains in flight, so it
+        may be collected again.
+        '''
+        if request_id in self._responses:
+            return self._responses.pop(request_id)
+        if request_id not in self._in_flight:
+            raise ValueError('request {} not in flight'.format(request_id))
+        # the current response may already be the one we want
+        response_id, response = split_request_id(unpack_payload(i2c_read_response(self._bus, self._address)))
+        if response_id != request_id:
+            response_id, response = split_request_id(unpack_payload(
+                    i2c_write_and_read(self._bus, self._address, pack_message(bytes([OP_FETCH, request_id])))))
+        self._in_flight.remove(request_id)
+        if response_id != request_id:
+            return None
+        try:
+            return response.decode('ascii')
+        except UnicodeError:
+            return response
+
+    def drain(self):
+        '''
+        Collect the responses to all requests in flight, returning a
+        dict of request ID to response.
+        '''
+        responses = { request_id: self.collect(request_id) for request_id in list(self._in_flight) }
+        responses.update(self._responses)
+        self._responses.clear()
+        return responses
+
 def main():
     print('opening I2C bus {} to address {:#04x}'.format(__I2C_BUS, __I2C_ADDR))
     with smbus2.SMBus(__I2C_BUS) as bus:
@@ -94,10 +430,22 @@ def main():
                     break
                 if len(user_msg) == 0:
                     continue
+                if user_msg.strip().lower() == 'bench':
+                    benchmark(bus, __I2C_ADDR)
+                    continue
+                if user_msg.strip().lower() == 'timing': # time to response
+                    print('timing: {}'.format(readiness.stats()))
+                    continue
+                if ';' in user_msg: # e.g., "ch1 on; ch2 on; color red"
+                    statuses = send_batch(bus, __I2C_ADDR, [ m.strip() for m in user_msg.split(';') if m.strip() ])
+                    print('statuses: {}'.format(statuses))
+                    continue
                 data_request = user_msg.startswith('!')
                 if data_request:
                     user_msg = user_msg[1:]
                     response = send_and_receive_data(bus, __I2C_ADDR, user_msg)
+                elif user_msg.startswith('#'): # send as binary command
+                    response = send_and_receive_binary(bus, __I2C_ADDR, user_msg[1:])
                 else:
                     response = send_and_receive(bus, __I2C_ADDR, user_msg)
                 print('response: {}'.format(response))
@@ -1,13 +1,13 @@
 #!/micropython
 # -*- coding: utf-8 -*-
 #
-# Copyright 2020-2025 by Ichiro Furusato. All rights reserved. This file is part
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
 # of the Robot Operating System project, released under the MIT License. Please
 # see the LICENSE file included as part of this package.
 #
 # author:   Ichiro Furusato
 # created:  2025-01-16
-# modified: 2025-01-22
+# modified: 2026-10-16
 #
 # TinyFX I2C Master Control for MicroPython
 #
@@ -25,8 +25,9 @@ import sys
 import time
 from machine import I2C, Pin
 
-# be sure to copy both message_util.py and crc8_table.py to the microcontroller
+# be sure to copy message_util.py, opcodes.py, crc8_util.py and crc8_table.py to the microcontroller
 from message_util import pack_message, unpack_message
+from opcodes import RESPONSE_READY
 
 # auto-clear: remove cached modules to force reload
 for mod in ['main']:
@@ -41,9 +42,14 @@ __I2C_SCL_PIN = 9       # GPIO pin for SCL
 __I2C_SDA_PIN = 8       # GPIO pin for SDA
 __I2C_FREQ    = 100000  # I2C frequency (100kHz)
 __I2C_ADDR    = 0x43    # TinyFX I2C address
+__POLL_INITIAL_DELAY_US = 200    # the delay before the second poll of a pending response
+__POLL_MAX_DELAY_US     = 5000   # the maximum delay between polls
+__POLL_DEADLINE_US      = 500000 # the time after which the slave is deemed not ready
 
 # global I2C instance
 _i2c = None
+# time to response
+_timing = { 'count': 0, 'timeouts': 0, 'total_us': 0, 'max_us': 0 }
 
 def _get_i2c():
     '''
@@ -61,47 +67,60 @@ def _get_i2c():
 
 def i2c_write_and_read(i2c, address, message):
     '''
-    Write a message to the I2C slave and read the response.
+    Write a message to the I2C slave and read the response, polling while
+    the slave's response is pending, with a bounded exponential backoff
+    until the deadline. The time to response is recorded in _timing.
     '''
     out_msg = pack_message(message)
     out_msg = bytearray([0]) + out_msg # changed for mcu-based communication
     i2c.writeto(address, out_msg)
-    time.sleep_ms(2)
-    for _ in range(2):
-        resp_buf = bytearray(32)
+    start = time.ticks_us()
+    delay_us = 0
+    resp_buf = bytearray(32)
+    while True:
+        if delay_us:
+            time.sleep_us(delay_us)
         i2c.readfrom_into(address, resp_buf)
-        # auto-detect and extract the real message
-        if resp_buf[0] == 0 and len(resp_buf) > 2:
-            # skip first byte, interpret the second as length
+        if resp_buf[0] == RESPONSE_READY:
             msg_len = resp_buf[1]
-            if 1 <= msg_len < 32:
-                resp_bytes = bytes(resp_buf[1:1+msg_len+2])
-                return unpack_message(resp_bytes)
-        else:
-            msg_len = resp_buf[0]
-            if 1 <= msg_len < 32:
-                resp_bytes = bytes(resp_buf[:msg_len+2])
-                return unpack_message(resp_bytes)
-        time.sleep_ms(3)
-    raise RuntimeError("bad message length or slave not ready.")
+            if 1 + msg_len + 2 > len(resp_buf):
+                # a long response: read it again in full
+                resp_buf = bytearray(1 + msg_len + 2)
+                i2c.readfrom_into(address, resp_buf)
+            _record_timing(time.ticks_diff(time.ticks_us(), start))
+            return unpack_message(bytes(resp_buf[1:1+msg_len+2]))
+        elapsed_us = time.ticks_diff(time.ticks_us(), start)
+        if elapsed_us >= __POLL_DEADLINE_US:
+            _timing['timeouts'] += 1
+            raise RuntimeError("slave not ready.")
+        delay_us = min(__POLL_MAX_DELAY_US, max(__POLL_INITIAL_DELAY_US, delay_us * 2), __POLL_DEADLINE_US - elapsed_us)
+
+def _record_timing(elapsed_us):
+    _timing['count'] += 1
+    _timing['total_us'] += elapsed_us
+    _timing['max_us'] = max(_timing['max_us'], elapsed_us)
+
+def timing():
+    '''
+    Return a dict of the time to response: the number of responses and
+    timeouts, and the mean and maximum times in microseconds.
+    '''
+    result = dict(_timing)
+    result['mean_us'] = _timing['total_us'] // _timing['count'] if _timing['count'] else 0
+    return result
 
 def send(message):
     '''
-    Send a command to the TinyFX slave and get result.
+    Send a command to the TinyFX slave and return its response.
     '''
     i2c = _get_i2c()
-    # Step 1: Send command, get ACK/ERR
-    ack = i2c_write_and_read(i2c, __I2C_ADDR, message)
-    print('acknowledgment: {}'.format(ack))
-    # Step 2: Get result
-    time.sleep_ms(2)
-    result = i2c_write_and_read(i2c, __I2C_ADDR, "RESPOND")
-    print('result: {}'.format(result))
-    return (ack, result)
+    response = i2c_write_and_read(i2c, __I2C_ADDR, message)
+    print('response: {}'.format(response))
+    return response
 
 # print usage instructions on import
 print("\nTinyFX I2C Master Control")
-print("\nready for:  send('command')")
+print("\nready for:  send('command')  or  timing()")
 print()
 
 #EOF
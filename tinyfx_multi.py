@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# Controls several TinyFX targets sharing one I2C bus, individually, by group,
+# or all at once.
+
+import os, sys
+import time
+import smbus2
+import traceback
+
+# add ./tinyfx/ to sys.path
+if os.path.isdir("tinyfx") and "tinyfx" not in sys.path:
+    sys.path.insert(0, "tinyfx")
+
+from tinyfx.message_util import pack_message, unpack_message
+from tinyfx_ctrl import i2c_write, i2c_write_and_read, i2c_read_response, encode_command
+
+# ┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈
+
+__I2C_BUS   = 1                         # the I2C bus number; on a Raspberry Pi the default is 1
+__I2C_ADDRS = [ 0x43, 0x44, 0x45, 0x46 ] # the I2C addresses of the TinyFX boards
+
+class LatencyStats:
+    '''
+    Accumulates the round trip latency of transactions with one target.
+    '''
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count  = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+
+    def record(self, elapsed_ms):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.min_ms = elapsed_ms if self.min_ms is None else min(self.min_ms, elapsed_ms)
+        self.max_ms = elapsed_ms if self.max_ms is None else max(self.max_ms, elapsed_ms)
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.count if self.count else 0.0
+
+    def __str__(self):
+        if not self.count:
+            return 'no transactions ({} errors)'.format(self.errors)
+        return '{:>5} transactions   mean {:6.2f}ms   min {:6.2f}ms   max {:6.2f}ms   ({} errors)'.format(
+                self.count, self.mean_ms, self.min_ms, self.max_ms, self.errors)
+
+class TinyFxManager:
+    '''
+    Manages several TinyFX targets sharing one I2C bus, each at its own
+    address. A target may be addressed individually by address or name,
+    or together with others by group name.
+
+    Sending to a group (or broadcasting to all targets) writes the message
+    to each target back-to-back, without waiting for any responses; each
+    target marks its response pending and processes the message at the
+    same time as the others. The responses are then read in turn, polling
+    only while one is still pending. The cost of a group is therefore
+    close to that of its slowest target rather than the sum of them all.
+
+    The latency of each target's transactions (from its write to reading
+    its response) is recorded, as is that of each group send.
+
+    Args:
+        bus:        the SMBus instance
+        addresses:  an optional list of target addresses to add
+    '''
+    def __init__(self, bus, addresses=None):
+        self._bus     = bus
+        self._devices = {} # address -> name
+        self._names   = {} # name -> address
+        self._groups  = {} # group name -> list of addresses
+        self._stats   = {} # address -> LatencyStats
+        self._group_stats = LatencyStats()
+        for address in addresses or []:
+            self.add_device(address)
+
+    @property
+    def addresses(self):
+        return list(self._devices)
+
+    @property
+    def groups(self):
+        return dict(self._groups)
+
+    def add_device(self, address, name=None, groups=()):
+        '''
+        Add the target at the address, optionally naming it and adding
+        it to the named groups.
+        '''
+        if address in self._devices:
+            raise ValueError('device {:#04x} already added.'.format(address))
+        self._devices[address] = name
+        if name:
+            self._names[name] = address
+        self._stats[address] = LatencyStats()
+        for group in groups:
+            self.add_to_group(group, address)
+
+    def add_to_group(self, group, *targets):
+        '''
+        Add the targets (addresses or names) to the named group.
+        '''
+        members = self._groups.setdefault(group, [])
+        for target in targets:
+            address = self._resolve(target)
+            if address not in members:
+                members.append(address)
+
+    def send(self, target, message, binary=False):
+        '''
+        Send a message to a single target (address or name) and return its
+        response, or None upon failure. If binary is True, a command with a
+        binary equivalent is sent in its binary form.
+        '''
+        address = self._resolve(target)
+        start = time.perf_counter()
+        try:
+            response = unpack_message(i2c_write_and_read(self._bus, address, self._pack(message, binary)))
+            self._stats[address].record((time.perf_counter() - start) * 1000.0)
+            return response
+        except Exception as e:
+            self._stats[address].errors += 1
+            print('{} raised sending to {:#04x}: {}\n{}'.format(type(e), address, e, traceback.format_exc()))
+            return None
+
+    def send_group(self, group, message, binary=False):
+        '''
+        Send a message to each target in the named group, returning a dict
+        of address to response (None upon failure).
+        '''
+        if group not in self._groups:
+            raise ValueError('no such group: {}'.format(group))
+        return self._send_all(self._groups[group], message, binary)
+
+    def broadcast(self, message, binary=False):
+        '''
+        Send a message to all targets, returning a dict of address to
+        response (None upon failure).
+        '''
+        return self._send_all(list(self._devices), message, binary)
+
+    def stats(self):
+        '''
+        Return a dict of address to the LatencyStats of that target.
+        '''
+        return dict(self._stats)
+
+    @property
+    def group_stats(self):
+        '''
+        The LatencyStats of group sends and broadcasts, as a whole.
+        '''
+        return self._group_stats
+
+    def reset_stats(self):
+        for stats in self._stats.values():
+            stats.reset()
+        self._group_stats.reset()
+
+    def print_stats(self):
+        for address, stats in self._stats.items():
+            name = self._devices[address]
+            print('{:#04x} {:<10} {}'.format(address, name if name else '', stats))
+        print('{:<15} {}'.format('group sends', self._group_stats))
+
+    def _send_all(self, addresses, message, binary):
+        packed = self._pack(message, binary)
+        responses = {}
+        started = {}
+        group_start = time.perf_counter()
+        # write to every target back-to-back, without waiting
+        for address in addresses:
+            try:
+                started[address] = time.perf_counter()
+                i2c_write(self._bus, address, packed)
+            except Exception as e:
+                self._stats[address].errors += 1
+                responses[address] = None
+                print('{} raised writing to {:#04x}: {}'.format(type(e), address, e))
+        # then collect each response, polling only while pending
+        for address in addresses:
+            if address in responses:
+                continue
+            try:
+                responses[address] = unpack_message(i2c_read_response(self._bus, address))
+                self._stats[address].record((time.perf_counter() - started[address]) * 1000.0)
+            except Exception as e:
+                self._stats[address].errors += 1
+                responses[address] = None
+                print('{} raised reading from {:#04x}: {}'.format(type(e), address, e))
+        self._group_stats.record((time.perf_counter() - group_start) * 1000.0)
+        return responses
+
+    def _pack(self, message, binary):
+        if binary and isinstance(message, str):
+            payload = encode_command(message)
+            if payload is not None:
+                return pack_message(payload)
+        return pack_message(message)
+
+    def _resolve(self, target):
+        '''
+        Return the address of the target, given its address or name.
+        '''
+        if target in self._names:
+            return self._names[target]
+        if target in self._devices:
+            return target
+        raise ValueError('no such device: {}'.format(target))
+
+def main():
+    '''
+    A command line sending each command to all targets. Prefix a command
+    with an address to send it to a single target (e.g., "0x44 ch1 on");
+    "stats" prints the latency of each target.
+    '''
+    print('opening I2C bus {} to addresses {}'.format(__I2C_BUS, ', '.join('{:#04x}'.format(a) for a in __I2C_ADDRS)))
+    with smbus2.SMBus(__I2C_BUS) as bus:
+        manager = TinyFxManager(bus, __I2C_ADDRS)
+        try:
+            while True:
+                user_msg = input('Enter command string to send ("quit" to exit): ').strip()
+                if user_msg.lower() == 'quit':
+                    break
+                if len(user_msg) == 0:
+                    continue
+                if user_msg.lower() == 'stats':
+                    manager.print_stats()
+                    continue
+                parts = user_msg.split(None, 1)
+                if parts[0].lower().startswith('0x') and len(parts) == 2:
+                    print('response: {}'.format(manager.send(int(parts[0], 16), parts[1], binary=True)))
+                else:
+                    for address, response in manager.broadcast(user_msg, binary=True).items():
+                        print('{:#04x}: {}'.format(address, response))
+        except KeyboardInterrupt:
+            print('Ctrl-C caught, exiting…')
+        except Exception as e:
+            print('error: {}'.format(e))
+
+if __name__ == '__main__':
+    main()
+
+#EOF
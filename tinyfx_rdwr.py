@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020-2026 by Ichiro Furusato. All rights reserved. This file is part
+# of the Robot Operating System project, released under the MIT License. Please
+# see the LICENSE file included as part of this package.
+#
+# author:   Ichiro Furusato
+# created:  2026-10-16
+# modified: 2026-10-16
+#
+# An optional fast transport for tinyfx_ctrl.py using the Linux i2c-dev I2C_RDWR
+# ioctl, performing a write and read as a single combined (repeated start)
+# transfer.
+
+import os, sys
+import time
+from ctypes import create_string_buffer, cast, POINTER, c_char
+from fcntl import ioctl
+from smbus2 import i2c_msg
+from smbus2.smbus2 import i2c_rdwr_ioctl_data, I2C_RDWR, I2C_M_RD
+
+# add ./tinyfx/ to sys.path
+if os.path.isdir("tinyfx") and "tinyfx" not in sys.path:
+    sys.path.insert(0, "tinyfx")
+
+from tinyfx.message_util import pack_message, unpack_message
+from tinyfx_ctrl import response_extent, encode_command, readiness
+
+# ┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈┈
+
+MAX_FRAME_LEN = 257 # [length][255 byte payload][crc8]
+
+class RdwrTransport:
+    '''
+    Writes a message and reads its response as a single I2C_RDWR ioctl,
+    a write followed by a repeated start and read, rather than two SMBus
+    calls separated by a fixed sleep. If the response is still pending
+    it is polled for with read-only transfers, with the same backoff as
+    tinyfx_ctrl.py. A response longer than
+    read_len is read again in a single transfer of exactly its length,
+    as i2c-dev is not limited to the 32 byte SMBus block.
+
+    The ioctl structures and the write and read buffers are allocated
+    once. A transaction copies the frame into the write buffer through a
+    memoryview, with no intermediate copy. Beyond the returned response
+    it allocates only the small memoryview slices of the buffers.
+
+    Args:
+        bus:           an open SMBus instance, whose file descriptor is used
+        read_len:      the number of bytes read per transfer
+        poller:        the ReadinessPoller used while a response is pending,
+                       by default that of tinyfx_ctrl
+    '''
+    def __init__(self, bus, read_len=32, poller=None):
+        self._fd = bus.fd
+        self._poller = poller or readiness
+        self._wbuf = create_string_buffer(1 + MAX_FRAME_LEN) # register (always 0) + frame
+        self._wview = memoryview(self._wbuf).cast('B')
+        self._read_len = read_len
+        self._rbuf = create_string_buffer(1 + MAX_FRAME_LEN) # status + frame
+        self._rview = memoryview(self._rbuf).cast('B')
+        # write then read, as one combined transfer
+        self._msgs = (i2c_msg * 2)()
+        self._msgs[0].flags = 0
+        self._msgs[0].buf   = cast(self._wbuf, POINTER(c_char))
+        self._msgs[1].flags = I2C_M_RD
+        self._msgs[1].len   = read_len
+        self._msgs[1].buf   = cast(self._rbuf, POINTER(c_char))
+        self._write_read = i2c_rdwr_ioctl_data(msgs=self._msgs, nmsgs=2)
+        # read only, sharing the read buffer
+        self._read_msgs = (i2c_msg * 1)()
+        self._read_msgs[0].flags = I2C_M_RD
+        self._read_msgs[0].len   = read_len
+        self._read_msgs[0].buf   = cast(self._rbuf, POINTER(c_char))
+        self._read = i2c_rdwr_ioctl_data(msgs=self._read_msgs, nmsgs=1)
+
+    def write_and_read(self, address, out_msg):
+        '''
+        Write the packed message and return the packed response to it.
+        '''
+        length = len(out_msg)
+        if length > MAX_FRAME_LEN:
+            raise ValueError('message too long: {} bytes'.format(length))
+        self._wview[1:1 + length] = out_msg
+        self._msgs[0].addr = address
+        self._msgs[0].len  = 1 + length
+        self._msgs[1].addr = address
+        wait = self._poller.delays()
+        next(wait) # the combined transfer is the first poll
+        ioctl(self._fd, I2C_RDWR, self._write_read)
+        resp_bytes = self._extract(address)
+        if resp_bytes is not None:
+            wait.ready()
+            return resp_bytes
+        return self._poll(address, wait)
+
+    def read_response(self, address):
+        '''
+        Read the packed response currently held by the target, polling
+        while it is pending.
+        '''
+        return self._poll(address, self._poller.delays())
+
+    def _poll(self, address, wait):
+        for delay in wait:
+            if delay:
+                time.sleep(delay)
+            self._read_msgs[0].addr = address
+            self._read_msgs[0].len  = self._read_len
+            ioctl(self._fd, I2C_RDWR, self._read)
+            resp_bytes = self._extract(address)
+            if resp_bytes is not None:
+                wait.ready()
+                return resp_bytes
+        raise RuntimeError("slave not ready.")
+
+    def _extract(self, address):
+        '''
+        Return the packed response in the read buffer, or None if pending.
+        A response longer than was read is read again in full, in a single
+        transfer of exactly its length.
+        '''
+        extent = response_extent(self._rview[:self._read_len])
+        if extent is None:
+            return None
+        start, length = extent
+        if start + length > self._read_len:
+            self._read_msgs[0].addr = address
+            self._read_msgs[0].len  = start + length
+            ioctl(self._fd, I2C_RDWR, self._read)
+        return bytes(self._rview[start:start+length])
+
+    def send(self, address, message, binary=False):
+        '''
+        Send a message and return the response. If binary is True, a
+        command with a binary equivalent is sent in its binary form.
+        '''
+        if binary and isinstance(message, str):
+            payload = encode_command(message)
+            if payload is not None:
+                message = payload
+        return unpack_message(self.write_and_read(address, pack_message(message)))
+
+#EOF